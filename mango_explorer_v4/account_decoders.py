@@ -0,0 +1,206 @@
+import functools
+import itertools
+import struct
+import typing
+
+from anchorpy.borsh_extension import BorshPubkeyAdapter
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from anchorpy.error import AccountInvalidDiscriminator
+from borsh_construct import CStruct
+from borsh_construct.core import FormatFieldNoNan
+from construct import Array, Bytes, BytesInteger, FormatField, FormatFieldError, Renamed, StreamError
+from construct.core import Flag
+from solana.publickey import PublicKey
+
+
+def _no_nan(value: float) -> float:
+    if value != value:
+        raise FormatFieldError("Borsh does not support nan.")
+
+    return value
+
+
+class _Compiler:
+    """
+    Turns a borsh layout into a single struct format, unpacked at once, and the
+    source of an expression building the generated classes from the unpacked
+    values. Arrays of anything but numbers get a struct and a function of
+    their own, applied to each element with iter_unpack.
+
+    When compact, byte arrays are kept as the bytes they're unpacked to
+    instead of lists of ints, which take over 8 times the memory.
+    """
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.namespace = {
+            'PublicKey': PublicKey,
+            '_no_nan': _no_nan
+        }
+        self.counter = itertools.count()
+
+    def name(self, prefix: str, value: typing.Any) -> str:
+        name = f"{prefix}{next(self.counter)}"
+
+        self.namespace[name] = value
+
+        return name
+
+    def compile(self, layout, annotation, values: str, index: itertools.count) -> (str, str):
+        while isinstance(layout, Renamed):
+            layout = layout.subcon
+
+        match layout:
+            case CStruct():
+                hints = typing.get_type_hints(annotation)
+
+                formats, arguments = [], []
+
+                for field in layout.subcons:
+                    field_format, field_expression = self.compile(field, hints[field.name], values, index)
+
+                    formats.append(field_format)
+                    arguments.append(f"{field.name}={field_expression}")
+
+                return ''.join(formats), f"{self.name('C', annotation)}({', '.join(arguments)})"
+
+            case BorshPubkeyAdapter():
+                return '32s', f"PublicKey({values}[{next(index)}])"
+
+            case _ if layout is Flag:
+                return '?', f"{values}[{next(index)}]"
+
+            case FormatField(fmtstr=fmtstr) if fmtstr[0] == '<':
+                expression = f"{values}[{next(index)}]"
+
+                return fmtstr[1:], f"_no_nan({expression})" if isinstance(layout, FormatFieldNoNan) else expression
+
+            case BytesInteger(length=int(length), swapped=True):
+                return f"{length}s", f"int.from_bytes({values}[{next(index)}], 'little', signed={layout.signed})"
+
+            case Bytes(length=int(length)):
+                return f"{length}s", f"{values}[{next(index)}]"
+
+            case Array(count=int(count)):
+                return self.compile_array(layout.subcon, count, typing.get_args(annotation)[0], values, index)
+
+        raise ValueError(f"Can't compile {layout}")
+
+    def compile_array(self, layout, count: int, annotation, values: str, index: itertools.count) -> (str, str):
+        while isinstance(layout, Renamed):
+            layout = layout.subcon
+
+        if isinstance(layout, FormatField) and layout.fmtstr == '<B':
+            expression = f"{values}[{next(index)}]"
+
+            return f"{count}s", expression if self.compact else f"list({expression})"
+            # ^ Byte arrays, by far the most common, unpack as one bytes object
+
+        if isinstance(layout, FormatField) and layout.fmtstr[0] == '<':
+            start = next(index)
+
+            for _ in range(count - 1):
+                next(index)
+
+            element = '_no_nan(value)' if isinstance(layout, FormatFieldNoNan) else 'value'
+
+            return f"{count}{layout.fmtstr[1:]}", f"[{element} for value in {values}[{start}:{start + count}]]"
+
+        element_format, element_expression = self.compile(layout, annotation, 'element', itertools.count())
+
+        element_struct = struct.Struct(f"<{element_format}")
+
+        element_function = self.function(f"lambda element: {element_expression}")
+
+        return (
+            f"{element_struct.size * count}s",
+            f"[{element_function}(element) for element in {self.name('S', element_struct)}.iter_unpack({values}[{next(index)}])]"
+        )
+
+    def function(self, source: str) -> str:
+        name = self.name('F', None)
+
+        exec(f"{name} = {source}", self.namespace)
+
+        return name
+
+
+@functools.lru_cache(maxsize=None)
+def compiled_decoder(account_type: type, compact: bool = False) -> typing.Optional[typing.Callable[[bytes], typing.Any]]:
+    """
+
+    Compiles the layout of a generated account class into a decoder returning the same instance its decode would.
+
+    :param account_type: e.g. Bank or PerpMarket
+    :param compact: whether byte arrays, like padding and node or event data, are kept as bytes rather than lists of ints
+    :return: the decoder, or None if the layout isn't fixed-size, like MangoAccount's
+    """
+    compiler = _Compiler(compact)
+
+    try:
+        layout_format, expression = compiler.compile(account_type.layout, account_type, 'values', itertools.count())
+    except (ValueError, KeyError, IndexError):
+        return None
+
+    compiler.namespace.update({
+        'AccountInvalidDiscriminator': AccountInvalidDiscriminator,
+        'StreamError': StreamError,
+        'DISCRIMINATOR': account_type.discriminator,
+        'LAYOUT': struct.Struct(f"<{layout_format}")
+    })
+
+    size = ACCOUNT_DISCRIMINATOR_SIZE + compiler.namespace['LAYOUT'].size
+
+    exec(f'''
+def decode(data):
+    if data[:{ACCOUNT_DISCRIMINATOR_SIZE}] != DISCRIMINATOR:
+        raise AccountInvalidDiscriminator("The discriminator for this account is invalid")
+
+    if len(data) < {size}:
+        raise StreamError(f"Expected at least {size} bytes, found {{len(data)}}")
+        # ^ What the generated decode raises too, rather than struct.error
+
+    values = LAYOUT.unpack_from(data, {ACCOUNT_DISCRIMINATOR_SIZE})
+
+    return {expression}
+''', compiler.namespace)
+
+    return compiler.namespace['decode']
+
+
+class AccountDecoders:
+    """
+    Decodes accounts either through the generated decode of their class, which
+    parses them with borsh_construct's interpreted CStruct, or through a
+    decoder compiled from the same layout into a single struct.Struct, which
+    is many times faster.
+
+    Every account type with a fixed-size layout is decoded by its compiled
+    decoder, unless switched back to the generated one with select. Types
+    without one, like MangoAccount, always use the generated decode.
+
+    Compact decoders keep byte arrays as bytes, for holding many decoded
+    accounts in memory. Their to_json then returns bytes for those fields.
+    """
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        self.generated: typing.Set[type] = set()
+
+    def select(self, account_type: type, compiled: bool = True):
+        if compiled:
+            self.generated.discard(account_type)
+        else:
+            self.generated.add(account_type)
+
+    def decoder(self, account_type: type) -> typing.Callable[[bytes], typing.Any]:
+        if account_type not in self.generated:
+            decoder = compiled_decoder(account_type, self.compact)
+
+            if decoder is not None:
+                return decoder
+
+        return account_type.decode
+
+    def decode(self, account_type: type, data: bytes) -> typing.Any:
+        return self.decoder(account_type)(data)
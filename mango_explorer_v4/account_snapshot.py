@@ -0,0 +1,103 @@
+import asyncio
+import typing
+from dataclasses import dataclass
+
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException, _COMMITMENT_TO_SOLDERS
+from solders.account import Account
+from solders.account_decoder import UiAccountEncoding
+from solders.rpc.config import RpcAccountInfoConfig
+from solders.rpc.errors import MinContextSlotNotReachedMessage
+from solders.rpc.requests import GetMultipleAccounts
+from solders.rpc.responses import GetMultipleAccountsResp
+
+CHUNK_SIZE = 100
+# ^ Most RPC nodes cap how many accounts getMultipleAccounts returns at once
+
+
+@dataclass
+class AccountSnapshot:
+    """
+    Accounts all read at the same slot, so that a computation over several of
+    them never mixes states from before and after a transaction.
+
+    They're fetched in chunks of 100 at once. When the chunks were answered at
+    different slots, all of them are fetched again with minContextSlot set to
+    the newest one, until every chunk agrees, which usually takes a single
+    round trip. A node that hasn't reached that slot yet is retried after a
+    short delay.
+    """
+
+    slot: int
+    accounts: typing.Dict[PublicKey, typing.Optional[Account]]
+
+    @classmethod
+    async def fetch(
+        cls,
+        connection: AsyncClient,
+        public_keys: typing.List[PublicKey],
+        max_attempts: int = 5,
+        retry_delay: float = 0.2
+    ) -> "AccountSnapshot":
+        public_keys = list(dict.fromkeys(public_keys))
+
+        chunks = [public_keys[offset:offset + CHUNK_SIZE] for offset in range(0, len(public_keys), CHUNK_SIZE)]
+
+        min_context_slot = None
+
+        for _ in range(max_attempts):
+            responses = await asyncio.gather(*[
+                cls._get_multiple_accounts(connection, chunk, min_context_slot)
+                for chunk in chunks
+            ])
+            # ^ All of them again, as minContextSlot is only a lower bound, so chunks fetched apart may still disagree
+
+            if None in responses:
+                await asyncio.sleep(retry_delay)
+
+                continue
+
+            slots = {response.context.slot for response in responses}
+
+            if len(slots) <= 1:
+                return cls(
+                    next(iter(slots), 0),
+                    {
+                        public_key: account
+                        for chunk, response in zip(chunks, responses)
+                        for public_key, account in zip(chunk, response.value)
+                    }
+                )
+
+            min_context_slot = max(slots)
+
+        raise RuntimeError(f"Couldn't fetch {len(public_keys)} accounts at a single slot in {max_attempts} attempts")
+
+    @staticmethod
+    async def _get_multiple_accounts(
+        connection: AsyncClient,
+        public_keys: typing.List[PublicKey],
+        min_context_slot: typing.Optional[int]
+    ) -> typing.Optional[GetMultipleAccountsResp]:
+        # The client's get_multiple_accounts doesn't take a minContextSlot
+        config = RpcAccountInfoConfig(
+            encoding=UiAccountEncoding.Base64,
+            commitment=_COMMITMENT_TO_SOLDERS[connection.commitment],
+            min_context_slot=min_context_slot
+        )
+
+        try:
+            return await connection._provider.make_request(
+                GetMultipleAccounts([public_key.to_solders() for public_key in public_keys], config),
+                GetMultipleAccountsResp
+            )
+        except RPCException as exception:
+            if len(exception.args) > 0 and isinstance(exception.args[0], MinContextSlotNotReachedMessage):
+                return None
+                # ^ The node is behind the slot asked for, it's worth asking again
+
+            raise
+
+    def __getitem__(self, public_key: PublicKey) -> typing.Optional[Account]:
+        return self.accounts[public_key]
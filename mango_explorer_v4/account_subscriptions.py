@@ -0,0 +1,351 @@
+import asyncio
+import json
+import logging
+import typing
+from dataclasses import dataclass, field
+
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Processed
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.websocket_api import SolanaWsClientProtocol, connect
+from solders.account_decoder import UiAccountEncoding
+from solders.rpc.config import RpcAccountInfoConfig
+from solders.rpc.requests import AccountSubscribe, AccountUnsubscribe
+from solders.rpc.responses import AccountNotification, SubscriptionResult, parse_websocket_message
+from websockets.client import WebSocketClientProtocol
+from websockets.exceptions import ConnectionClosedOK
+
+
+@dataclass
+class AccountUpdate:
+    public_key: PublicKey
+    data: bytes
+    slot: int
+    is_resync: bool = False
+    # ^ Set on the snapshots fetched after a reconnection, as updates may have been missed before it
+
+
+@dataclass(eq=False)
+class AccountSubscription:
+    public_key: PublicKey
+    connection: "AccountSubscriptionsConnection"
+    subscription_id: typing.Optional[int] = None
+    queues: [asyncio.Queue] = field(default_factory=list)
+    slot: int = 0
+    # ^ Slot of the last delivered update, older ones are discarded as stale
+    data: typing.Optional[bytes] = None
+    # ^ Data of the last delivered update
+
+
+@dataclass(eq=False)
+class AccountSubscriptionsConnection:
+    websocket: SolanaWsClientProtocol
+    reader: typing.Optional[asyncio.Task] = None
+    is_connected: bool = True
+    subscriptions: [AccountSubscription] = field(default_factory=list)
+    pending: typing.Dict[int, AccountSubscription] = field(default_factory=dict)
+    # ^ Keyed by request id, until the server confirms the subscription
+    active: typing.Dict[int, AccountSubscription] = field(default_factory=dict)
+    # ^ Keyed by subscription id
+    unsubscribing: typing.Set[int] = field(default_factory=set)
+    # ^ Request ids of the unsubscriptions not acknowledged yet
+
+
+class AccountSubscriptions:
+    """
+    Multiplexes account subscriptions over a small pool of websocket connections.
+
+    Consumers of the same account share one server-side subscription, which is
+    ref-counted and only unsubscribed once its last consumer goes away. Every
+    consumer gets its own queue of AccountUpdates, routed by subscription id.
+
+    Dropped connections are reopened with exponential backoff and their accounts
+    re-subscribed. If an RPC connection is given, a fresh snapshot of those
+    accounts is then fetched and delivered as a resync update, to fill the gap.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        connection: typing.Optional[AsyncClient] = None,
+        pool_size: int = 2,
+        commitment: Commitment = Processed,
+        min_reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30
+    ):
+        self.endpoint = endpoint
+        self.connection = connection
+        self.pool_size = pool_size
+        self.commitment = commitment
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.connections: [AccountSubscriptionsConnection] = []
+        self.subscriptions: typing.Dict[PublicKey, AccountSubscription] = {}
+        self.lock = asyncio.Lock()
+
+    async def account_updates(self, public_key: PublicKey) -> typing.AsyncIterator[AccountUpdate]:
+        queue = await self.subscribe(public_key)
+
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            await self.unsubscribe(public_key, queue)
+
+    @staticmethod
+    async def queued_updates(queue: asyncio.Queue, after_slot: int = -1) -> typing.AsyncIterator[AccountUpdate]:
+        # Reads a queue returned by subscribe, skipping what it buffered up to a snapshot taken after subscribing
+        while True:
+            update = await queue.get()
+
+            if update.slot <= after_slot:
+                continue
+
+            yield update
+
+    async def subscribe(self, public_key: PublicKey) -> asyncio.Queue:
+        queue = asyncio.Queue()
+
+        async with self.lock:
+            subscription = self.subscriptions.get(public_key)
+
+            if subscription is None:
+                connection = await self._connection()
+
+                subscription = AccountSubscription(public_key, connection)
+
+                connection.subscriptions.append(subscription)
+
+                self.subscriptions[public_key] = subscription
+
+                await self._send_subscribe(subscription)
+
+            subscription.queues.append(queue)
+
+        return queue
+
+    async def unsubscribe(self, public_key: PublicKey, queue: asyncio.Queue):
+        async with self.lock:
+            subscription = self.subscriptions.get(public_key)
+
+            if subscription is None or queue not in subscription.queues:
+                return
+
+            subscription.queues.remove(queue)
+
+            if len(subscription.queues) > 0:
+                return
+
+            del self.subscriptions[public_key]
+
+            connection = subscription.connection
+
+            connection.subscriptions.remove(subscription)
+
+            if subscription.subscription_id is not None:
+                del connection.active[subscription.subscription_id]
+
+                await self._send_unsubscribe(subscription)
+            # ^ Otherwise it's still pending, and gets unsubscribed once confirmed
+
+            if len(connection.subscriptions) == 0 and len(connection.pending) == 0:
+                await self._close(connection)
+
+    async def close(self):
+        async with self.lock:
+            for connection in list(self.connections):
+                await self._close(connection)
+
+            self.subscriptions.clear()
+
+    async def _connection(self) -> AccountSubscriptionsConnection:
+        if len(self.connections) < self.pool_size:
+            connection = AccountSubscriptionsConnection(await connect(self.endpoint))
+
+            connection.reader = asyncio.ensure_future(self._read(connection))
+
+            self.connections.append(connection)
+
+            return connection
+
+        return min(self.connections, key=lambda connection: (not connection.is_connected, len(connection.subscriptions)))
+
+    async def _close(self, connection: AccountSubscriptionsConnection):
+        if connection in self.connections:
+            self.connections.remove(connection)
+
+        if connection.reader and connection.reader is not asyncio.current_task():
+            connection.reader.cancel()
+
+        await connection.websocket.close()
+
+    async def _send_subscribe(self, subscription: AccountSubscription):
+        if not subscription.connection.is_connected:
+            return
+            # ^ It will be subscribed once reconnected
+
+        websocket = subscription.connection.websocket
+
+        request_id = websocket.increment_counter_and_get_id()
+
+        subscription.connection.pending[request_id] = subscription
+
+        await websocket.send_data(AccountSubscribe(
+            subscription.public_key.to_solders(),
+            RpcAccountInfoConfig(encoding=UiAccountEncoding.Base64, commitment=_COMMITMENT_TO_SOLDERS[self.commitment]),
+            request_id
+        ))
+
+    async def _send_unsubscribe(self, subscription: AccountSubscription):
+        if not subscription.connection.is_connected:
+            return
+
+        websocket = subscription.connection.websocket
+
+        request_id = websocket.increment_counter_and_get_id()
+
+        subscription.connection.unsubscribing.add(request_id)
+
+        await websocket.send_data(AccountUnsubscribe(subscription.subscription_id, request_id))
+
+    async def _read(self, connection: AccountSubscriptionsConnection):
+        delay = self.min_reconnect_delay
+
+        while connection in self.connections:
+            try:
+                if not connection.is_connected:
+                    await self._reconnect(connection)
+
+                    delay = self.min_reconnect_delay
+
+                async for message in self._messages(connection):
+                    for submessage in message:
+                        if isinstance(submessage, SubscriptionResult):
+                            await self._confirm(connection, submessage)
+                        elif isinstance(submessage, AccountNotification):
+                            subscription = connection.active.get(submessage.subscription)
+
+                            if subscription is None:
+                                continue
+
+                            self._deliver(subscription, AccountUpdate(
+                                subscription.public_key,
+                                submessage.result.value.data,
+                                submessage.result.context.slot
+                            ))
+
+                if connection not in self.connections:
+                    return
+
+                raise ConnectionError('Websocket closed by the server')
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logging.warning(f"Account subscriptions websocket failed, reconnecting in {delay}s: {exception}")
+
+                connection.is_connected = False
+
+                await asyncio.sleep(delay)
+
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    @staticmethod
+    async def _messages(connection: AccountSubscriptionsConnection) -> typing.AsyncIterator[list]:
+        # Reads the raw frames, as parse_websocket_message fails on the true an unsubscription is acknowledged with
+        websocket = connection.websocket
+
+        try:
+            while True:
+                raw = await WebSocketClientProtocol.recv(websocket)
+
+                message = json.loads(raw)
+
+                if isinstance(message, dict) and 'method' not in message and message.get('id') in connection.unsubscribing:
+                    connection.unsubscribing.discard(message['id'])
+
+                    continue
+                    # ^ Acknowledged, or refused if the subscription was gone already, either way there's nothing left to do
+
+                yield parse_websocket_message(raw)
+        except ConnectionClosedOK:
+            return
+
+    async def _reconnect(self, connection: AccountSubscriptionsConnection):
+        await connection.websocket.close()
+
+        websocket = await connect(self.endpoint)
+
+        async with self.lock:
+            connection.websocket = websocket
+            connection.is_connected = True
+            connection.pending.clear()
+            connection.active.clear()
+            connection.unsubscribing.clear()
+
+            for subscription in connection.subscriptions:
+                subscription.subscription_id = None
+
+                await self._send_subscribe(subscription)
+
+        logging.info(f"Account subscriptions websocket reconnected, {len(connection.subscriptions)} accounts re-subscribed")
+
+        asyncio.ensure_future(self._resync(list(connection.subscriptions)))
+        # ^ The snapshot is fetched after subscribing, so that no update falls in between
+
+    async def _resync(self, subscriptions: [AccountSubscription]):
+        if self.connection is None:
+            return
+
+        for offset in range(0, len(subscriptions), 100):
+            chunk = subscriptions[offset:offset + 100]
+
+            try:
+                response = await self.connection.get_multiple_accounts([subscription.public_key for subscription in chunk])
+            except Exception as exception:
+                logging.error(f"Account subscriptions resync failed: {exception}")
+
+                continue
+
+            for subscription, account in zip(chunk, response.value):
+                if account is None:
+                    continue
+
+                if response.context.slot < subscription.slot:
+                    self._deliver(subscription, AccountUpdate(subscription.public_key, subscription.data, subscription.slot, True))
+                    # ^ A notification overtook the snapshot, it's fresher but consumers still need to know updates were missed
+
+                    continue
+
+                self._deliver(subscription, AccountUpdate(subscription.public_key, account.data, response.context.slot, True))
+
+    async def _confirm(self, connection: AccountSubscriptionsConnection, result: SubscriptionResult):
+        subscription = connection.pending.pop(result.id, None)
+
+        if subscription is None:
+            return
+
+        subscription.subscription_id = result.result
+
+        if subscription in connection.subscriptions:
+            connection.active[subscription.subscription_id] = subscription
+
+            return
+
+        async with self.lock:
+            await self._send_unsubscribe(subscription)
+
+            if len(connection.subscriptions) == 0 and len(connection.pending) == 0:
+                await self._close(connection)
+
+    @staticmethod
+    def _deliver(subscription: AccountSubscription, update: AccountUpdate):
+        if update.slot < subscription.slot:
+            return
+
+        subscription.slot = update.slot
+
+        subscription.data = update.data
+
+        for queue in subscription.queues:
+            queue.put_nowait(update)
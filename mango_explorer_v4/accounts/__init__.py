@@ -1,13 +1,62 @@
-from .bank import Bank, BankJSON
-from .group import Group, GroupJSON
-from .mango_account import MangoAccount, MangoAccountJSON
-from .mint_info import MintInfo, MintInfoJSON
-from .stub_oracle import StubOracle, StubOracleJSON
-from .book_side import BookSide, BookSideJSON
-from .event_queue import EventQueue, EventQueueJSON
-from .perp_market import PerpMarket, PerpMarketJSON
-from .serum3_market import Serum3Market, Serum3MarketJSON
-from .serum3_market_index_reservation import (
-    Serum3MarketIndexReservation,
-    Serum3MarketIndexReservationJSON,
-)
+import importlib
+import typing
+
+if typing.TYPE_CHECKING:
+    from .bank import Bank, BankJSON
+    from .group import Group, GroupJSON
+    from .mango_account import MangoAccount, MangoAccountJSON
+    from .mint_info import MintInfo, MintInfoJSON
+    from .stub_oracle import StubOracle, StubOracleJSON
+    from .book_side import BookSide, BookSideJSON
+    from .event_queue import EventQueue, EventQueueJSON
+    from .perp_market import PerpMarket, PerpMarketJSON
+    from .serum3_market import Serum3Market, Serum3MarketJSON
+    from .serum3_market_index_reservation import (
+        Serum3MarketIndexReservation,
+        Serum3MarketIndexReservationJSON,
+    )
+
+_LAZY = {
+    "Bank": ("bank", "Bank"),
+    "BankJSON": ("bank", "BankJSON"),
+    "Group": ("group", "Group"),
+    "GroupJSON": ("group", "GroupJSON"),
+    "MangoAccount": ("mango_account", "MangoAccount"),
+    "MangoAccountJSON": ("mango_account", "MangoAccountJSON"),
+    "MintInfo": ("mint_info", "MintInfo"),
+    "MintInfoJSON": ("mint_info", "MintInfoJSON"),
+    "StubOracle": ("stub_oracle", "StubOracle"),
+    "StubOracleJSON": ("stub_oracle", "StubOracleJSON"),
+    "BookSide": ("book_side", "BookSide"),
+    "BookSideJSON": ("book_side", "BookSideJSON"),
+    "EventQueue": ("event_queue", "EventQueue"),
+    "EventQueueJSON": ("event_queue", "EventQueueJSON"),
+    "PerpMarket": ("perp_market", "PerpMarket"),
+    "PerpMarketJSON": ("perp_market", "PerpMarketJSON"),
+    "Serum3Market": ("serum3_market", "Serum3Market"),
+    "Serum3MarketJSON": ("serum3_market", "Serum3MarketJSON"),
+    "Serum3MarketIndexReservation": ("serum3_market_index_reservation", "Serum3MarketIndexReservation"),
+    "Serum3MarketIndexReservationJSON": ("serum3_market_index_reservation", "Serum3MarketIndexReservationJSON"),
+}
+# ^ Exported name -> (submodule, attribute or None for the submodule itself). Building the borsh
+#   layouts of every submodule on import is slow, so each is only imported when first used
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module, attribute = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = importlib.import_module(f".{module}", __name__)
+
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_LAZY])
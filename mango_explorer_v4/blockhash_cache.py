@@ -0,0 +1,77 @@
+import asyncio
+import logging
+import time
+import typing
+
+from solana.rpc.async_api import AsyncClient
+from solders.hash import Hash
+
+
+class BlockhashCache:
+    """
+    Keeps a recent blockhash around so that sending a transaction doesn't
+    require an RPC round trip just to fetch one.
+
+    A background task refreshes it every refresh_interval seconds, starting
+    on first use. A cached blockhash older than max_age seconds is stale, and
+    is then fetched synchronously before it's handed out, which only happens
+    if the background refreshes fall behind or keep failing.
+    """
+
+    def __init__(self, connection: AsyncClient, refresh_interval: float = 1, max_age: float = 30):
+        self.connection = connection
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        # ^ Well below the ~150 blocks a blockhash is accepted for
+        self.blockhash: typing.Optional[Hash] = None
+        self.last_valid_block_height: typing.Optional[int] = None
+        self.fetched_at: float = 0
+        self.task: typing.Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+    async def get(self) -> Hash:
+        self.start()
+
+        if self.is_stale():
+            async with self.lock:
+                if self.is_stale():
+                    await self.refresh()
+
+        return self.blockhash
+
+    def is_stale(self) -> bool:
+        return self.blockhash is None or time.monotonic() - self.fetched_at > self.max_age
+
+    async def refresh(self):
+        fetched_at = time.monotonic()
+
+        response = await self.connection.get_latest_blockhash()
+
+        if fetched_at < self.fetched_at:
+            return
+            # ^ A later fetch already completed, keep the fresher one
+
+        self.blockhash = response.value.blockhash
+        self.last_valid_block_height = response.value.last_valid_block_height
+        self.fetched_at = fetched_at
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self._poll())
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+
+            self.task = None
+
+    async def _poll(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logging.warning(f"Blockhash refresh failed: {exception}")
+
+            await asyncio.sleep(self.refresh_interval)
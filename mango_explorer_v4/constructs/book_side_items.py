@@ -5,11 +5,13 @@ import typing
 from dataclasses import dataclass
 from decimal import Decimal
 
+import numpy as np
 from solana.publickey import PublicKey
 
 from mango_explorer_v4.accounts.book_side import BookSide
 from mango_explorer_v4.accounts.perp_market import PerpMarket
 from mango_explorer_v4.constants import RUST_U64_MAX
+from mango_explorer_v4.constructs.book_side_view import BookSideView
 from mango_explorer_v4.types.inner_node import InnerNode
 from mango_explorer_v4.types.leaf_node import LeafNode
 from mango_explorer_v4.types.order_tree_root import OrderTreeRoot
@@ -36,10 +38,24 @@ class BookSideItem:
 @dataclass
 class BookSideItems:
     side: typing.Literal['bids', 'asks']
-    book_side: BookSide
+    book_side: typing.Union[BookSide, BookSideView]
     perp_market: PerpMarket
     oracle_price: float
 
+    def node(self, index: int):
+        if isinstance(self.book_side, BookSideView):
+            return self.book_side.node(index)
+
+        node = self.book_side.nodes.nodes[index]
+
+        match node.tag:
+            case 1:
+                return InnerNode.layout.parse(bytes([1]) + bytes(node.data))
+            case 2:
+                return LeafNode.layout.parse(bytes([2]) + bytes(node.data))
+            case _:
+                return None
+
     def __iter__(self):
         def entries(order_tree_root: OrderTreeRoot, is_oracle_pegged: bool):
             if order_tree_root.leaf_count == 0:
@@ -54,15 +70,16 @@ class BookSideItems:
             while len(stack) > 0:
                 index = stack.pop()
 
-                node = self.book_side.nodes.nodes[index]
+                node = self.node(index)
+
+                if node is None:
+                    continue
 
                 match node.tag:
                     case 1:
-                        inner_node = InnerNode.layout.parse(bytes([1] + node.data))
-
-                        stack.extend([inner_node.children[right], inner_node.children[left]])
+                        stack.extend([node.children[right], node.children[left]])
                     case 2:
-                        leaf_node: LeafNode = LeafNode.layout.parse(bytes([2] + node.data))
+                        leaf_node: LeafNode = node
 
                         if is_oracle_pegged: # TODO: This won't change - no need to evaluate more than once
                             price_offset = (leaf_node.key >> 64) - (1 << 63)
@@ -138,6 +155,9 @@ class BookSideItems:
                 yield oracle_pegged_item; oracle_pegged_item = next(oracle_pegged_items, None)
 
     def l2(self):
+        if isinstance(self.book_side, BookSideView):
+            return self.l2_vectorized()
+
         orders = []
 
         for key, groups in itertools.groupby([[order.price_ui, order.size_ui] for order in self], lambda order: order[0]):
@@ -145,6 +165,46 @@ class BookSideItems:
 
         return orders
 
+    def l2_vectorized(self):
+        # Aggregates both order trees at once over integer lot arrays and only
+        # converts to UI units once per price level. Same output as l2()
+        nodes = self.book_side.nodes
+
+        fixed_indices, oracle_pegged_indices = [
+            np.array(self.book_side.leaf_indices(order_tree_root, self.side), dtype=np.intp)
+            for order_tree_root in self.book_side.roots[:2]
+        ]
+
+        fixed_prices = nodes['key_hi'][fixed_indices].astype(np.int64)
+
+        # Oracle pegged keys store the price offset shifted by 2^63, flipping
+        # the top bit and reinterpreting as signed recovers the offset
+        oracle_pegged_prices = (
+            (nodes['key_hi'][oracle_pegged_indices] ^ np.uint64(1 << 63)).view(np.int64)
+            + PerpMarketHelper.ui_price_to_lots(self.perp_market, self.oracle_price)
+        )
+
+        prices = np.concatenate([fixed_prices, oracle_pegged_prices])
+
+        quantities = np.concatenate([nodes['quantity'][fixed_indices], nodes['quantity'][oracle_pegged_indices]])
+
+        levels, level_indices = np.unique(prices, return_inverse=True)
+
+        sizes = np.zeros(len(levels), dtype=np.int64)
+
+        np.add.at(sizes, level_indices, quantities)
+
+        if self.side == 'bids':
+            levels, sizes = levels[::-1], sizes[::-1]
+
+        return [
+            [
+                float(PerpMarketHelper.price_lots_to_ui(self.perp_market, int(price_lots))),
+                float(PerpMarketHelper.base_lots_to_ui(self.perp_market, int(size_lots)))
+            ]
+            for price_lots, size_lots in zip(levels.tolist(), sizes.tolist())
+        ]
+
     def l3(self):
         return [
             {
@@ -156,13 +216,36 @@ class BookSideItems:
             for order in self
         ]
 
+    @staticmethod
+    def is_valid(order: BookSideItem, now: int) -> bool:
+        if now >= order.expires_at:
+            return False
+
+        if order.is_oracle_pegged:
+            if order.price < 1:
+                return False
+
+            return order.oracle_pegged_properties['peg_limit'] == -1 or not order.oracle_pegged_properties['is_invalid']
+            # ^ A peg limit of -1 stands for none
+
+        return True
+
     def impact_price(self, impact_quantity: float):
+        # Walks the orders best first, the way the program does for funding: skipping expired
+        # orders and oracle pegged ones past their peg limit, and stopping as soon as their
+        # cumulative size reaches impact_quantity rather than aggregating the whole book first
+        now = int(time.time())
+
         accum = 0
 
-        for price, size in self.l2():
-            accum += size
+        for order in self:
+            if not self.is_valid(order, now):
+                continue
+
+            accum += order.size
 
-            if size >= impact_quantity:
-                return price
+            if PerpMarketHelper.base_lots_to_ui(self.perp_market, accum) >= impact_quantity:
+                return order.price_ui
+                # ^ Compared in UI units converted from lots, as impact_quantity is, so that float sums don't fall short
 
         return None
@@ -0,0 +1,143 @@
+import struct
+import typing
+
+import numpy as np
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from anchorpy.error import AccountInvalidDiscriminator
+from solana.publickey import PublicKey
+
+from mango_explorer_v4.accounts.book_side import BookSide
+from mango_explorer_v4.types.inner_node import InnerNode
+from mango_explorer_v4.types.leaf_node import LeafNode
+from mango_explorer_v4.types.order_tree_root import OrderTreeRoot
+
+# Byte offsets into a raw BookSide account, following BookSide.layout:
+# discriminator, roots[2], reserved_roots[4], reserved[256], then the
+# OrderTreeNodes header (order_tree_type, padding, bump_index,
+# free_list_len, free_list_head, reserved[512]) right before the nodes
+ROOTS_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE
+
+NODES_OFFSET = ROOTS_OFFSET + 6 * 8 + 256 + 16 + 512
+
+NODE_SIZE = 120
+
+NODE_COUNT = 1024
+
+ORDER_TREE_ROOT = struct.Struct('<II')
+
+INNER_NODE = struct.Struct('<B3sIQQII2Q72s')
+
+LEAF_NODE = struct.Struct('<BBB1sH2sQQ32sqQqQ32s')
+
+INNER_NODE_CHILDREN = struct.Struct('<II')
+
+INNER_NODE_CHILDREN_OFFSET = 24
+
+# Inner and leaf nodes share the same 120 byte slot, so their fields overlap
+NODE_DTYPE = np.dtype({
+    'names': ['tag', 'key_lo', 'key_hi', 'children', 'quantity', 'peg_limit'],
+    'formats': ['u1', '<u8', '<u8', ('<u4', 2), '<i8', '<i8'],
+    'offsets': [0, 8, 16, 24, 56, 72],
+    'itemsize': NODE_SIZE
+})
+
+
+class BookSideView:
+    """
+    Zero-copy alternative to BookSide.decode: the raw account bytes are
+    wrapped in a NumPy structured array and individual nodes are only
+    decoded when they are accessed, which is what makes walking the two
+    order trees cheap compared to parsing all 1024 nodes upfront.
+    """
+
+    def __init__(self, data: bytes):
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] != BookSide.discriminator:
+            raise AccountInvalidDiscriminator(
+                "The discriminator for this account is invalid"
+            )
+
+        self.data = memoryview(data)
+
+        self.roots = [
+            OrderTreeRoot(*ORDER_TREE_ROOT.unpack_from(self.data, ROOTS_OFFSET + index * ORDER_TREE_ROOT.size))
+            for index in range(2)
+        ]
+
+        self.nodes = np.frombuffer(self.data, dtype=NODE_DTYPE, count=NODE_COUNT, offset=NODES_OFFSET)
+
+    @classmethod
+    def decode(cls, data: bytes) -> "BookSideView":
+        return cls(data)
+
+    def tag(self, index: int) -> int:
+        return self.data[NODES_OFFSET + index * NODE_SIZE]
+
+    def node(self, index: int) -> typing.Union[InnerNode, LeafNode, None]:
+        match self.tag(index):
+            case 1:
+                return self.inner_node(index)
+            case 2:
+                return self.leaf_node(index)
+            case _:
+                return None
+
+    def inner_node(self, index: int) -> InnerNode:
+        (
+            tag, padding, prefix_len, key_lo, key_hi, left, right, earliest_expiry_left, earliest_expiry_right, reserved
+        ) = INNER_NODE.unpack_from(self.data, NODES_OFFSET + index * NODE_SIZE)
+
+        return InnerNode(
+            tag=tag,
+            padding=list(padding),
+            prefix_len=prefix_len,
+            key=key_lo | (key_hi << 64),
+            children=[left, right],
+            child_earliest_expiry=[earliest_expiry_left, earliest_expiry_right],
+            reserved=list(reserved)
+        )
+
+    def leaf_node(self, index: int) -> LeafNode:
+        (
+            tag, owner_slot, order_type, padding, time_in_force, padding2, key_lo, key_hi,
+            owner, quantity, timestamp, peg_limit, client_order_id, reserved
+        ) = LEAF_NODE.unpack_from(self.data, NODES_OFFSET + index * NODE_SIZE)
+
+        return LeafNode(
+            tag=tag,
+            owner_slot=owner_slot,
+            order_type=order_type,
+            padding=list(padding),
+            time_in_force=time_in_force,
+            padding2=list(padding2),
+            key=key_lo | (key_hi << 64),
+            owner=PublicKey(owner),
+            quantity=quantity,
+            timestamp=timestamp,
+            peg_limit=peg_limit,
+            client_order_id=client_order_id,
+            reserved=list(reserved)
+        )
+
+    def leaf_indices(self, order_tree_root: OrderTreeRoot, side: typing.Literal['bids', 'asks']) -> [int]:
+        """Indices of the leaves under the given root, best price first."""
+        if order_tree_root.leaf_count == 0:
+            return []
+
+        [left, right] = [1, 0] if side == 'bids' else [0, 1]
+
+        indices = []
+
+        stack = [order_tree_root.maybe_node]
+
+        while len(stack) > 0:
+            index = stack.pop()
+
+            match self.tag(index):
+                case 1:
+                    children = INNER_NODE_CHILDREN.unpack_from(self.data, NODES_OFFSET + index * NODE_SIZE + INNER_NODE_CHILDREN_OFFSET)
+
+                    stack.extend([children[right], children[left]])
+                case 2:
+                    indices.append(index)
+
+        return indices
@@ -0,0 +1,125 @@
+import struct
+import typing
+
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+from anchorpy.error import AccountInvalidDiscriminator
+from solana.publickey import PublicKey
+
+from mango_explorer_v4.accounts.event_queue import EventQueue
+from mango_explorer_v4.types.event_queue_header import EventQueueHeader
+from mango_explorer_v4.types.fill_event import FillEvent
+
+# Byte offsets into a raw EventQueue account, following EventQueue.layout:
+# discriminator, header (head, count, seq_num), then the ring of events
+HEADER_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE
+
+EVENTS_OFFSET = HEADER_OFFSET + 16
+
+EVENT_SIZE = 208
+
+EVENT_COUNT = 488
+
+EVENT_QUEUE_HEADER = struct.Struct('<IIQ')
+
+# Fill and out events both start with their type and keep their sequence number at the same offset
+EVENT_SEQ_NUM = struct.Struct('<Q')
+
+EVENT_SEQ_NUM_OFFSET = 16
+
+FILL_EVENT = struct.Struct('<BBBB4sQQ32s32sQ32s16sQ16sqqQff8s')
+
+FILL_EVENT_TYPE = 0
+
+
+class EventQueueView:
+    """
+    Reads events straight from the raw bytes of an EventQueue account, in
+    sequence order, without decoding the whole ring.
+
+    Events are pushed at (head + count) and the event with sequence number
+    header.seq_num - 1 is always the newest one, so the slot of any of the
+    last 488 events follows from its sequence number. Events consumed by the
+    crank stay readable until they're overwritten, which is what makes it
+    possible to pick up from a previously seen sequence number.
+    """
+
+    def __init__(self, data: bytes):
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] != EventQueue.discriminator:
+            raise AccountInvalidDiscriminator(
+                "The discriminator for this account is invalid"
+            )
+
+        self.data = memoryview(data)
+
+        self.header = EventQueueHeader(*EVENT_QUEUE_HEADER.unpack_from(self.data, HEADER_OFFSET))
+
+    @classmethod
+    def decode(cls, data: bytes) -> "EventQueueView":
+        return cls(data)
+
+    def index(self, seq_num: int) -> int:
+        return (self.header.head + self.header.count - (self.header.seq_num - seq_num)) % EVENT_COUNT
+
+    def event_type(self, index: int) -> int:
+        return self.data[EVENTS_OFFSET + index * EVENT_SIZE]
+
+    def seq_nums(self, last_seq_num: typing.Optional[int] = None) -> range:
+        """Sequence numbers of the events still in the ring that come after last_seq_num, oldest first."""
+        start = max(self.header.seq_num - EVENT_COUNT, 0)
+
+        if last_seq_num is not None:
+            start = max(start, last_seq_num + 1)
+
+        return range(start, self.header.seq_num)
+
+    def indices(self, last_seq_num: typing.Optional[int] = None) -> [int]:
+        indices = []
+
+        for seq_num in self.seq_nums(last_seq_num):
+            index = self.index(seq_num)
+
+            if EVENT_SEQ_NUM.unpack_from(self.data, EVENTS_OFFSET + index * EVENT_SIZE + EVENT_SEQ_NUM_OFFSET)[0] != seq_num:
+                continue
+                # ^ Not written yet
+
+            indices.append(index)
+
+        return indices
+
+    def fill_event(self, index: int) -> FillEvent:
+        (
+            event_type, taker_side, maker_out, maker_slot, padding, timestamp, seq_num, maker, padding2,
+            maker_timestamp, taker, padding3, taker_client_order_id, padding4, price, quantity,
+            maker_client_order_id, maker_fee, taker_fee, reserved
+        ) = FILL_EVENT.unpack_from(self.data, EVENTS_OFFSET + index * EVENT_SIZE)
+
+        return FillEvent(
+            event_type=event_type,
+            taker_side=taker_side,
+            maker_out=maker_out,
+            maker_slot=maker_slot,
+            padding=list(padding),
+            timestamp=timestamp,
+            seq_num=seq_num,
+            maker=PublicKey(maker),
+            padding2=list(padding2),
+            maker_timestamp=maker_timestamp,
+            taker=PublicKey(taker),
+            padding3=list(padding3),
+            taker_client_order_id=taker_client_order_id,
+            padding4=list(padding4),
+            price=price,
+            quantity=quantity,
+            maker_client_order_id=maker_client_order_id,
+            maker_fee=maker_fee,
+            taker_fee=taker_fee,
+            reserved=list(reserved)
+        )
+
+    def fills(self, last_seq_num: typing.Optional[int] = None) -> [FillEvent]:
+        """Fill events that come after last_seq_num, or all of those in the ring, oldest first."""
+        return [
+            self.fill_event(index)
+            for index in self.indices(last_seq_num)
+            if self.event_type(index) == FILL_EVENT_TYPE
+        ]
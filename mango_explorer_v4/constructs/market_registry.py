@@ -0,0 +1,189 @@
+import typing
+from dataclasses import dataclass, field
+
+from pyserum.market import AsyncMarket
+from solana.publickey import PublicKey
+
+from mango_explorer_v4.accounts.bank import Bank
+from mango_explorer_v4.accounts.mint_info import MintInfo
+from mango_explorer_v4.accounts.perp_market import PerpMarket
+from mango_explorer_v4.accounts.serum3_market import Serum3Market
+
+
+@dataclass
+class TokenBundle:
+    config: dict
+    token_index: int
+    symbol: str
+    bank_public_key: PublicKey
+    bank: Bank
+    mint_info: MintInfo
+    oracle: PublicKey
+
+
+@dataclass
+class PerpMarketBundle:
+    config: dict
+    market_index: int
+    symbol: str
+    public_key: PublicKey
+    perp_market: PerpMarket
+    oracle: PublicKey
+
+
+@dataclass
+class Serum3MarketBundle:
+    config: dict
+    market_index: int
+    symbol: str
+    public_key: PublicKey
+    serum_market: Serum3Market
+    serum_market_external: AsyncMarket
+    serum_market_external_public_key: PublicKey
+    base: TokenBundle
+    quote: TokenBundle
+
+
+@dataclass
+class MarketRegistry:
+    """
+    Lookup tables for the markets and tokens of a group, built once when the
+    client connects so that resolving a symbol or an index doesn't have to
+    scan the configs and on-chain accounts every time.
+    """
+
+    tokens_by_index: typing.Dict[int, TokenBundle] = field(default_factory=dict)
+    perp_markets_by_symbol: typing.Dict[str, PerpMarketBundle] = field(default_factory=dict)
+    perp_markets_by_index: typing.Dict[int, PerpMarketBundle] = field(default_factory=dict)
+    serum3_markets_by_symbol: typing.Dict[str, Serum3MarketBundle] = field(default_factory=dict)
+    serum3_markets_by_index: typing.Dict[int, Serum3MarketBundle] = field(default_factory=dict)
+    by_public_key: typing.Dict[PublicKey, typing.Union[TokenBundle, PerpMarketBundle, Serum3MarketBundle]] = field(default_factory=dict)
+
+    @classmethod
+    def build(
+        cls,
+        group_config: dict,
+        perp_market_configs: [dict],
+        serum_market_configs: [dict],
+        perp_markets: [PerpMarket],
+        serum_markets: [Serum3Market],
+        serum_markets_external: [AsyncMarket],
+        banks: [Bank],
+        mint_infos: [MintInfo]
+    ) -> "MarketRegistry":
+        registry = cls()
+
+        banks_by_token_index = {bank.token_index: bank for bank in banks}
+
+        mint_infos_by_token_index = {mint_info.token_index: mint_info for mint_info in mint_infos}
+
+        for token_config in group_config['tokens']:
+            if token_config['tokenIndex'] not in banks_by_token_index:
+                continue
+
+            bank = banks_by_token_index[token_config['tokenIndex']]
+
+            token = TokenBundle(
+                config=token_config,
+                token_index=token_config['tokenIndex'],
+                symbol=token_config['symbol'],
+                bank_public_key=PublicKey(token_config['banks'][0]['publicKey']),
+                bank=bank,
+                mint_info=mint_infos_by_token_index.get(token_config['tokenIndex']),
+                oracle=bank.oracle
+            )
+
+            registry.tokens_by_index[token.token_index] = token
+
+            registry.by_public_key[token.bank_public_key] = token
+
+        perp_markets_by_index = {perp_market.perp_market_index: perp_market for perp_market in perp_markets}
+
+        for perp_market_config in perp_market_configs:
+            perp_market = perp_markets_by_index[perp_market_config['marketIndex']]
+
+            market = PerpMarketBundle(
+                config=perp_market_config,
+                market_index=perp_market_config['marketIndex'],
+                symbol=perp_market_config['name'],
+                public_key=PublicKey(perp_market_config['publicKey']),
+                perp_market=perp_market,
+                oracle=perp_market.oracle
+            )
+
+            registry.perp_markets_by_symbol[market.symbol] = market
+
+            registry.perp_markets_by_index[market.market_index] = market
+
+            registry.by_public_key[market.public_key] = market
+
+        serum_markets_by_index = {serum_market.market_index: serum_market for serum_market in serum_markets}
+
+        serum_markets_external_by_public_key = {
+            serum_market_external.state.public_key(): serum_market_external
+            for serum_market_external in serum_markets_external
+        }
+
+        for serum_market_config in serum_market_configs:
+            serum_market = serum_markets_by_index[serum_market_config['marketIndex']]
+
+            market = Serum3MarketBundle(
+                config=serum_market_config,
+                market_index=serum_market_config['marketIndex'],
+                symbol=serum_market_config['name'],
+                public_key=PublicKey(serum_market_config['publicKey']),
+                serum_market=serum_market,
+                serum_market_external=serum_markets_external_by_public_key[serum_market.serum_market_external],
+                serum_market_external_public_key=serum_market.serum_market_external,
+                base=registry.tokens_by_index.get(serum_market.base_token_index),
+                quote=registry.tokens_by_index.get(serum_market.quote_token_index)
+            )
+
+            registry.serum3_markets_by_symbol[market.symbol] = market
+
+            registry.serum3_markets_by_index[market.market_index] = market
+
+            registry.by_public_key[market.public_key] = market
+
+            registry.by_public_key[market.serum_market_external_public_key] = market
+
+        return registry
+
+    def market_type(self, symbol: str) -> typing.Literal['perpetual', 'spot']:
+        if symbol in self.perp_markets_by_symbol:
+            return 'perpetual'
+
+        if symbol in self.serum3_markets_by_symbol:
+            return 'spot'
+
+        raise ValueError(f"Unknown market {symbol}")
+
+    def perp_market(self, symbol: str) -> PerpMarketBundle:
+        try:
+            return self.perp_markets_by_symbol[symbol]
+        except KeyError:
+            raise ValueError(f"Unknown perp market {symbol}")
+
+    def perp_market_by_index(self, market_index: int) -> PerpMarketBundle:
+        try:
+            return self.perp_markets_by_index[market_index]
+        except KeyError:
+            raise ValueError(f"Unknown perp market index {market_index}")
+
+    def serum3_market(self, symbol: str) -> Serum3MarketBundle:
+        try:
+            return self.serum3_markets_by_symbol[symbol]
+        except KeyError:
+            raise ValueError(f"Unknown spot market {symbol}")
+
+    def serum3_market_by_index(self, market_index: int) -> Serum3MarketBundle:
+        try:
+            return self.serum3_markets_by_index[market_index]
+        except KeyError:
+            raise ValueError(f"Unknown spot market index {market_index}")
+
+    def token(self, token_index: int) -> TokenBundle:
+        try:
+            return self.tokens_by_index[token_index]
+        except KeyError:
+            raise ValueError(f"Unknown token index {token_index}")
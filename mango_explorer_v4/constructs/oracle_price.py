@@ -0,0 +1,26 @@
+import typing
+from decimal import Decimal
+
+
+class OraclePrice:
+    """
+    Price read off an oracle account, as price * 10 ^ expo in UI units.
+
+    Only holds the few fields that are actually used, so it's cheap enough to
+    build on every oracle update.
+    """
+
+    __slots__ = ('price', 'conf', 'expo', 'status', 'pub_slot')
+
+    def __init__(self, price: int, conf: int, expo: int, status: int, pub_slot: typing.Optional[int]):
+        self.price = price
+        self.conf = conf
+        self.expo = expo
+        self.status = status
+        self.pub_slot = pub_slot
+
+    def __repr__(self) -> str:
+        return f"OraclePrice(price={self.price}, conf={self.conf}, expo={self.expo}, status={self.status}, pub_slot={self.pub_slot})"
+
+    def ui_price(self) -> Decimal:
+        return self.price * (Decimal(10) ** self.expo)
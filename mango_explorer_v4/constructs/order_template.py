@@ -0,0 +1,70 @@
+import struct
+from dataclasses import dataclass
+
+from solana.publickey import PublicKey
+from solana.transaction import AccountMeta, TransactionInstruction
+
+I64, U64, U16, U8, BOOL = struct.Struct('<q'), struct.Struct('<Q'), struct.Struct('<H'), struct.Struct('<B'), struct.Struct('<?')
+
+# Byte offsets of the fields that change from one order to the next in the data of
+# each instruction, following their layouts: the 8 bytes identifier, a 1 byte side,
+# then fixed size fields, as every enum in between only has unit variants
+PERP_PLACE_ORDER_FIELDS = {
+    'price_lots': (9, I64),
+    'max_base_lots': (17, I64),
+    'max_quote_lots': (25, I64),
+    'client_order_id': (33, U64),
+    'reduce_only': (42, BOOL),
+    'expiry_timestamp': (43, U64),
+    'limit': (51, U8)
+}
+
+PERP_PLACE_ORDER_PEGGED_FIELDS = {
+    'price_offset_lots': (9, I64),
+    'peg_limit': (17, I64),
+    'max_base_lots': (25, I64),
+    'max_quote_lots': (33, I64),
+    'client_order_id': (41, U64),
+    'reduce_only': (50, BOOL),
+    'expiry_timestamp': (51, U64),
+    'limit': (59, U8)
+}
+
+SERUM3_PLACE_ORDER_FIELDS = {
+    'limit_price': (9, U64),
+    'max_base_qty': (17, U64),
+    'max_native_quote_qty_including_fees': (25, U64),
+    'client_order_id': (35, U64),
+    'limit': (43, U16)
+}
+
+
+@dataclass
+class OrderTemplate:
+    """
+    An order placement instruction with everything but its numeric fields
+    already built: the account metas, including the health accounts, and the
+    rest of the instruction data.
+
+    Placing another order of the same shape only takes patching the price, size
+    and client order id into a copy of the data.
+    """
+
+    keys: [AccountMeta]
+    program_id: PublicKey
+    data: bytes
+    fields: {str: (int, struct.Struct)}
+
+    @classmethod
+    def from_instruction(cls, instruction: TransactionInstruction, fields: {str: (int, struct.Struct)}) -> "OrderTemplate":
+        return cls(list(instruction.keys), instruction.program_id, bytes(instruction.data), fields)
+
+    def instruction(self, **values: int) -> TransactionInstruction:
+        data = bytearray(self.data)
+
+        for name, value in values.items():
+            offset, field = self.fields[name]
+
+            field.pack_into(data, offset, value)
+
+        return TransactionInstruction(list(self.keys), self.program_id, bytes(data))
@@ -0,0 +1,44 @@
+import typing
+from dataclasses import dataclass, field
+
+
+@dataclass
+class OrderbookL2Deltas:
+    symbol: str
+    levels: dict = field(default_factory=lambda: {'bids': {}, 'asks': {}})
+
+    def snapshot(self, bids: [[float, float]], asks: [[float, float]], slot: int) -> dict:
+        # Resets the level maps, so that any later update is diffed against this snapshot
+        self.levels = {'bids': dict(bids), 'asks': dict(asks)}
+
+        return {
+            'symbol': self.symbol,
+            'type': 'snapshot',
+            'bids': bids,
+            'asks': asks,
+            'slot': slot
+        }
+
+    def update(self, side: typing.Literal['bids', 'asks'], orders: [[float, float]], slot: int) -> typing.Optional[dict]:
+        previous, current = self.levels[side], dict(orders)
+
+        changes = [
+            *[[price, size] for price, size in current.items() if previous.get(price) != size],
+            *[[price, 0] for price in previous if price not in current]
+            # ^ A size of 0 means the level was removed
+        ]
+
+        self.levels[side] = current
+
+        if len(changes) == 0:
+            return None
+
+        changes.sort(key=lambda change: change[0], reverse=side == 'bids')
+
+        return {
+            'symbol': self.symbol,
+            'type': 'delta',
+            'bids': changes if side == 'bids' else [],
+            'asks': changes if side == 'asks' else [],
+            'slot': slot
+        }
@@ -1,7 +1,7 @@
-from decimal import Decimal
+from mango_explorer_v4.types.i80f48 import I80F48
 from dataclasses import dataclass
 
 @dataclass
 class Serum3Reserved():
-    all_reserved_as_base: Decimal
-    all_reserved_as_quote: Decimal
+    all_reserved_as_base: I80F48
+    all_reserved_as_quote: I80F48
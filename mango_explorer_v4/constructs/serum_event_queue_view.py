@@ -0,0 +1,97 @@
+import struct
+import typing
+
+from pyserum.market.types import Event, EventFlags
+from solana.publickey import PublicKey
+
+# Byte offsets into a raw Serum event queue account: the "serum" padding,
+# account flags, then head, count and next_seq_num, each padded to 8 bytes
+EVENT_QUEUE_HEADER = struct.Struct('<5sQI4xI4xI4x')
+
+EVENTS_OFFSET = EVENT_QUEUE_HEADER.size
+
+EVENT = struct.Struct('<BBB5sQQQ16s32sQ')
+
+INITIALIZED_FLAG, EVENT_QUEUE_FLAG = 1 << 0, 1 << 4
+
+FILL_FLAG, OUT_FLAG, BID_FLAG, MAKER_FLAG = 1 << 0, 1 << 1, 1 << 2, 1 << 3
+
+
+class SerumEventQueueView:
+    """
+    Reads events straight from the raw bytes of a Serum event queue, in
+    sequence order, without decoding the whole ring.
+
+    Serum events don't carry their sequence number, so it's derived from
+    their position instead: the newest event sits right before head + count
+    and has sequence number next_seq_num - 1.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+
+        _, account_flags, self.head, self.count, self.next_seq_num = EVENT_QUEUE_HEADER.unpack_from(self.data, 0)
+
+        if not account_flags & INITIALIZED_FLAG or not account_flags & EVENT_QUEUE_FLAG:
+            raise ValueError("Invalid events queue, either not initialized or not a event queue.")
+
+        self.capacity = (len(self.data) - EVENTS_OFFSET) // EVENT.size
+
+    @classmethod
+    def decode(cls, data: bytes) -> "SerumEventQueueView":
+        return cls(data)
+
+    def index(self, seq_num: int) -> int:
+        return (self.head + self.count - (self.next_seq_num - seq_num)) % self.capacity
+
+    def seq_nums(self, last_seq_num: typing.Optional[int] = None) -> range:
+        """Sequence numbers of the events still in the ring that come after last_seq_num, oldest first."""
+        start = max(self.next_seq_num - self.capacity, 0)
+
+        if last_seq_num is not None:
+            start = max(start, last_seq_num + 1)
+
+        return range(start, self.next_seq_num)
+
+    def event(self, index: int) -> Event:
+        (
+            flags, open_order_slot, fee_tier, _, native_quantity_released, native_quantity_paid,
+            native_fee_or_rebate, order_id, public_key, client_order_id
+        ) = EVENT.unpack_from(self.data, EVENTS_OFFSET + index * EVENT.size)
+
+        return Event(
+            event_flags=EventFlags(
+                fill=bool(flags & FILL_FLAG),
+                out=bool(flags & OUT_FLAG),
+                bid=bool(flags & BID_FLAG),
+                maker=bool(flags & MAKER_FLAG)
+            ),
+            open_order_slot=open_order_slot,
+            fee_tier=fee_tier,
+            native_quantity_released=native_quantity_released,
+            native_quantity_paid=native_quantity_paid,
+            native_fee_or_rebate=native_fee_or_rebate,
+            order_id=int.from_bytes(order_id, 'little'),
+            public_key=PublicKey(public_key),
+            client_order_id=client_order_id
+        )
+
+    def fills(self, last_seq_num: typing.Optional[int] = None) -> [Event]:
+        """Fill events that come after last_seq_num, or all of those in the ring, oldest first."""
+        fills = []
+
+        for seq_num in self.seq_nums(last_seq_num):
+            index = self.index(seq_num)
+
+            if not self.data[EVENTS_OFFSET + index * EVENT.size] & FILL_FLAG:
+                continue
+
+            event = self.event(index)
+
+            if event.native_quantity_paid <= 0:
+                continue
+                # ^ Same as pyserum, which leaves these out of its fills
+
+            fills.append(event)
+
+        return fills
@@ -59,7 +59,7 @@ async def main():
 
     tx.add(serum3_cancel_all_orders_ix, *serum3_place_order_ixs)
 
-    recent_blockhash = str((await mango_client.connection.get_latest_blockhash()).value.blockhash)
+    recent_blockhash = str(await mango_client.blockhashes.get())
 
     try:
         await mango_client.connection.send_transaction(tx, keypair, recent_blockhash=recent_blockhash); print(f"Quoted: {orders}")
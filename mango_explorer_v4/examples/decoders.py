@@ -0,0 +1,118 @@
+import argparse
+import dataclasses
+import random
+import timeit
+import tracemalloc
+
+from .. import accounts
+from ..account_decoders import compiled_decoder
+
+
+def normalize(value):
+    if dataclasses.is_dataclass(value):
+        return type(value), [normalize(getattr(value, field.name)) for field in dataclasses.fields(value)]
+
+    if isinstance(value, (list, bytes)):
+        return [normalize(item) for item in value]
+        # ^ The generated decode returns construct's ListContainer, a list too, and compact decoders bytes
+
+    return type(value), value
+    # ^ Along with the type, as == doesn't tell True from 1
+
+
+def decode(decoder, data: bytes):
+    try:
+        return normalize(decoder(data))
+    except Exception as exception:
+        return type(exception)
+
+
+def allocated(decoder, data: bytes) -> int:
+    tracemalloc.start()
+
+    decoded = decoder(data)
+
+    size, _ = tracemalloc.get_traced_memory()
+
+    tracemalloc.stop()
+
+    del decoded
+
+    return size
+
+
+def main():
+    # Checks that every compiled decoder returns exactly what the generated decode does, on random accounts
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '--samples',
+        default=20,
+        type=int
+    )
+
+    parser.add_argument(
+        '--seed',
+        default=0,
+        type=int
+    )
+
+    args = parser.parse_args()
+
+    generator = random.Random(args.seed)
+
+    for name in sorted(accounts._LAZY):
+        account_type = getattr(accounts, name)
+
+        if not isinstance(account_type, type) or not hasattr(account_type, 'layout'):
+            continue
+
+        decoder = compiled_decoder(account_type)
+
+        compact_decoder = compiled_decoder(account_type, compact=True)
+
+        if decoder is None:
+            print({'account': name, 'compiled': False})
+
+            continue
+
+        size = account_type.layout.sizeof()
+
+        samples = [
+            account_type.discriminator + bytes(size),
+            bytes(8 + size),
+            account_type.discriminator + bytes(size - 1),
+            account_type.discriminator + b'\xff' * size,
+            # ^ All ones is NaN as a float, which borsh refuses
+            *[
+                account_type.discriminator + generator.randbytes(size)
+                for _ in range(args.samples)
+            ]
+        ]
+
+        expected = [decode(account_type.decode, data) for data in samples]
+
+        mismatches = [index for index, data in enumerate(samples) if decode(decoder, data) != expected[index]]
+
+        compact_mismatches = [index for index, data in enumerate(samples) if decode(compact_decoder, data) != expected[index]]
+
+        data = samples[0]
+
+        number = max(1, 1000 * 1000 // size)
+
+        print({
+            'account': name,
+            'compiled': True,
+            'samples': len(samples),
+            'mismatches': mismatches,
+            'compact_mismatches': compact_mismatches,
+            'generated_ms': timeit.timeit(lambda: account_type.decode(data), number=number) / number * 1e3,
+            'compiled_ms': timeit.timeit(lambda: decoder(data), number=number) / number * 1e3,
+            'generated_kb': allocated(account_type.decode, data) / 1e3,
+            'compiled_kb': allocated(decoder, data) / 1e3,
+            'compact_kb': allocated(compact_decoder, data) / 1e3
+        })
+
+
+if __name__ == '__main__':
+    main()
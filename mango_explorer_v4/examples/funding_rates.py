@@ -0,0 +1,13 @@
+import asyncio
+
+from ..mango_client import MangoClient
+
+
+async def main():
+    mango_client = await MangoClient.connect()
+
+    print(await mango_client.funding_rates())
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
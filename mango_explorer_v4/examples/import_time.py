@@ -0,0 +1,56 @@
+import argparse
+import statistics
+import subprocess
+import sys
+
+
+def import_time(module: str) -> (float, float, int):
+    # A fresh interpreter every run, as nothing is imported yet when a CLI job or serverless task starts
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True
+    )
+
+    rows = [line.split('|') for line in process.stderr.splitlines() if line.startswith('import time:') and '[us]' not in line]
+
+    total = sum(int(row[0].removeprefix('import time:')) for row in rows)
+    # ^ Self times, summed over every module imported
+
+    mango_rows = [row for row in rows if row[2].strip().startswith('mango_explorer_v4.')]
+
+    mango_total = sum(int(row[0].removeprefix('import time:')) for row in mango_rows)
+    # ^ What this package's own modules cost, as opposed to its dependencies
+
+    return total / 1e6, mango_total / 1e6, len(mango_rows)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '--module',
+        default='mango_explorer_v4.mango_client'
+    )
+
+    parser.add_argument(
+        '--runs',
+        default=10,
+        type=int
+    )
+
+    args = parser.parse_args()
+
+    runs = [import_time(args.module) for _ in range(args.runs)]
+
+    print({
+        'module': args.module,
+        'median': statistics.median([total for total, _, _ in runs]),
+        'mango_explorer_v4_median': statistics.median([mango_total for _, mango_total, _ in runs]),
+        'mango_explorer_v4_modules': runs[0][2]
+    })
+
+
+if __name__ == '__main__':
+    main()
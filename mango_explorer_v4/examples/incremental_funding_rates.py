@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+
+from ..mango_client import MangoClient
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+
+    parser.add_argument(
+        '--symbols',
+        nargs='*',
+        default=None
+    )
+    # ^ All perp markets if left out
+
+    args = parser.parse_args()
+
+    mango_client = await MangoClient.connect()
+
+    async for message in mango_client.incremental_funding_rates(args.symbols):
+        print(message)
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -19,11 +19,17 @@ async def main():
         type=int
     )
 
+    parser.add_argument(
+        '--deltas',
+        help='Stream changed price levels only, after an initial snapshot.',
+        action='store_true'
+    )
+
     args = parser.parse_args()
 
     mango_client = await MangoClient.connect()
 
-    async for orderbook in mango_client.incremental_orderbook_l2(args.symbol, args.depth):
+    async for orderbook in mango_client.incremental_orderbook_l2(args.symbol, args.depth, args.deltas):
         print(orderbook)
 
 
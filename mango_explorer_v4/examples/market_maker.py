@@ -40,29 +40,23 @@ async def main():
     symbol = 'SOL/USDC'
 
     state = {
-        'orderbook': None,
-        'recent_blockhash': None
+        'orderbook': None
     }
 
     async def poll_orderbook():
         async for orderbook in mango_client.incremental_orderbook_l2(symbol, 5):
             state['orderbook'] = orderbook
 
-    async def poll_blockhash():
-        # All transactions require a Blockhash attached as metadata - rather than do the RPC
-        # roundtrip on each transaction build just for this, poll it in the background
-        async def poll():
-            state['recent_blockhash'] = str((await mango_client.connection.get_latest_blockhash()).value.blockhash)
-
-        while True: asyncio.ensure_future(poll()); await asyncio.sleep(1)
-
     asyncio.ensure_future(poll_orderbook())
-    asyncio.ensure_future(poll_blockhash())
+
+    # All transactions require a Blockhash attached as metadata - the client keeps
+    # one refreshed in the background, rather than doing the RPC roundtrip on each
+    mango_client.blockhashes.start()
 
     while True:
         try:
-            if state['recent_blockhash'] is None:
-                raise ValueError("Blockchash hasn't polled yet, skipping quote...")
+            if state['orderbook'] is None:
+                raise ValueError("Orderbook hasn't polled yet, skipping quote...")
 
             mid_price = round((state['orderbook']['bids'][0][0] + state['orderbook']['asks'][0][0]) / 2, 3)
 
@@ -80,15 +74,15 @@ async def main():
                 'size': 1,
             }]
 
-            serum3_cancel_all_orders_ix = mango_client.make_serum3_cancel_all_orders_ix(mango_account, 'SOL/USDC')
+            serum3_cancel_all_orders_ix = mango_client.make_serum3_cancel_all_orders_ix(mango_account, keypair, symbol)
 
-            serum3_place_order_ixs = [mango_client.make_serum3_place_order_ix(mango_account, **order) for order in orders]
+            serum3_place_order_ixs = [mango_client.make_serum3_place_order_ix(mango_account, keypair, **order) for order in orders]
 
             tx = Transaction()
 
             tx.add(serum3_cancel_all_orders_ix, *serum3_place_order_ixs)
 
-            response = await mango_client.connection.send_transaction(tx, keypair, recent_blockhash=state['recent_blockhash'])
+            response = await mango_client.connection.send_transaction(tx, keypair, recent_blockhash=str(await mango_client.blockhashes.get()))
 
             logging.info(f"Quoted {json.dumps(orders)}: f{response.value}")
         except Exception as exception:
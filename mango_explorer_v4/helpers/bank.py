@@ -1,4 +1,3 @@
-import decimal
 import sys
 
 from mango_explorer_v4.accounts.bank import Bank
@@ -7,30 +6,27 @@ from mango_explorer_v4.types.i80f48 import I80F48
 
 class BankHelper():
     @staticmethod
-    def native_deposits(bank: Bank) -> decimal.Decimal:
-        return bank.indexed_deposits.to_decimal() * bank.deposit_index.to_decimal()
+    def native_deposits(bank: Bank) -> I80F48:
+        return bank.indexed_deposits * bank.deposit_index
 
     @staticmethod
-    def native_borrows(bank: Bank) -> decimal.Decimal:
-        return bank.indexed_borrows.to_decimal() * bank.borrow_index.to_decimal()
+    def native_borrows(bank: Bank) -> I80F48:
+        return bank.indexed_borrows * bank.borrow_index
 
     @staticmethod
-    def scaled_init_asset_weight(bank: Bank, price: decimal.Decimal) -> I80F48:
+    def scaled_init_asset_weight(bank: Bank, price: I80F48) -> I80F48:
         deposits_quote = BankHelper.native_deposits(bank) * price
 
-        if bank.deposit_weight_scale_start_quote >= sys.maxsize or deposits_quote <= bank.deposit_weight_scale_start_quote:
+        if bank.deposit_weight_scale_start_quote >= sys.maxsize or deposits_quote <= I80F48.from_float(bank.deposit_weight_scale_start_quote):
             return bank.init_asset_weight
 
-        return I80F48.from_decimal(bank.init_asset_weight.to_decimal() * decimal.Decimal(bank.deposit_weight_scale_start_quote) / deposits_quote)
+        return bank.init_asset_weight * I80F48.from_float(bank.deposit_weight_scale_start_quote) / deposits_quote
 
     @staticmethod
-    def scaled_init_liab_weight(bank: Bank, price: decimal.Decimal) -> I80F48:
+    def scaled_init_liab_weight(bank: Bank, price: I80F48) -> I80F48:
         borrows_quote = BankHelper.native_borrows(bank) * price
 
-        if bank.borrow_weight_scale_start_quote >= sys.maxsize or borrows_quote <= bank.borrow_weight_scale_start_quote:
+        if bank.borrow_weight_scale_start_quote >= sys.maxsize or borrows_quote <= I80F48.from_float(bank.borrow_weight_scale_start_quote):
             return bank.init_liab_weight
 
-        return I80F48.from_decimal(bank.init_liab_weight.to_decimal() * borrows_quote / decimal.Decimal(bank.borrow_weight_scale_start_quote))
-
-
-
+        return bank.init_liab_weight * borrows_quote / I80F48.from_float(bank.borrow_weight_scale_start_quote)
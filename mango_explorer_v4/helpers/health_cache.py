@@ -1,6 +1,12 @@
 from mango_explorer_v4.accounts.mango_account import MangoAccount
+from mango_explorer_v4.constructs.serum3_reserved import Serum3Reserved
 from mango_explorer_v4.types.health_cache import HealthCache
+from mango_explorer_v4.types.health_type import HealthTypeKind, Maint
+from mango_explorer_v4.types.i80f48 import I80F48
 from mango_explorer_v4.helpers.mango_account import MangoAccountHelper
+from mango_explorer_v4.helpers.perp_info import PerpInfoHelper
+from mango_explorer_v4.helpers.prices import PricesHelper
+from mango_explorer_v4.helpers.serum3_info import Serum3InfoHelper
 
 
 class HealthCacheHelper():
@@ -9,4 +15,56 @@ class HealthCacheHelper():
         token_infos = [
             token_position.token_index
             for token_position in  MangoAccountHelper.active_token_positions(mango_account)
-        ]
\ No newline at end of file
+        ]
+
+    @staticmethod
+    def serum3_reservations(health_cache: HealthCache, health_type: HealthTypeKind) -> ([I80F48], [Serum3Reserved]):
+        token_max_reserved = [I80F48.from_int(0) for _ in range(0, len(health_cache.token_infos))]
+
+        serum3_reserved: [Serum3Reserved] = []
+
+        for serum3_info in health_cache.serum3_infos:
+            quote, base = health_cache.token_infos[serum3_info.quote_index], health_cache.token_infos[serum3_info.base_index]
+
+            reserved_base, reserved_quote = serum3_info.reserved_base, serum3_info.reserved_quote
+
+            quote_asset = PricesHelper.asset(quote.prices, health_type)
+
+            base_liab = PricesHelper.liab(base.prices, health_type)
+
+            all_reserved_as_base = reserved_base + reserved_quote * quote_asset / base_liab
+
+            base_asset = PricesHelper.asset(base.prices, health_type)
+
+            quote_liab = PricesHelper.liab(quote.prices, health_type)
+
+            all_reserved_as_quote = reserved_quote + reserved_base * base_asset / quote_liab
+
+            token_max_reserved[serum3_info.base_index] += all_reserved_as_base
+
+            token_max_reserved[serum3_info.quote_index] += all_reserved_as_quote
+
+            serum3_reserved.append(Serum3Reserved(all_reserved_as_base, all_reserved_as_quote))
+
+        return token_max_reserved, serum3_reserved
+
+    @staticmethod
+    def serum3_and_perp_contributions(health_cache: HealthCache, health_type: HealthTypeKind) -> [I80F48]:
+        token_max_reserved, serum3_reserved = HealthCacheHelper.serum3_reservations(health_cache, Maint())
+
+        return [
+            *[
+                Serum3InfoHelper.health_contribution(
+                    serum3_info,
+                    health_type,
+                    health_cache.token_infos,
+                    token_max_reserved,
+                    serum3_reserved[index]
+                )
+                for index, serum3_info in enumerate(health_cache.serum3_infos)
+            ],
+            *[
+                PerpInfoHelper.health_contribution(perp_info, health_type)
+                for perp_info in health_cache.perp_infos
+            ]
+        ]
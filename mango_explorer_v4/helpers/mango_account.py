@@ -1,3 +1,12 @@
+import asyncio
+import typing
+from concurrent.futures import ProcessPoolExecutor
+
+from anchorpy.error import AccountInvalidDiscriminator
+from base58 import b58encode
+from solana.publickey import PublicKey
+from solana.rpc.types import MemcmpOpts
+
 from mango_explorer_v4.accounts.mango_account import MangoAccount
 from mango_explorer_v4.types.token_position import TokenPosition
 from mango_explorer_v4.types.serum3_orders import Serum3Orders
@@ -28,3 +37,65 @@ class MangoAccountHelper:
             perp_position for perp_position in mango_account.perps
             if PerpPositionHelper.is_active(perp_position)
         ]
+
+    @staticmethod
+    def filters(group: PublicKey, owner: PublicKey = None, delegate: PublicKey = None) -> [MemcmpOpts]:
+        # Mango accounts can be resized, so there's no fixed dataSize to filter on -
+        # the discriminator and group comparisons are enough to leave other accounts out
+        filters = [
+            MemcmpOpts(offset=0, bytes=b58encode(MangoAccount.discriminator).decode()),
+            MemcmpOpts(offset=8, bytes=str(group))
+        ]
+
+        if owner is not None:
+            filters.append(MemcmpOpts(offset=40, bytes=str(owner)))
+
+        if delegate is not None:
+            filters.append(MemcmpOpts(offset=104, bytes=str(delegate)))
+
+        return filters
+
+    @staticmethod
+    def decode_many(entries: [(bytes, bytes)]) -> [MangoAccount]:
+        # Takes (public key, data) pairs as plain bytes, so that batches can be
+        # shipped to and decoded in worker processes
+        mango_accounts = []
+
+        for public_key, data in entries:
+            try:
+                mango_accounts.append(MangoAccount.decode(data, PublicKey(public_key)))
+            except AccountInvalidDiscriminator:
+                continue
+
+        return mango_accounts
+
+    @staticmethod
+    async def decode_pooled(
+        entries: [(bytes, bytes)],
+        chunk_size: int = 256,
+        max_workers: int = None
+    ) -> typing.AsyncIterator[typing.List[MangoAccount]]:
+        """
+
+        Decodes (public key, data) pairs with decode_many in a pool of worker processes.
+
+        :param entries: (public key, data) pairs as plain bytes
+        :param chunk_size: number of accounts decoded per worker process task
+        :param max_workers: size of the process pool, defaults to the number of CPUs
+        :return: batches of decoded accounts, in the order the workers finish them
+        """
+        if len(entries) == 0:
+            return
+
+        loop = asyncio.get_running_loop()
+
+        executor = ProcessPoolExecutor(max_workers)
+
+        try:
+            for batch in asyncio.as_completed([
+                loop.run_in_executor(executor, MangoAccountHelper.decode_many, entries[offset:offset + chunk_size])
+                for offset in range(0, len(entries), chunk_size)
+            ]):
+                yield await batch
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
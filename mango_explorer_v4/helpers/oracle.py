@@ -0,0 +1,41 @@
+import struct
+
+from anchorpy.coder.accounts import ACCOUNT_DISCRIMINATOR_SIZE
+
+from mango_explorer_v4.accounts.stub_oracle import StubOracle
+from mango_explorer_v4.constants import QUOTE_DECIMALS
+from mango_explorer_v4.constructs.oracle_price import OraclePrice
+from mango_explorer_v4.oracles import pyth
+
+# Byte offset of the price of a StubOracle, following StubOracle.layout: discriminator, group, mint
+STUB_ORACLE_PRICE_OFFSET = ACCOUNT_DISCRIMINATOR_SIZE + 32 + 32
+
+STUB_ORACLE_PRICE = struct.Struct('<Qq')
+# ^ The I80F48 price, an i128 split into its low and high 64 bits
+
+TRADING = 1
+
+
+class OracleHelper():
+    @staticmethod
+    def parse(data: bytes, base_decimals: int) -> OraclePrice:
+        """
+        Reads the price of any oracle account a bank or perp market can use.
+
+        StubOracle prices are in native quote per native base units, so they're
+        converted to UI units with base_decimals, which Pyth prices already are.
+
+        :param data: raw oracle account data
+        :param base_decimals: decimals of the token being priced
+        :return: the price, in UI units
+        """
+        if data[:4] == pyth.MAGIC.to_bytes(4, 'little'):
+            return pyth.parse_price(data)
+
+        if data[:ACCOUNT_DISCRIMINATOR_SIZE] == StubOracle.discriminator:
+            low, high = STUB_ORACLE_PRICE.unpack_from(data, STUB_ORACLE_PRICE_OFFSET)
+
+            # The price is bits / 2 ^ 48, which is exactly bits * 5 ^ 48 / 10 ^ 48
+            return OraclePrice((high << 64 | low) * 5 ** 48, 0, -48 + base_decimals - QUOTE_DECIMALS, TRADING, None)
+
+        raise ValueError("Unsupported oracle, only Pyth and StubOracle accounts can be read")
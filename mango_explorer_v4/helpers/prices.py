@@ -1,20 +1,19 @@
-import decimal
-
+from mango_explorer_v4.types.i80f48 import I80F48
 from mango_explorer_v4.types.prices import Prices
 from mango_explorer_v4.types.health_type import HealthTypeKind, Maint, LiquidationEnd
 
 
 class PricesHelper:
     @staticmethod
-    def liab(prices: Prices, health_type: HealthTypeKind) -> decimal.Decimal:
+    def liab(prices: Prices, health_type: HealthTypeKind) -> I80F48:
         if health_type in [Maint, LiquidationEnd] or health_type is None:
-            return prices.oracle.to_decimal()
+            return prices.oracle
         else:
-            return max(prices.oracle.to_decimal(), prices.stable.to_decimal())
+            return max(prices.oracle, prices.stable)
 
     @staticmethod
-    def asset(prices: Prices, health_type: HealthTypeKind) -> decimal.Decimal:
+    def asset(prices: Prices, health_type: HealthTypeKind) -> I80F48:
         if health_type in [Maint, LiquidationEnd] or health_type is None:
-            return prices.oracle.to_decimal()
+            return prices.oracle
         else:
-            return min(prices.oracle.to_decimal(), prices.stable.to_decimal())
+            return min(prices.oracle, prices.stable)
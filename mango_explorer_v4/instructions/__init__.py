@@ -1,197 +1,410 @@
-from .group_create import group_create, GroupCreateArgs, GroupCreateAccounts
-from .group_edit import group_edit, GroupEditArgs, GroupEditAccounts
-from .ix_gate_set import ix_gate_set, IxGateSetArgs, IxGateSetAccounts
-from .group_close import group_close, GroupCloseAccounts
-from .token_register import token_register, TokenRegisterArgs, TokenRegisterAccounts
-from .token_register_trustless import (
-    token_register_trustless,
-    TokenRegisterTrustlessArgs,
-    TokenRegisterTrustlessAccounts,
-)
-from .token_edit import token_edit, TokenEditArgs, TokenEditAccounts
-from .token_add_bank import token_add_bank, TokenAddBankArgs, TokenAddBankAccounts
-from .token_deregister import token_deregister, TokenDeregisterAccounts
-from .token_update_index_and_rate import (
-    token_update_index_and_rate,
-    TokenUpdateIndexAndRateAccounts,
-)
-from .account_create import account_create, AccountCreateArgs, AccountCreateAccounts
-from .account_expand import account_expand, AccountExpandArgs, AccountExpandAccounts
-from .account_edit import account_edit, AccountEditArgs, AccountEditAccounts
-from .account_toggle_freeze import (
-    account_toggle_freeze,
-    AccountToggleFreezeArgs,
-    AccountToggleFreezeAccounts,
-)
-from .account_close import account_close, AccountCloseArgs, AccountCloseAccounts
-from .account_buyback_fees_with_mngo import (
-    account_buyback_fees_with_mngo,
-    AccountBuybackFeesWithMngoArgs,
-    AccountBuybackFeesWithMngoAccounts,
-)
-from .stub_oracle_create import (
-    stub_oracle_create,
-    StubOracleCreateArgs,
-    StubOracleCreateAccounts,
-)
-from .stub_oracle_close import stub_oracle_close, StubOracleCloseAccounts
-from .stub_oracle_set import stub_oracle_set, StubOracleSetArgs, StubOracleSetAccounts
-from .token_deposit import token_deposit, TokenDepositArgs, TokenDepositAccounts
-from .token_deposit_into_existing import (
-    token_deposit_into_existing,
-    TokenDepositIntoExistingArgs,
-    TokenDepositIntoExistingAccounts,
-)
-from .token_withdraw import token_withdraw, TokenWithdrawArgs, TokenWithdrawAccounts
-from .flash_loan_begin import (
-    flash_loan_begin,
-    FlashLoanBeginArgs,
-    FlashLoanBeginAccounts,
-)
-from .flash_loan_end import flash_loan_end, FlashLoanEndArgs, FlashLoanEndAccounts
-from .health_region_begin import health_region_begin, HealthRegionBeginAccounts
-from .health_region_end import health_region_end, HealthRegionEndAccounts
-from .serum3_register_market import (
-    serum3_register_market,
-    Serum3RegisterMarketArgs,
-    Serum3RegisterMarketAccounts,
-)
-from .serum3_edit_market import (
-    serum3_edit_market,
-    Serum3EditMarketArgs,
-    Serum3EditMarketAccounts,
-)
-from .serum3_deregister_market import (
-    serum3_deregister_market,
-    Serum3DeregisterMarketAccounts,
-)
-from .serum3_create_open_orders import (
-    serum3_create_open_orders,
-    Serum3CreateOpenOrdersAccounts,
-)
-from .serum3_close_open_orders import (
-    serum3_close_open_orders,
-    Serum3CloseOpenOrdersAccounts,
-)
-from .serum3_place_order import (
-    serum3_place_order,
-    Serum3PlaceOrderArgs,
-    Serum3PlaceOrderAccounts,
-)
-from .serum3_cancel_order import (
-    serum3_cancel_order,
-    Serum3CancelOrderArgs,
-    Serum3CancelOrderAccounts,
-)
-from .serum3_cancel_all_orders import (
-    serum3_cancel_all_orders,
-    Serum3CancelAllOrdersArgs,
-    Serum3CancelAllOrdersAccounts,
-)
-from .serum3_settle_funds import serum3_settle_funds, Serum3SettleFundsAccounts
-from .serum3_settle_funds_v2 import (
-    serum3_settle_funds_v2,
-    Serum3SettleFundsV2Args,
-    Serum3SettleFundsV2Accounts,
-)
-from .serum3_liq_force_cancel_orders import (
-    serum3_liq_force_cancel_orders,
-    Serum3LiqForceCancelOrdersArgs,
-    Serum3LiqForceCancelOrdersAccounts,
-)
-from .liq_token_with_token import (
-    liq_token_with_token,
-    LiqTokenWithTokenArgs,
-    LiqTokenWithTokenAccounts,
-)
-from .liq_token_bankruptcy import (
-    liq_token_bankruptcy,
-    LiqTokenBankruptcyArgs,
-    LiqTokenBankruptcyAccounts,
-)
-from .token_liq_with_token import (
-    token_liq_with_token,
-    TokenLiqWithTokenArgs,
-    TokenLiqWithTokenAccounts,
-)
-from .token_liq_bankruptcy import (
-    token_liq_bankruptcy,
-    TokenLiqBankruptcyArgs,
-    TokenLiqBankruptcyAccounts,
-)
-from .perp_create_market import (
-    perp_create_market,
-    PerpCreateMarketArgs,
-    PerpCreateMarketAccounts,
-)
-from .perp_edit_market import (
-    perp_edit_market,
-    PerpEditMarketArgs,
-    PerpEditMarketAccounts,
-)
-from .perp_close_market import perp_close_market, PerpCloseMarketAccounts
-from .perp_deactivate_position import (
-    perp_deactivate_position,
-    PerpDeactivatePositionAccounts,
-)
-from .perp_place_order import (
-    perp_place_order,
-    PerpPlaceOrderArgs,
-    PerpPlaceOrderAccounts,
-)
-from .perp_place_order_pegged import (
-    perp_place_order_pegged,
-    PerpPlaceOrderPeggedArgs,
-    PerpPlaceOrderPeggedAccounts,
-)
-from .perp_cancel_order import (
-    perp_cancel_order,
-    PerpCancelOrderArgs,
-    PerpCancelOrderAccounts,
-)
-from .perp_cancel_order_by_client_order_id import (
-    perp_cancel_order_by_client_order_id,
-    PerpCancelOrderByClientOrderIdArgs,
-    PerpCancelOrderByClientOrderIdAccounts,
-)
-from .perp_cancel_all_orders import (
-    perp_cancel_all_orders,
-    PerpCancelAllOrdersArgs,
-    PerpCancelAllOrdersAccounts,
-)
-from .perp_cancel_all_orders_by_side import (
-    perp_cancel_all_orders_by_side,
-    PerpCancelAllOrdersBySideArgs,
-    PerpCancelAllOrdersBySideAccounts,
-)
-from .perp_consume_events import (
-    perp_consume_events,
-    PerpConsumeEventsArgs,
-    PerpConsumeEventsAccounts,
-)
-from .perp_update_funding import perp_update_funding, PerpUpdateFundingAccounts
-from .perp_settle_pnl import perp_settle_pnl, PerpSettlePnlAccounts
-from .perp_settle_fees import (
-    perp_settle_fees,
-    PerpSettleFeesArgs,
-    PerpSettleFeesAccounts,
-)
-from .perp_liq_base_or_positive_pnl import (
-    perp_liq_base_or_positive_pnl,
-    PerpLiqBaseOrPositivePnlArgs,
-    PerpLiqBaseOrPositivePnlAccounts,
-)
-from .perp_liq_force_cancel_orders import (
-    perp_liq_force_cancel_orders,
-    PerpLiqForceCancelOrdersArgs,
-    PerpLiqForceCancelOrdersAccounts,
-)
-from .perp_liq_negative_pnl_or_bankruptcy import (
-    perp_liq_negative_pnl_or_bankruptcy,
-    PerpLiqNegativePnlOrBankruptcyArgs,
-    PerpLiqNegativePnlOrBankruptcyAccounts,
-)
-from .alt_set import alt_set, AltSetArgs, AltSetAccounts
-from .alt_extend import alt_extend, AltExtendArgs, AltExtendAccounts
-from .compute_account_data import compute_account_data, ComputeAccountDataAccounts
-from .benchmark import benchmark
+import importlib
+import sys
+import typing
+from types import ModuleType
+
+if typing.TYPE_CHECKING:
+    from .group_create import group_create, GroupCreateArgs, GroupCreateAccounts
+    from .group_edit import group_edit, GroupEditArgs, GroupEditAccounts
+    from .ix_gate_set import ix_gate_set, IxGateSetArgs, IxGateSetAccounts
+    from .group_close import group_close, GroupCloseAccounts
+    from .token_register import token_register, TokenRegisterArgs, TokenRegisterAccounts
+    from .token_register_trustless import (
+        token_register_trustless,
+        TokenRegisterTrustlessArgs,
+        TokenRegisterTrustlessAccounts,
+    )
+    from .token_edit import token_edit, TokenEditArgs, TokenEditAccounts
+    from .token_add_bank import token_add_bank, TokenAddBankArgs, TokenAddBankAccounts
+    from .token_deregister import token_deregister, TokenDeregisterAccounts
+    from .token_update_index_and_rate import (
+        token_update_index_and_rate,
+        TokenUpdateIndexAndRateAccounts,
+    )
+    from .account_create import account_create, AccountCreateArgs, AccountCreateAccounts
+    from .account_expand import account_expand, AccountExpandArgs, AccountExpandAccounts
+    from .account_edit import account_edit, AccountEditArgs, AccountEditAccounts
+    from .account_toggle_freeze import (
+        account_toggle_freeze,
+        AccountToggleFreezeArgs,
+        AccountToggleFreezeAccounts,
+    )
+    from .account_close import account_close, AccountCloseArgs, AccountCloseAccounts
+    from .account_buyback_fees_with_mngo import (
+        account_buyback_fees_with_mngo,
+        AccountBuybackFeesWithMngoArgs,
+        AccountBuybackFeesWithMngoAccounts,
+    )
+    from .stub_oracle_create import (
+        stub_oracle_create,
+        StubOracleCreateArgs,
+        StubOracleCreateAccounts,
+    )
+    from .stub_oracle_close import stub_oracle_close, StubOracleCloseAccounts
+    from .stub_oracle_set import stub_oracle_set, StubOracleSetArgs, StubOracleSetAccounts
+    from .token_deposit import token_deposit, TokenDepositArgs, TokenDepositAccounts
+    from .token_deposit_into_existing import (
+        token_deposit_into_existing,
+        TokenDepositIntoExistingArgs,
+        TokenDepositIntoExistingAccounts,
+    )
+    from .token_withdraw import token_withdraw, TokenWithdrawArgs, TokenWithdrawAccounts
+    from .flash_loan_begin import (
+        flash_loan_begin,
+        FlashLoanBeginArgs,
+        FlashLoanBeginAccounts,
+    )
+    from .flash_loan_end import flash_loan_end, FlashLoanEndArgs, FlashLoanEndAccounts
+    from .health_region_begin import health_region_begin, HealthRegionBeginAccounts
+    from .health_region_end import health_region_end, HealthRegionEndAccounts
+    from .serum3_register_market import (
+        serum3_register_market,
+        Serum3RegisterMarketArgs,
+        Serum3RegisterMarketAccounts,
+    )
+    from .serum3_edit_market import (
+        serum3_edit_market,
+        Serum3EditMarketArgs,
+        Serum3EditMarketAccounts,
+    )
+    from .serum3_deregister_market import (
+        serum3_deregister_market,
+        Serum3DeregisterMarketAccounts,
+    )
+    from .serum3_create_open_orders import (
+        serum3_create_open_orders,
+        Serum3CreateOpenOrdersAccounts,
+    )
+    from .serum3_close_open_orders import (
+        serum3_close_open_orders,
+        Serum3CloseOpenOrdersAccounts,
+    )
+    from .serum3_place_order import (
+        serum3_place_order,
+        Serum3PlaceOrderArgs,
+        Serum3PlaceOrderAccounts,
+    )
+    from .serum3_cancel_order import (
+        serum3_cancel_order,
+        Serum3CancelOrderArgs,
+        Serum3CancelOrderAccounts,
+    )
+    from .serum3_cancel_all_orders import (
+        serum3_cancel_all_orders,
+        Serum3CancelAllOrdersArgs,
+        Serum3CancelAllOrdersAccounts,
+    )
+    from .serum3_settle_funds import serum3_settle_funds, Serum3SettleFundsAccounts
+    from .serum3_settle_funds_v2 import (
+        serum3_settle_funds_v2,
+        Serum3SettleFundsV2Args,
+        Serum3SettleFundsV2Accounts,
+    )
+    from .serum3_liq_force_cancel_orders import (
+        serum3_liq_force_cancel_orders,
+        Serum3LiqForceCancelOrdersArgs,
+        Serum3LiqForceCancelOrdersAccounts,
+    )
+    from .liq_token_with_token import (
+        liq_token_with_token,
+        LiqTokenWithTokenArgs,
+        LiqTokenWithTokenAccounts,
+    )
+    from .liq_token_bankruptcy import (
+        liq_token_bankruptcy,
+        LiqTokenBankruptcyArgs,
+        LiqTokenBankruptcyAccounts,
+    )
+    from .token_liq_with_token import (
+        token_liq_with_token,
+        TokenLiqWithTokenArgs,
+        TokenLiqWithTokenAccounts,
+    )
+    from .token_liq_bankruptcy import (
+        token_liq_bankruptcy,
+        TokenLiqBankruptcyArgs,
+        TokenLiqBankruptcyAccounts,
+    )
+    from .perp_create_market import (
+        perp_create_market,
+        PerpCreateMarketArgs,
+        PerpCreateMarketAccounts,
+    )
+    from .perp_edit_market import (
+        perp_edit_market,
+        PerpEditMarketArgs,
+        PerpEditMarketAccounts,
+    )
+    from .perp_close_market import perp_close_market, PerpCloseMarketAccounts
+    from .perp_deactivate_position import (
+        perp_deactivate_position,
+        PerpDeactivatePositionAccounts,
+    )
+    from .perp_place_order import (
+        perp_place_order,
+        PerpPlaceOrderArgs,
+        PerpPlaceOrderAccounts,
+    )
+    from .perp_place_order_pegged import (
+        perp_place_order_pegged,
+        PerpPlaceOrderPeggedArgs,
+        PerpPlaceOrderPeggedAccounts,
+    )
+    from .perp_cancel_order import (
+        perp_cancel_order,
+        PerpCancelOrderArgs,
+        PerpCancelOrderAccounts,
+    )
+    from .perp_cancel_order_by_client_order_id import (
+        perp_cancel_order_by_client_order_id,
+        PerpCancelOrderByClientOrderIdArgs,
+        PerpCancelOrderByClientOrderIdAccounts,
+    )
+    from .perp_cancel_all_orders import (
+        perp_cancel_all_orders,
+        PerpCancelAllOrdersArgs,
+        PerpCancelAllOrdersAccounts,
+    )
+    from .perp_cancel_all_orders_by_side import (
+        perp_cancel_all_orders_by_side,
+        PerpCancelAllOrdersBySideArgs,
+        PerpCancelAllOrdersBySideAccounts,
+    )
+    from .perp_consume_events import (
+        perp_consume_events,
+        PerpConsumeEventsArgs,
+        PerpConsumeEventsAccounts,
+    )
+    from .perp_update_funding import perp_update_funding, PerpUpdateFundingAccounts
+    from .perp_settle_pnl import perp_settle_pnl, PerpSettlePnlAccounts
+    from .perp_settle_fees import (
+        perp_settle_fees,
+        PerpSettleFeesArgs,
+        PerpSettleFeesAccounts,
+    )
+    from .perp_liq_base_or_positive_pnl import (
+        perp_liq_base_or_positive_pnl,
+        PerpLiqBaseOrPositivePnlArgs,
+        PerpLiqBaseOrPositivePnlAccounts,
+    )
+    from .perp_liq_force_cancel_orders import (
+        perp_liq_force_cancel_orders,
+        PerpLiqForceCancelOrdersArgs,
+        PerpLiqForceCancelOrdersAccounts,
+    )
+    from .perp_liq_negative_pnl_or_bankruptcy import (
+        perp_liq_negative_pnl_or_bankruptcy,
+        PerpLiqNegativePnlOrBankruptcyArgs,
+        PerpLiqNegativePnlOrBankruptcyAccounts,
+    )
+    from .alt_set import alt_set, AltSetArgs, AltSetAccounts
+    from .alt_extend import alt_extend, AltExtendArgs, AltExtendAccounts
+    from .compute_account_data import compute_account_data, ComputeAccountDataAccounts
+    from .benchmark import benchmark
+
+_LAZY = {
+    "group_create": ("group_create", "group_create"),
+    "GroupCreateArgs": ("group_create", "GroupCreateArgs"),
+    "GroupCreateAccounts": ("group_create", "GroupCreateAccounts"),
+    "group_edit": ("group_edit", "group_edit"),
+    "GroupEditArgs": ("group_edit", "GroupEditArgs"),
+    "GroupEditAccounts": ("group_edit", "GroupEditAccounts"),
+    "ix_gate_set": ("ix_gate_set", "ix_gate_set"),
+    "IxGateSetArgs": ("ix_gate_set", "IxGateSetArgs"),
+    "IxGateSetAccounts": ("ix_gate_set", "IxGateSetAccounts"),
+    "group_close": ("group_close", "group_close"),
+    "GroupCloseAccounts": ("group_close", "GroupCloseAccounts"),
+    "token_register": ("token_register", "token_register"),
+    "TokenRegisterArgs": ("token_register", "TokenRegisterArgs"),
+    "TokenRegisterAccounts": ("token_register", "TokenRegisterAccounts"),
+    "token_register_trustless": ("token_register_trustless", "token_register_trustless"),
+    "TokenRegisterTrustlessArgs": ("token_register_trustless", "TokenRegisterTrustlessArgs"),
+    "TokenRegisterTrustlessAccounts": ("token_register_trustless", "TokenRegisterTrustlessAccounts"),
+    "token_edit": ("token_edit", "token_edit"),
+    "TokenEditArgs": ("token_edit", "TokenEditArgs"),
+    "TokenEditAccounts": ("token_edit", "TokenEditAccounts"),
+    "token_add_bank": ("token_add_bank", "token_add_bank"),
+    "TokenAddBankArgs": ("token_add_bank", "TokenAddBankArgs"),
+    "TokenAddBankAccounts": ("token_add_bank", "TokenAddBankAccounts"),
+    "token_deregister": ("token_deregister", "token_deregister"),
+    "TokenDeregisterAccounts": ("token_deregister", "TokenDeregisterAccounts"),
+    "token_update_index_and_rate": ("token_update_index_and_rate", "token_update_index_and_rate"),
+    "TokenUpdateIndexAndRateAccounts": ("token_update_index_and_rate", "TokenUpdateIndexAndRateAccounts"),
+    "account_create": ("account_create", "account_create"),
+    "AccountCreateArgs": ("account_create", "AccountCreateArgs"),
+    "AccountCreateAccounts": ("account_create", "AccountCreateAccounts"),
+    "account_expand": ("account_expand", "account_expand"),
+    "AccountExpandArgs": ("account_expand", "AccountExpandArgs"),
+    "AccountExpandAccounts": ("account_expand", "AccountExpandAccounts"),
+    "account_edit": ("account_edit", "account_edit"),
+    "AccountEditArgs": ("account_edit", "AccountEditArgs"),
+    "AccountEditAccounts": ("account_edit", "AccountEditAccounts"),
+    "account_toggle_freeze": ("account_toggle_freeze", "account_toggle_freeze"),
+    "AccountToggleFreezeArgs": ("account_toggle_freeze", "AccountToggleFreezeArgs"),
+    "AccountToggleFreezeAccounts": ("account_toggle_freeze", "AccountToggleFreezeAccounts"),
+    "account_close": ("account_close", "account_close"),
+    "AccountCloseArgs": ("account_close", "AccountCloseArgs"),
+    "AccountCloseAccounts": ("account_close", "AccountCloseAccounts"),
+    "account_buyback_fees_with_mngo": ("account_buyback_fees_with_mngo", "account_buyback_fees_with_mngo"),
+    "AccountBuybackFeesWithMngoArgs": ("account_buyback_fees_with_mngo", "AccountBuybackFeesWithMngoArgs"),
+    "AccountBuybackFeesWithMngoAccounts": ("account_buyback_fees_with_mngo", "AccountBuybackFeesWithMngoAccounts"),
+    "stub_oracle_create": ("stub_oracle_create", "stub_oracle_create"),
+    "StubOracleCreateArgs": ("stub_oracle_create", "StubOracleCreateArgs"),
+    "StubOracleCreateAccounts": ("stub_oracle_create", "StubOracleCreateAccounts"),
+    "stub_oracle_close": ("stub_oracle_close", "stub_oracle_close"),
+    "StubOracleCloseAccounts": ("stub_oracle_close", "StubOracleCloseAccounts"),
+    "stub_oracle_set": ("stub_oracle_set", "stub_oracle_set"),
+    "StubOracleSetArgs": ("stub_oracle_set", "StubOracleSetArgs"),
+    "StubOracleSetAccounts": ("stub_oracle_set", "StubOracleSetAccounts"),
+    "token_deposit": ("token_deposit", "token_deposit"),
+    "TokenDepositArgs": ("token_deposit", "TokenDepositArgs"),
+    "TokenDepositAccounts": ("token_deposit", "TokenDepositAccounts"),
+    "token_deposit_into_existing": ("token_deposit_into_existing", "token_deposit_into_existing"),
+    "TokenDepositIntoExistingArgs": ("token_deposit_into_existing", "TokenDepositIntoExistingArgs"),
+    "TokenDepositIntoExistingAccounts": ("token_deposit_into_existing", "TokenDepositIntoExistingAccounts"),
+    "token_withdraw": ("token_withdraw", "token_withdraw"),
+    "TokenWithdrawArgs": ("token_withdraw", "TokenWithdrawArgs"),
+    "TokenWithdrawAccounts": ("token_withdraw", "TokenWithdrawAccounts"),
+    "flash_loan_begin": ("flash_loan_begin", "flash_loan_begin"),
+    "FlashLoanBeginArgs": ("flash_loan_begin", "FlashLoanBeginArgs"),
+    "FlashLoanBeginAccounts": ("flash_loan_begin", "FlashLoanBeginAccounts"),
+    "flash_loan_end": ("flash_loan_end", "flash_loan_end"),
+    "FlashLoanEndArgs": ("flash_loan_end", "FlashLoanEndArgs"),
+    "FlashLoanEndAccounts": ("flash_loan_end", "FlashLoanEndAccounts"),
+    "health_region_begin": ("health_region_begin", "health_region_begin"),
+    "HealthRegionBeginAccounts": ("health_region_begin", "HealthRegionBeginAccounts"),
+    "health_region_end": ("health_region_end", "health_region_end"),
+    "HealthRegionEndAccounts": ("health_region_end", "HealthRegionEndAccounts"),
+    "serum3_register_market": ("serum3_register_market", "serum3_register_market"),
+    "Serum3RegisterMarketArgs": ("serum3_register_market", "Serum3RegisterMarketArgs"),
+    "Serum3RegisterMarketAccounts": ("serum3_register_market", "Serum3RegisterMarketAccounts"),
+    "serum3_edit_market": ("serum3_edit_market", "serum3_edit_market"),
+    "Serum3EditMarketArgs": ("serum3_edit_market", "Serum3EditMarketArgs"),
+    "Serum3EditMarketAccounts": ("serum3_edit_market", "Serum3EditMarketAccounts"),
+    "serum3_deregister_market": ("serum3_deregister_market", "serum3_deregister_market"),
+    "Serum3DeregisterMarketAccounts": ("serum3_deregister_market", "Serum3DeregisterMarketAccounts"),
+    "serum3_create_open_orders": ("serum3_create_open_orders", "serum3_create_open_orders"),
+    "Serum3CreateOpenOrdersAccounts": ("serum3_create_open_orders", "Serum3CreateOpenOrdersAccounts"),
+    "serum3_close_open_orders": ("serum3_close_open_orders", "serum3_close_open_orders"),
+    "Serum3CloseOpenOrdersAccounts": ("serum3_close_open_orders", "Serum3CloseOpenOrdersAccounts"),
+    "serum3_place_order": ("serum3_place_order", "serum3_place_order"),
+    "Serum3PlaceOrderArgs": ("serum3_place_order", "Serum3PlaceOrderArgs"),
+    "Serum3PlaceOrderAccounts": ("serum3_place_order", "Serum3PlaceOrderAccounts"),
+    "serum3_cancel_order": ("serum3_cancel_order", "serum3_cancel_order"),
+    "Serum3CancelOrderArgs": ("serum3_cancel_order", "Serum3CancelOrderArgs"),
+    "Serum3CancelOrderAccounts": ("serum3_cancel_order", "Serum3CancelOrderAccounts"),
+    "serum3_cancel_all_orders": ("serum3_cancel_all_orders", "serum3_cancel_all_orders"),
+    "Serum3CancelAllOrdersArgs": ("serum3_cancel_all_orders", "Serum3CancelAllOrdersArgs"),
+    "Serum3CancelAllOrdersAccounts": ("serum3_cancel_all_orders", "Serum3CancelAllOrdersAccounts"),
+    "serum3_settle_funds": ("serum3_settle_funds", "serum3_settle_funds"),
+    "Serum3SettleFundsAccounts": ("serum3_settle_funds", "Serum3SettleFundsAccounts"),
+    "serum3_settle_funds_v2": ("serum3_settle_funds_v2", "serum3_settle_funds_v2"),
+    "Serum3SettleFundsV2Args": ("serum3_settle_funds_v2", "Serum3SettleFundsV2Args"),
+    "Serum3SettleFundsV2Accounts": ("serum3_settle_funds_v2", "Serum3SettleFundsV2Accounts"),
+    "serum3_liq_force_cancel_orders": ("serum3_liq_force_cancel_orders", "serum3_liq_force_cancel_orders"),
+    "Serum3LiqForceCancelOrdersArgs": ("serum3_liq_force_cancel_orders", "Serum3LiqForceCancelOrdersArgs"),
+    "Serum3LiqForceCancelOrdersAccounts": ("serum3_liq_force_cancel_orders", "Serum3LiqForceCancelOrdersAccounts"),
+    "liq_token_with_token": ("liq_token_with_token", "liq_token_with_token"),
+    "LiqTokenWithTokenArgs": ("liq_token_with_token", "LiqTokenWithTokenArgs"),
+    "LiqTokenWithTokenAccounts": ("liq_token_with_token", "LiqTokenWithTokenAccounts"),
+    "liq_token_bankruptcy": ("liq_token_bankruptcy", "liq_token_bankruptcy"),
+    "LiqTokenBankruptcyArgs": ("liq_token_bankruptcy", "LiqTokenBankruptcyArgs"),
+    "LiqTokenBankruptcyAccounts": ("liq_token_bankruptcy", "LiqTokenBankruptcyAccounts"),
+    "token_liq_with_token": ("token_liq_with_token", "token_liq_with_token"),
+    "TokenLiqWithTokenArgs": ("token_liq_with_token", "TokenLiqWithTokenArgs"),
+    "TokenLiqWithTokenAccounts": ("token_liq_with_token", "TokenLiqWithTokenAccounts"),
+    "token_liq_bankruptcy": ("token_liq_bankruptcy", "token_liq_bankruptcy"),
+    "TokenLiqBankruptcyArgs": ("token_liq_bankruptcy", "TokenLiqBankruptcyArgs"),
+    "TokenLiqBankruptcyAccounts": ("token_liq_bankruptcy", "TokenLiqBankruptcyAccounts"),
+    "perp_create_market": ("perp_create_market", "perp_create_market"),
+    "PerpCreateMarketArgs": ("perp_create_market", "PerpCreateMarketArgs"),
+    "PerpCreateMarketAccounts": ("perp_create_market", "PerpCreateMarketAccounts"),
+    "perp_edit_market": ("perp_edit_market", "perp_edit_market"),
+    "PerpEditMarketArgs": ("perp_edit_market", "PerpEditMarketArgs"),
+    "PerpEditMarketAccounts": ("perp_edit_market", "PerpEditMarketAccounts"),
+    "perp_close_market": ("perp_close_market", "perp_close_market"),
+    "PerpCloseMarketAccounts": ("perp_close_market", "PerpCloseMarketAccounts"),
+    "perp_deactivate_position": ("perp_deactivate_position", "perp_deactivate_position"),
+    "PerpDeactivatePositionAccounts": ("perp_deactivate_position", "PerpDeactivatePositionAccounts"),
+    "perp_place_order": ("perp_place_order", "perp_place_order"),
+    "PerpPlaceOrderArgs": ("perp_place_order", "PerpPlaceOrderArgs"),
+    "PerpPlaceOrderAccounts": ("perp_place_order", "PerpPlaceOrderAccounts"),
+    "perp_place_order_pegged": ("perp_place_order_pegged", "perp_place_order_pegged"),
+    "PerpPlaceOrderPeggedArgs": ("perp_place_order_pegged", "PerpPlaceOrderPeggedArgs"),
+    "PerpPlaceOrderPeggedAccounts": ("perp_place_order_pegged", "PerpPlaceOrderPeggedAccounts"),
+    "perp_cancel_order": ("perp_cancel_order", "perp_cancel_order"),
+    "PerpCancelOrderArgs": ("perp_cancel_order", "PerpCancelOrderArgs"),
+    "PerpCancelOrderAccounts": ("perp_cancel_order", "PerpCancelOrderAccounts"),
+    "perp_cancel_order_by_client_order_id": ("perp_cancel_order_by_client_order_id", "perp_cancel_order_by_client_order_id"),
+    "PerpCancelOrderByClientOrderIdArgs": ("perp_cancel_order_by_client_order_id", "PerpCancelOrderByClientOrderIdArgs"),
+    "PerpCancelOrderByClientOrderIdAccounts": ("perp_cancel_order_by_client_order_id", "PerpCancelOrderByClientOrderIdAccounts"),
+    "perp_cancel_all_orders": ("perp_cancel_all_orders", "perp_cancel_all_orders"),
+    "PerpCancelAllOrdersArgs": ("perp_cancel_all_orders", "PerpCancelAllOrdersArgs"),
+    "PerpCancelAllOrdersAccounts": ("perp_cancel_all_orders", "PerpCancelAllOrdersAccounts"),
+    "perp_cancel_all_orders_by_side": ("perp_cancel_all_orders_by_side", "perp_cancel_all_orders_by_side"),
+    "PerpCancelAllOrdersBySideArgs": ("perp_cancel_all_orders_by_side", "PerpCancelAllOrdersBySideArgs"),
+    "PerpCancelAllOrdersBySideAccounts": ("perp_cancel_all_orders_by_side", "PerpCancelAllOrdersBySideAccounts"),
+    "perp_consume_events": ("perp_consume_events", "perp_consume_events"),
+    "PerpConsumeEventsArgs": ("perp_consume_events", "PerpConsumeEventsArgs"),
+    "PerpConsumeEventsAccounts": ("perp_consume_events", "PerpConsumeEventsAccounts"),
+    "perp_update_funding": ("perp_update_funding", "perp_update_funding"),
+    "PerpUpdateFundingAccounts": ("perp_update_funding", "PerpUpdateFundingAccounts"),
+    "perp_settle_pnl": ("perp_settle_pnl", "perp_settle_pnl"),
+    "PerpSettlePnlAccounts": ("perp_settle_pnl", "PerpSettlePnlAccounts"),
+    "perp_settle_fees": ("perp_settle_fees", "perp_settle_fees"),
+    "PerpSettleFeesArgs": ("perp_settle_fees", "PerpSettleFeesArgs"),
+    "PerpSettleFeesAccounts": ("perp_settle_fees", "PerpSettleFeesAccounts"),
+    "perp_liq_base_or_positive_pnl": ("perp_liq_base_or_positive_pnl", "perp_liq_base_or_positive_pnl"),
+    "PerpLiqBaseOrPositivePnlArgs": ("perp_liq_base_or_positive_pnl", "PerpLiqBaseOrPositivePnlArgs"),
+    "PerpLiqBaseOrPositivePnlAccounts": ("perp_liq_base_or_positive_pnl", "PerpLiqBaseOrPositivePnlAccounts"),
+    "perp_liq_force_cancel_orders": ("perp_liq_force_cancel_orders", "perp_liq_force_cancel_orders"),
+    "PerpLiqForceCancelOrdersArgs": ("perp_liq_force_cancel_orders", "PerpLiqForceCancelOrdersArgs"),
+    "PerpLiqForceCancelOrdersAccounts": ("perp_liq_force_cancel_orders", "PerpLiqForceCancelOrdersAccounts"),
+    "perp_liq_negative_pnl_or_bankruptcy": ("perp_liq_negative_pnl_or_bankruptcy", "perp_liq_negative_pnl_or_bankruptcy"),
+    "PerpLiqNegativePnlOrBankruptcyArgs": ("perp_liq_negative_pnl_or_bankruptcy", "PerpLiqNegativePnlOrBankruptcyArgs"),
+    "PerpLiqNegativePnlOrBankruptcyAccounts": ("perp_liq_negative_pnl_or_bankruptcy", "PerpLiqNegativePnlOrBankruptcyAccounts"),
+    "alt_set": ("alt_set", "alt_set"),
+    "AltSetArgs": ("alt_set", "AltSetArgs"),
+    "AltSetAccounts": ("alt_set", "AltSetAccounts"),
+    "alt_extend": ("alt_extend", "alt_extend"),
+    "AltExtendArgs": ("alt_extend", "AltExtendArgs"),
+    "AltExtendAccounts": ("alt_extend", "AltExtendAccounts"),
+    "compute_account_data": ("compute_account_data", "compute_account_data"),
+    "ComputeAccountDataAccounts": ("compute_account_data", "ComputeAccountDataAccounts"),
+    "benchmark": ("benchmark", "benchmark"),
+}
+# ^ Exported name -> (submodule, attribute or None for the submodule itself). Building the borsh
+#   layouts of every submodule on import is slow, so each is only imported when first used
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module, attribute = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = importlib.import_module(f".{module}", __name__)
+
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_LAZY])
+
+
+class _LazyPackage(ModuleType):
+    def __setattr__(self, name: str, value: typing.Any):
+        if isinstance(value, ModuleType) and _LAZY.get(name) == (name, name):
+            value = getattr(value, name)
+            # ^ Importing a submodule binds it on the package, which would shadow the instruction
+            #   function named after it, as it did when the submodules were imported eagerly
+
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _LazyPackage
@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import typing
+from collections import defaultdict
+from dataclasses import dataclass
+
+from anchorpy.error import AccountInvalidDiscriminator
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Commitment, Processed
+from solana.rpc.core import _COMMITMENT_TO_SOLDERS
+from solana.rpc.types import MemcmpOpts
+from solana.rpc.websocket_api import connect
+from solders.account_decoder import UiAccountEncoding
+from solders.rpc.config import RpcAccountInfoConfig, RpcProgramAccountsConfig
+from solders.rpc.filter import Memcmp
+from solders.rpc.requests import GetProgramAccounts
+from solders.rpc.responses import GetProgramAccountsWithContextResp, ProgramNotification
+
+from .accounts.mango_account import MangoAccount
+from .helpers.mango_account import MangoAccountHelper
+from .program_id import PROGRAM_ID as MANGO_PROGRAM_ID
+
+INDEXES = ['owner', 'delegate', 'token', 'serum3', 'perp']
+
+
+@dataclass
+class MangoAccountIndexEntry:
+    slot: int
+    data: bytes
+    mango_account: MangoAccount
+    keys: typing.Dict[str, typing.List[typing.Any]]
+    # ^ What the account is filed under in each secondary index, to unfile it on change
+
+
+class MangoAccountIndex:
+    """
+    Every Mango account of a group, held in memory and queryable by owner,
+    delegate, and the token, serum3 market and perp market indexes of its
+    active positions.
+
+    load() scans all of them with getProgramAccounts, decoding them in worker
+    processes. start() then keeps them up to date with a programSubscribe
+    subscription, and scans again whenever it reconnects and then every
+    rescan_interval seconds. Closing an account erases its discriminator, so
+    the subscription's filter never notifies about it, and closed accounts
+    are only dropped by those scans.
+
+    Every entry records the slot it was read at, so that an update never gets
+    overwritten by an older one, and accounts are only decoded again when
+    their data changed.
+    """
+
+    def __init__(
+        self,
+        connection: AsyncClient,
+        endpoint: str,
+        group: PublicKey,
+        commitment: Commitment = Processed,
+        min_reconnect_delay: float = 0.5,
+        max_reconnect_delay: float = 30,
+        rescan_interval: typing.Optional[float] = 300
+    ):
+        self.connection = connection
+        self.endpoint = endpoint
+        self.group = group
+        self.commitment = commitment
+        self.min_reconnect_delay = min_reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.rescan_interval = rescan_interval
+        self.entries: typing.Dict[PublicKey, MangoAccountIndexEntry] = {}
+        self.indexes: typing.Dict[str, typing.DefaultDict[typing.Any, typing.Set[PublicKey]]] = {
+            index: defaultdict(set) for index in INDEXES
+        }
+        self.slot = 0
+        # ^ Slot of the last completed scan
+        self.task: typing.Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> typing.Iterator[MangoAccount]:
+        return (entry.mango_account for entry in list(self.entries.values()))
+
+    def get(self, public_key: PublicKey) -> typing.Optional[MangoAccount]:
+        entry = self.entries.get(public_key)
+
+        return entry.mango_account if entry is not None else None
+
+    def owned_by(self, owner: PublicKey) -> [MangoAccount]:
+        return self._query('owner', owner)
+
+    def delegated_to(self, delegate: PublicKey) -> [MangoAccount]:
+        return self._query('delegate', delegate)
+
+    def with_token(self, token_index: int) -> [MangoAccount]:
+        return self._query('token', token_index)
+
+    def with_serum3_market(self, market_index: int) -> [MangoAccount]:
+        return self._query('serum3', market_index)
+
+    def with_perp_market(self, perp_market_index: int) -> [MangoAccount]:
+        return self._query('perp', perp_market_index)
+
+    def _query(self, index: str, key: typing.Any) -> [MangoAccount]:
+        return [self.entries[public_key].mango_account for public_key in self.indexes[index].get(key, ())]
+
+    @staticmethod
+    def keys(mango_account: MangoAccount) -> typing.Dict[str, typing.List[typing.Any]]:
+        return {
+            'owner': [mango_account.owner],
+            'delegate': [mango_account.delegate],
+            'token': [token_position.token_index for token_position in MangoAccountHelper.active_token_positions(mango_account)],
+            'serum3': [serum3_orders.market_index for serum3_orders in MangoAccountHelper.active_serum3_orders(mango_account)],
+            'perp': [perp_position.market_index for perp_position in MangoAccountHelper.active_perp_positions(mango_account)]
+        }
+
+    def update(self, public_key: PublicKey, data: bytes, slot: int, mango_account: typing.Optional[MangoAccount] = None) -> bool:
+        """
+
+        Applies the data of an account read at slot, unless a more recent read of it already was.
+
+        :param public_key:
+        :param data:
+        :param slot:
+        :param mango_account: data, if already decoded
+        :return: whether the account changed
+        """
+        entry = self.entries.get(public_key)
+
+        if entry is not None and slot < entry.slot:
+            return False
+
+        if entry is not None and entry.data == data:
+            entry.slot = slot
+
+            return False
+
+        if mango_account is None:
+            try:
+                mango_account = MangoAccount.decode(data, public_key)
+            except AccountInvalidDiscriminator:
+                return self.remove(public_key)
+                # ^ Closed
+
+        self._unfile(public_key)
+
+        entry = self.entries[public_key] = MangoAccountIndexEntry(slot, data, mango_account, self.keys(mango_account))
+
+        for index, keys in entry.keys.items():
+            for key in keys:
+                self.indexes[index][key].add(public_key)
+
+        return True
+
+    def remove(self, public_key: PublicKey) -> bool:
+        if public_key not in self.entries:
+            return False
+
+        self._unfile(public_key)
+
+        del self.entries[public_key]
+
+        return True
+
+    def _unfile(self, public_key: PublicKey):
+        entry = self.entries.get(public_key)
+
+        if entry is None:
+            return
+
+        for index, keys in entry.keys.items():
+            for key in keys:
+                public_keys = self.indexes[index][key]
+
+                public_keys.discard(public_key)
+
+                if len(public_keys) == 0:
+                    del self.indexes[index][key]
+
+    def filters(self) -> [MemcmpOpts]:
+        return MangoAccountHelper.filters(self.group)
+
+    async def load(self, chunk_size: int = 256, max_workers: int = None) -> int:
+        """
+
+        Scans every Mango account of the group, decoding those new or changed since the last scan in worker processes.
+
+        :param chunk_size: number of accounts decoded per worker process task
+        :param max_workers: size of the process pool, defaults to the number of CPUs
+        :return: the slot of the scan
+        """
+        response = await self.connection._provider.make_request(
+            GetProgramAccounts(
+                MANGO_PROGRAM_ID.to_solders(),
+                RpcProgramAccountsConfig(
+                    RpcAccountInfoConfig(encoding=UiAccountEncoding.Base64, commitment=_COMMITMENT_TO_SOLDERS[self.commitment]),
+                    [Memcmp(*memcmp) for memcmp in self.filters()],
+                    with_context=True
+                )
+            ),
+            GetProgramAccountsWithContextResp
+        )
+        # ^ With its context, as the slot of the scan is needed to order it against notifications
+
+        slot = response.context.slot
+
+        accounts = {PublicKey(entry.pubkey): entry.account.data for entry in response.value}
+
+        del response
+
+        changed = [
+            (bytes(public_key), data) for public_key, data in accounts.items()
+            if public_key not in self.entries or self.entries[public_key].data != data
+        ]
+
+        async for batch in MangoAccountHelper.decode_pooled(changed, chunk_size, max_workers):
+            for mango_account in batch:
+                self.update(mango_account.public_key, accounts[mango_account.public_key], slot, mango_account)
+
+        for public_key, data in accounts.items():
+            self.update(public_key, data, slot)
+            # ^ Only bumps the slot of those unchanged or just decoded
+
+        for public_key in [public_key for public_key, entry in self.entries.items() if public_key not in accounts and entry.slot <= slot]:
+            self.remove(public_key)
+            # ^ Closed since the last scan
+
+        self.slot = max(self.slot, slot)
+
+        return slot
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self._follow())
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+
+            self.task = None
+
+    async def _follow(self):
+        delay = self.min_reconnect_delay
+
+        while True:
+            try:
+                async with connect(self.endpoint) as websocket:
+                    await websocket.program_subscribe(MANGO_PROGRAM_ID, self.commitment, 'base64', filters=self.filters())
+
+                    delay = self.min_reconnect_delay
+
+                    scan = asyncio.ensure_future(self._rescan())
+                    # ^ After subscribing, so that no update falls in between, and then periodically to drop closed accounts
+
+                    try:
+                        async for message in websocket:
+                            for submessage in message:
+                                if isinstance(submessage, ProgramNotification):
+                                    self.update(
+                                        PublicKey(submessage.result.value.pubkey),
+                                        submessage.result.value.account.data,
+                                        submessage.result.context.slot
+                                    )
+                    finally:
+                        scan.cancel()
+
+                raise ConnectionError('Websocket closed by the server')
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logging.warning(f"Mango account index websocket failed, reconnecting in {delay}s: {exception}")
+
+                await asyncio.sleep(delay)
+
+                delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _rescan(self):
+        while True:
+            try:
+                await self.load()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logging.error(f"Mango account index rescan failed: {exception}")
+
+            if self.rescan_interval is None:
+                return
+
+            await asyncio.sleep(self.rescan_interval)
@@ -1,32 +1,29 @@
 import asyncio
+import dataclasses
 import itertools
 import json
 import logging
 import pathlib
-import re
 import sys
 import time
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Literal
+from typing import AsyncIterator, Literal, Optional, Union
 
 import aiostream.stream
-import anchorpy.error
+import numpy as np
+from cachetools import LRUCache
 from collections import defaultdict
 from pyserum.async_open_orders_account import AsyncOpenOrdersAccount
 from pyserum.market import AsyncMarket, OrderBook
+from pyserum.market.state import MarketState
 from solana.keypair import Keypair
 from solana.publickey import PublicKey
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Processed
-from solana.rpc.websocket_api import connect
 from solana.transaction import AccountMeta, Transaction
-from solders.rpc.responses import AccountNotification
-from solders.account import Account
 
 from mango_explorer_v4.accounts.bank import Bank
-from mango_explorer_v4.accounts.book_side import BookSide
-from mango_explorer_v4.accounts.event_queue import EventQueue
 from mango_explorer_v4.accounts.mango_account import MangoAccount
 from mango_explorer_v4.accounts.mint_info import MintInfo
 from mango_explorer_v4.accounts.perp_market import PerpMarket
@@ -36,11 +33,10 @@ from mango_explorer_v4.helpers.token_position import TokenPositionHelper
 from mango_explorer_v4.helpers.perp_market import PerpMarketHelper
 from mango_explorer_v4.helpers.perp_position import PerpPositionHelper
 from mango_explorer_v4.helpers.bank import BankHelper
+from mango_explorer_v4.helpers.health_cache import HealthCacheHelper
 from mango_explorer_v4.helpers.prices import PricesHelper
 from mango_explorer_v4.helpers.mango_account import MangoAccountHelper
 from mango_explorer_v4.helpers.token_info import TokenInfoHelper
-from mango_explorer_v4.helpers.serum3_info import Serum3InfoHelper
-from mango_explorer_v4.helpers.perp_info import PerpInfoHelper
 from mango_explorer_v4.helpers.perp_open_order import PerpOpenOrderHelper
 from mango_explorer_v4.helpers.serum3_orders import Serum3Orders
 from mango_explorer_v4.instructions.perp_cancel_all_orders import PerpCancelAllOrdersArgs, PerpCancelAllOrdersAccounts, perp_cancel_all_orders
@@ -52,7 +48,6 @@ from mango_explorer_v4.instructions.serum3_place_order import Serum3PlaceOrderAr
 from mango_explorer_v4.program_id import PROGRAM_ID as MANGO_PROGRAM_ID
 from mango_explorer_v4.types import place_order_type
 from mango_explorer_v4.types import serum3_side, serum3_self_trade_behavior, serum3_order_type
-from mango_explorer_v4.types.fill_event import FillEvent
 from mango_explorer_v4.types.place_order_type import Limit
 from mango_explorer_v4.types.side import Bid, Ask
 from mango_explorer_v4.types.token_info import TokenInfo
@@ -64,10 +59,23 @@ from mango_explorer_v4.types.serum3_info import Serum3Info
 from mango_explorer_v4.types.health_cache import HealthCache
 from mango_explorer_v4.types.health_type import HealthTypeKind
 from mango_explorer_v4.types.perp_open_order import PerpOpenOrder
+from .account_decoders import AccountDecoders
+from .account_snapshot import AccountSnapshot
+from .account_subscriptions import AccountSubscriptions
+from .blockhash_cache import BlockhashCache
+from .mango_account_index import MangoAccountIndex
+from .market_metadata_cache import MarketMetadataCache
+from .open_orders_cache import OpenOrdersCache
+from .oracle_cache import OracleCache
+from .pda_cache import PdaCache
 from .constants import RUST_I64_MAX, SERUM_PROGRAM_ID
 from .constructs.book_side_items import BookSideItems
-from .constructs.serum3_reserved import Serum3Reserved
-from .oracles import pyth
+from .constructs.book_side_view import BookSideView
+from .constructs.event_queue_view import EventQueueView
+from .constructs.serum_event_queue_view import SerumEventQueueView
+from .constructs.market_registry import MarketRegistry
+from .constructs.order_template import OrderTemplate, PERP_PLACE_ORDER_FIELDS, PERP_PLACE_ORDER_PEGGED_FIELDS, SERUM3_PLACE_ORDER_FIELDS
+from .constructs.orderbook_l2_deltas import OrderbookL2Deltas
 
 logging.basicConfig(
     level=logging.INFO
@@ -85,9 +93,83 @@ class MangoClient():
     perp_markets: [PerpMarket]
     banks: [Bank]
     mint_infos: [MintInfo]
+    subscriptions: AccountSubscriptions = None
+    registry: MarketRegistry = None
+    health_remaining_accounts_cache: LRUCache = None
+    order_templates_cache: LRUCache = None
+    pdas: PdaCache = None
+    metadata_cache: MarketMetadataCache = None
+    metadata_slot: int = 0
+    metadata_accounts: {PublicKey: bytes} = None
+    metadata_refresh: asyncio.Task = None
+    # ^ Refresh started in the background when connecting from the cache, resolves to whether any account changed
+    blockhashes: BlockhashCache = None
+    oracles: OracleCache = None
+    open_orders_accounts: OpenOrdersCache = None
+    decoders: AccountDecoders = None
+
+    def __post_init__(self):
+        if self.decoders is None:
+            self.decoders = AccountDecoders()
+
+        if self.blockhashes is None:
+            self.blockhashes = BlockhashCache(self.connection)
+
+        if self.health_remaining_accounts_cache is None:
+            self.health_remaining_accounts_cache = LRUCache(maxsize=1024)
+
+        if self.order_templates_cache is None:
+            self.order_templates_cache = LRUCache(maxsize=1024)
+
+        if self.pdas is None:
+            self.pdas = PdaCache()
+
+        if self.registry is None:
+            self.registry = self._build_registry()
+
+        if self.subscriptions is None:
+            self.subscriptions = AccountSubscriptions(
+                self.connection._provider.endpoint_uri.replace('https://', 'wss://'),
+                self.connection
+            )
+
+        if self.open_orders_accounts is None:
+            self.open_orders_accounts = OpenOrdersCache(self.connection)
+
+        if self.oracles is None:
+            self.oracles = OracleCache(self.connection, self.subscriptions, self._oracle_decimals())
+
+    def _build_registry(self) -> MarketRegistry:
+        return MarketRegistry.build(
+            self.group_config,
+            self.perp_market_configs,
+            self.serum_market_configs,
+            self.perp_markets,
+            self.serum_markets,
+            self.serum_markets_external,
+            self.banks,
+            self.mint_infos
+        )
+
+    def _oracle_decimals(self) -> {PublicKey: int}:
+        return {
+            **{bank.oracle: bank.mint_decimals for bank in self.banks},
+            **{perp_market.oracle: perp_market.base_decimals for perp_market in self.perp_markets}
+        }
 
     @staticmethod
-    async def connect(rpc_url: str = 'https://mango.rpcpool.com/0f9acc0d45173b51bf7d7e09c1e5'):
+    async def connect(
+        rpc_url: str = 'https://mango.rpcpool.com/0f9acc0d45173b51bf7d7e09c1e5',
+        metadata_cache_path: Optional[str] = None
+    ):
+        """
+
+        Connects to the Mango group, loading the accounts of its banks and markets.
+
+        :param rpc_url:
+        :param metadata_cache_path: file to start from instead of fetching those accounts, which are then refreshed in the background
+        :return: the client
+        """
         connection = AsyncClient(rpc_url, Processed)
 
         ids = json.loads(open(pathlib.Path(__file__).parent / 'ids.json').read())
@@ -104,65 +186,186 @@ class MangoClient():
             serum_market_config for serum_market_config in group_config['serum3Markets'] if serum_market_config['active']
         ]
 
-        bank_configs = [
-            {
-                'tokenIndex': token_config['tokenIndex'],
-                'publicKey': PublicKey(token_config['banks'][0]['publicKey'])
-            }
-            for token_config in group_config['tokens']
-            if token_config['active']
-        ]
-
-        mint_info_configs = [
-            {
-                'tokenIndex': token_config['tokenIndex'],
-                'publicKey': PublicKey(token_config['mintInfo'])
-            }
-            for token_config in group_config['tokens']
-            if token_config['active']
-        ]
+        metadata_cache = MarketMetadataCache(metadata_cache_path) if metadata_cache_path is not None else None
 
-        mint_info_configs = list(sorted(mint_info_configs, key=lambda mint_info_config: mint_info_config['tokenIndex']))
+        cached = metadata_cache.load(
+            PublicKey(group_config['publicKey']),
+            MangoClient._metadata_public_keys(group_config, perp_market_configs, serum_market_configs)
+        ) if metadata_cache is not None else None
 
-        serum_markets = await Serum3Market.fetch_multiple(
-            connection,
-            [
-                PublicKey(serum3_market_config['publicKey']) for serum3_market_config in serum_market_configs
-            ]
-        )
-
-        serum_markets_external = await asyncio.gather(*[
-            AsyncMarket.load(connection, serum_market.serum_market_external, SERUM_PROGRAM_ID)
-            for serum_market in serum_markets
-        ])
+        if cached is None:
+            metadata_slot, metadata_accounts = await MangoClient._fetch_metadata(connection, group_config, perp_market_configs, serum_market_configs)
+        else:
+            metadata_slot, metadata_accounts = cached
 
-        banks, mint_infos, perp_markets = await asyncio.gather(*[
-            Bank.fetch_multiple(
-                connection,
-                [bank_config['publicKey'] for bank_config in bank_configs]
-            ),
-            MintInfo.fetch_multiple(
-                connection,
-                [mint_info_config['publicKey'] for mint_info_config in mint_info_configs]
-            ),
-            PerpMarket.fetch_multiple(
-                connection,
-                [perp_market_config['publicKey'] for perp_market_config in perp_market_configs]
-            )
-        ])
+        decoders = AccountDecoders()
 
-        return MangoClient(
+        client = MangoClient(
             connection=connection,
             group_config=group_config,
             serum_market_configs=serum_market_configs,
             perp_market_configs=perp_market_configs,
-            serum_markets=serum_markets,
-            serum_markets_external=serum_markets_external,
-            perp_markets=perp_markets,
-            banks=banks,
-            mint_infos=mint_infos
+            **MangoClient._decode_metadata(connection, group_config, perp_market_configs, serum_market_configs, metadata_accounts, decoders),
+            metadata_cache=metadata_cache,
+            metadata_slot=metadata_slot,
+            metadata_accounts=metadata_accounts,
+            decoders=decoders
+        )
+
+        if cached is not None:
+            client.metadata_refresh = asyncio.ensure_future(client._refresh_metadata_with_retries())
+        elif metadata_cache is not None:
+            metadata_cache.save(PublicKey(group_config['publicKey']), metadata_slot, metadata_accounts)
+
+        return client
+
+    @staticmethod
+    def _metadata_public_keys(group_config: dict, perp_market_configs: [dict], serum_market_configs: [dict]) -> [PublicKey]:
+        return [
+            *[
+                key
+                for token_config in group_config['tokens']
+                if token_config['active']
+                for key in [PublicKey(token_config['banks'][0]['publicKey']), PublicKey(token_config['mintInfo'])]
+            ],
+            *[PublicKey(perp_market_config['publicKey']) for perp_market_config in perp_market_configs],
+            *[
+                key
+                for serum_market_config in serum_market_configs
+                for key in [PublicKey(serum_market_config['publicKey']), PublicKey(serum_market_config['serumMarketExternal'])]
+            ]
+        ]
+
+    @staticmethod
+    async def _fetch_metadata(
+        connection: AsyncClient,
+        group_config: dict,
+        perp_market_configs: [dict],
+        serum_market_configs: [dict]
+    ) -> (int, {PublicKey: bytes}):
+        # Every account's address is in the group config, so they're all fetched in a single round trip
+        snapshot = await AccountSnapshot.fetch(
+            connection,
+            MangoClient._metadata_public_keys(group_config, perp_market_configs, serum_market_configs)
         )
 
+        return snapshot.slot, {public_key: account.data for public_key, account in snapshot.accounts.items()}
+
+    @staticmethod
+    def _decode_metadata(
+        connection: AsyncClient,
+        group_config: dict,
+        perp_market_configs: [dict],
+        serum_market_configs: [dict],
+        accounts: {PublicKey: bytes},
+        decoders: AccountDecoders
+    ) -> dict:
+        token_configs = [token_config for token_config in group_config['tokens'] if token_config['active']]
+
+        mint_decimals = {PublicKey(token_config['mint']): token_config['decimals'] for token_config in group_config['tokens']}
+
+        serum_markets = [
+            decoders.decode(Serum3Market, accounts[PublicKey(serum_market_config['publicKey'])])
+            for serum_market_config in serum_market_configs
+        ]
+
+        serum_markets_external = []
+
+        for serum_market in serum_markets:
+            data = accounts[serum_market.serum_market_external]
+
+            parsed_market = MarketState.LAYOUT().parse(data)
+
+            serum_markets_external.append(AsyncMarket(connection, MarketState.from_bytes(
+                SERUM_PROGRAM_ID,
+                mint_decimals[PublicKey(parsed_market.base_mint)],
+                mint_decimals[PublicKey(parsed_market.quote_mint)],
+                data
+            )))
+            # ^ The decimals of the mints come from the group config rather than from two more accounts per market
+
+        return {
+            'serum_markets': serum_markets,
+            'serum_markets_external': serum_markets_external,
+            'perp_markets': [
+                decoders.decode(PerpMarket, accounts[PublicKey(perp_market_config['publicKey'])])
+                for perp_market_config in perp_market_configs
+            ],
+            'banks': [
+                decoders.decode(Bank, accounts[PublicKey(token_config['banks'][0]['publicKey'])])
+                for token_config in token_configs
+            ],
+            'mint_infos': [
+                decoders.decode(MintInfo, accounts[PublicKey(token_config['mintInfo'])])
+                for token_config in sorted(token_configs, key=lambda token_config: token_config['tokenIndex'])
+            ]
+        }
+
+    async def refresh_metadata(self) -> bool:
+        """
+
+        Fetches the accounts of the banks and markets again, and swaps them in if any changed.
+
+        :return: whether any changed
+        """
+        slot, accounts = await self._fetch_metadata(self.connection, self.group_config, self.perp_market_configs, self.serum_market_configs)
+
+        if self.metadata_cache is not None:
+            self.metadata_cache.save(PublicKey(self.group_config['publicKey']), slot, accounts)
+
+        self.metadata_slot = slot
+
+        if accounts == self.metadata_accounts:
+            return False
+
+        for name, value in self._decode_metadata(
+            self.connection,
+            self.group_config,
+            self.perp_market_configs,
+            self.serum_market_configs,
+            accounts,
+            self.decoders
+        ).items():
+            setattr(self, name, value)
+
+        self.metadata_accounts = accounts
+
+        self.registry = self._build_registry()
+
+        self.oracles.decimals = self._oracle_decimals()
+
+        self.health_remaining_accounts_cache.clear()
+
+        self.order_templates_cache.clear()
+        # ^ Both hold bank and market addresses
+
+        return True
+
+    async def _refresh_metadata_with_retries(
+        self,
+        max_attempts: int = 8,
+        min_retry_delay: float = 0.5,
+        max_retry_delay: float = 30
+    ) -> bool:
+        delay = min_retry_delay
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                return await self.refresh_metadata()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                if attempt == max_attempts:
+                    logging.error(f"Market metadata refresh failed {max_attempts} times, still running on the cached accounts: {exception}")
+
+                    raise
+
+                logging.warning(f"Market metadata refresh failed, retrying in {delay}s: {exception}")
+
+                await asyncio.sleep(delay)
+
+                delay = min(delay * 2, max_retry_delay)
+
     def symbols(self):
         # This might not be the best format for keeping symbols organized,
         # as it presumes that perpetual and spot market names would never
@@ -194,28 +397,16 @@ class MangoClient():
             ]
         ]
 
-    async def orderbook_l2(self, symbol: str, depth: int = 100):
+    async def orderbook_l2(self, symbol: str, depth: int = 100, max_age: Optional[float] = None):
         # TODO: Validate that the symbol entered is valid
 
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+        market_type = self.registry.market_type(symbol)
 
         match market_type:
             case 'spot':
-                serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
+                serum3_market_bundle = self.registry.serum3_market(symbol)
 
-                serum_market_index = serum_market_config['marketIndex']
-
-                serum_market = [
-                    serum_market
-                    for serum_market in self.serum_markets
-                    if serum_market.market_index == serum_market_index
-                ][0]
-
-                serum_market_external = [
-                    serum_market_external
-                    for serum_market_external in self.serum_markets_external
-                    if serum_market_external.state.public_key() == serum_market.serum_market_external
-                ][0]
+                serum_market_external = serum3_market_bundle.serum_market_external
 
                 response = await self.connection.get_multiple_accounts([
                     serum_market_external.state.bids(),
@@ -238,170 +429,167 @@ class MangoClient():
 
                 return orderbook
             case 'perpetual':
-                perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
-
-                perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
-
-                accounts = await self.connection.get_multiple_accounts([perp_market.bids, perp_market.asks, perp_market.oracle])
-
-                [raw_bids, raw_asks, raw_oracle] = accounts.value
+                perp_market_bundle = self.registry.perp_market(symbol)
 
-                [bids, asks] = [BookSide.decode(raw_bids.data), BookSide.decode(raw_asks.data)]
+                perp_market = perp_market_bundle.perp_market
 
-                oracle = pyth.PRICE.parse(raw_oracle.data)
-
-                oracle_price = oracle.agg.price * (Decimal(10) ** oracle.expo)
+                bids, asks, oracle_price, slot = await self._perp_book_sides(perp_market, max_age)
 
                 orderbook = {
                     'symbol': symbol,
                     'bids': BookSideItems('bids', bids, perp_market, oracle_price).l2()[:depth],
                     'asks': BookSideItems('asks', asks, perp_market, oracle_price).l2()[:depth],
-                    'slot': accounts.context.slot
+                    'slot': slot
                 }
 
                 return orderbook
 
-    async def incremental_orderbook_l2(self, symbol: str, depth: int = 50):
-        # TODO: Validate the symbol exists
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
-
-        yield await self.orderbook_l2(symbol, depth)
+    async def incremental_orderbook_l2(self, symbol: str, depth: int = 50, deltas: bool = False):
+        """
 
-        match market_type:
-            case 'spot':
-                serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
+        Streams the L2 order book of a market. By default every update yields the
+        full book; with `deltas` enabled a full snapshot is sent first, and then
+        only the price levels that changed, were added or were removed (size 0)
+        on each side, tagged with the slot they were observed at. A new snapshot is
+        sent whenever the websocket reconnects and the book gets resynced. The book
+        sides are subscribed to before the first snapshot is read, so that nothing
+        written in between is missed.
 
-                serum_market_index = serum_market_config['marketIndex']
+        :param symbol:
+        :param depth:
+        :param deltas:
+        :return: async generator of order books, or of snapshots & deltas
+        """
 
-                serum_market = [
-                    serum_market
-                    for serum_market in self.serum_markets
-                    if serum_market.market_index == serum_market_index
-                ][0]
+        # TODO: Validate the symbol exists
+        market_type = self.registry.market_type(symbol)
 
-                serum_market_external = [
-                    serum_market_external
-                    for serum_market_external in self.serum_markets_external
-                    if serum_market_external.state.public_key() == serum_market.serum_market_external
-                ][0]
+        match market_type:
+            case 'spot':
+                serum_market_external = self.registry.serum3_market(symbol).serum_market_external
 
-                orderbook = {
-                    'symbol': symbol,
-                    'bids': None,
-                    'asks': None
+                public_keys = {
+                    'bids': serum_market_external.state.bids(),
+                    'asks': serum_market_external.state.asks()
                 }
+            case 'perpetual':
+                perp_market = self.registry.perp_market(symbol).perp_market
 
-                async def snapshots(side):
-                    async with connect(self.connection._provider.endpoint_uri.replace('https://', 'wss://')) as websocket:
-                        await websocket.account_subscribe(getattr(serum_market_external.state, side)(), Processed, 'jsonParsed')
-
-                        async for message in websocket:
-                            for submessage in message:
-                                if not isinstance(submessage, AccountNotification):
-                                    continue
-
-                                orders = [
-                                    [order.price, order.size]
-                                    for order in OrderBook.from_bytes(
-                                        serum_market_external.state,
-                                        submessage.result.value.data
-                                    ).get_l2(depth)
-                                ]
-
-                                yield side, orders, submessage.result.context.slot
-
-                async with aiostream.stream.merge(*[stream for stream in [snapshots(side) for side in ['bids', 'asks']]]).stream() as streamer:
-                    async for side, orders, slot in streamer:
-                        orderbook[side] = orders
+                public_keys = {
+                    'oracle_price': perp_market.oracle,
+                    'bids': perp_market.bids,
+                    'asks': perp_market.asks
+                }
 
-                        if not all([orderbook['bids'], orderbook['asks']]):
-                            continue
+        queues = {}
 
-                        yield orderbook
+        try:
+            for channel, public_key in public_keys.items():
+                queues[channel] = await self.subscriptions.subscribe(public_key)
+            # ^ Before the snapshot, so that what changes while it's fetched is buffered rather than missed
 
-            case 'perpetual':
-                perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+            snapshot = await self.orderbook_l2(symbol, depth)
 
-                perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+            orderbook_deltas = OrderbookL2Deltas(symbol)
 
-                state = {
-                    'oracle_price': None
-                }
+            yield orderbook_deltas.snapshot(snapshot['bids'], snapshot['asks'], snapshot['slot']) if deltas else snapshot
 
-                orderbook = {
-                    'symbol': symbol,
-                    'bids': None,
-                    'asks': None
-                }
+            state = {
+                'oracle_price': None
+            }
 
-                async def oracle_price():
-                    async with connect(self.connection._provider.endpoint_uri.replace('https://', 'wss://')) as websocket:
-                        await websocket.account_subscribe(perp_market.oracle, Processed, 'jsonParsed')
+            orderbook = {
+                'symbol': symbol,
+                'bids': snapshot['bids'] if deltas else None,
+                'asks': snapshot['asks'] if deltas else None
+            }
 
-                        async for message in websocket:
-                            for submessage in message:
-                                if not isinstance(submessage, AccountNotification):
-                                    continue
+            match market_type:
+                case 'spot':
+                    async def book(side):
+                        async for update in self.subscriptions.queued_updates(queues[side], snapshot['slot']):
+                            yield {
+                                'channel': 'book',
+                                'side': side,
+                                'orders': [
+                                    [order.price, order.size]
+                                    for order in OrderBook.from_bytes(serum_market_external.state, update.data).get_l2(depth)
+                                ],
+                                'slot': update.slot,
+                                'is_resync': update.is_resync
+                            }
 
-                                oracle = pyth.PRICE.parse(submessage.result.value.data)
+                    streams = [book(side) for side in ['bids', 'asks']]
 
-                                yield {
-                                    'channel': 'oracle_price',
-                                    'symbol': symbol,
-                                    'value': float(Decimal(str(oracle.agg.price)) * Decimal(10) ** Decimal(str(oracle.expo)))
-                                }
+                case 'perpetual':
+                    state['oracle_price'] = float(self.oracles.entries[perp_market.oracle].price.ui_price())
+                    # ^ Read along with the snapshot, books can't be priced until the oracle is written again otherwise
 
-                async def book(side):
-                    async with connect(self.connection._provider.endpoint_uri.replace('https://', 'wss://')) as websocket:
-                        await websocket.account_subscribe(getattr(perp_market, side), Processed, 'jsonParsed')
+                    async def oracle_price():
+                        async for update in self.subscriptions.queued_updates(queues['oracle_price'], snapshot['slot']):
+                            entry = self.oracles.update(perp_market.oracle, update.data, update.slot)
+                            # ^ Keeps the shared cache fresh for as long as the stream runs
 
-                        async for message in websocket:
-                            for submessage in message:
-                                if not isinstance(submessage, AccountNotification):
-                                    continue
+                            yield {
+                                'channel': 'oracle_price',
+                                'symbol': symbol,
+                                'value': float(entry.price.ui_price())
+                            }
 
+                    async def book(side):
+                        async for update in self.subscriptions.queued_updates(queues[side], snapshot['slot']):
                             if not state['oracle_price']:
                                 continue
 
                             yield {
                                 'channel': 'book',
                                 'side': side,
-                                'orders': BookSideItems(side, BookSide.decode(submessage.result.value.data), perp_market, state['oracle_price']).l2()
+                                'orders': BookSideItems(side, BookSideView(update.data), perp_market, state['oracle_price']).l2()[:depth],
+                                'slot': update.slot,
+                                'is_resync': update.is_resync
                             }
 
-                async with aiostream.stream.merge(*[oracle_price(), *[book(side) for side in ['bids', 'asks']]]).stream() as streamer:
-                    async for message in streamer:
-                        match message['channel']:
-                            case 'oracle_price':
-                                state['oracle_price'] = message['value']
-                            case 'book':
-                                orderbook[message['side']] = message['orders']
+                    streams = [oracle_price(), *[book(side) for side in ['bids', 'asks']]]
+
+            async with aiostream.stream.merge(*streams).stream() as streamer:
+                async for message in streamer:
+                    match message['channel']:
+                        case 'oracle_price':
+                            state['oracle_price'] = message['value']
 
-                        if not all([orderbook['bids'], orderbook['asks']]):
                             continue
+                        case 'book':
+                            orderbook[message['side']] = message['orders']
 
-                        yield orderbook
+                            if deltas:
+                                if message['is_resync']:
+                                    yield orderbook_deltas.snapshot(orderbook['bids'], orderbook['asks'], message['slot'])
 
-    async def orderbook_l3(self, symbol: str, depth: int = 0):
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+                                    continue
 
-        match market_type:
-            case 'spot':
-                serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
+                                delta = orderbook_deltas.update(message['side'], message['orders'], message['slot'])
 
-                serum_market_index = serum_market_config['marketIndex']
+                                if delta:
+                                    yield delta
 
-                serum_market = [
-                    serum_market
-                    for serum_market in self.serum_markets
-                    if serum_market.market_index == serum_market_index
-                ][0]
+                                continue
+
+                    if not all([orderbook['bids'], orderbook['asks']]):
+                        continue
+
+                    yield orderbook
+        finally:
+            for channel, queue in queues.items():
+                await self.subscriptions.unsubscribe(public_keys[channel], queue)
+
+    async def orderbook_l3(self, symbol: str, depth: int = 0, max_age: Optional[float] = None):
+        market_type = self.registry.market_type(symbol)
+
+        match market_type:
+            case 'spot':
+                serum3_market_bundle = self.registry.serum3_market(symbol)
 
-                serum_market_external = [
-                    serum_market_external
-                    for serum_market_external in self.serum_markets_external
-                    if serum_market_external.state.public_key() == serum_market.serum_market_external
-                ][0]
+                serum_market_external = serum3_market_bundle.serum_market_external
 
                 response = await self.connection.get_multiple_accounts([
                     serum_market_external.state.bids(),
@@ -438,57 +626,35 @@ class MangoClient():
 
                 return orderbook
             case 'perpetual':
-                perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
-
-                perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
-
-                accounts = await self.connection.get_multiple_accounts([perp_market.bids, perp_market.asks, perp_market.oracle])
-
-                [raw_bids, raw_asks, raw_oracle] = accounts.value
-
-                [bids, asks] = [BookSide.decode(raw_bids.data), BookSide.decode(raw_asks.data)]
+                perp_market_bundle = self.registry.perp_market(symbol)
 
-                oracle = pyth.PRICE.parse(raw_oracle.data)
+                perp_market = perp_market_bundle.perp_market
 
-                oracle_price = oracle.agg.price * (Decimal(10) ** oracle.expo)
+                bids, asks, oracle_price, slot = await self._perp_book_sides(perp_market, max_age)
 
                 orderbook = {
                     'symbol': symbol,
                     'bids': BookSideItems('bids', bids, perp_market, oracle_price).l3()[:(depth if depth != 0 else sys.maxsize)],
                     'asks': BookSideItems('asks', asks, perp_market, oracle_price).l3()[:(depth if depth != 0 else sys.maxsize)],
-                    'slot': accounts.context.slot
+                    'slot': slot
                 }
 
                 return orderbook
 
     async def orders(self, mango_account: MangoAccount):
-        serum_market_configs = [
-            (
-                [
-                    serum_market_config for serum_market_config in self.serum_market_configs
-                    if serum_market_config['marketIndex'] == serum3.market_index
-                ][0],
-                serum3
-            )
-            for serum3 in filter(Serum3OrdersHelper.is_active, mango_account.serum3)
-        ]
-
         serum_markets_external_with_meta = [
             (
-                [
-                    serum_market_external for serum_market_external in self.serum_markets_external
-                    if serum_market_external.state.public_key() == PublicKey(serum_market_config['serumMarketExternal'])
-                ][0],
-                serum_market_config,
+                self.registry.serum3_market_by_index(serum3.market_index).serum_market_external,
+                self.registry.serum3_market_by_index(serum3.market_index).config,
                 serum3
             )
-            for serum_market_config, serum3 in serum_market_configs
+            for serum3 in filter(Serum3OrdersHelper.is_active, mango_account.serum3)
         ]
 
         perp_markets_with_meta = [
             (
-                [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_index][0],
-                [perp_market_config for perp_market_config in self.perp_market_configs if perp_market_config['marketIndex'] == perp_market_index][0]
+                self.registry.perp_market_by_index(perp_market_index).perp_market,
+                self.registry.perp_market_by_index(perp_market_index).config
             )
             for perp_market_index in {
                 perp_open_order.market
@@ -497,7 +663,7 @@ class MangoClient():
             }
         ]
 
-        accounts = await self.connection.get_multiple_accounts([
+        snapshot = await AccountSnapshot.fetch(self.connection, [
             *itertools.chain(*[
                 (serum_market_external.state.bids(), serum_market_external.state.asks())
                 for serum_market_external, _, _
@@ -512,16 +678,10 @@ class MangoClient():
 
         orders = []
 
-        separator = len(serum_markets_external_with_meta) * 2
-
-        def chunks(chunkable, size): return [chunkable[n:n + size] for n in range(0, len(chunkable), size)]
-
-        for [serum_market_external, serum_market_config, serum3], [raw_bids, raw_asks] in zip(
-            serum_markets_external_with_meta, chunks(accounts.value[:separator], 2)
-        ):
+        for serum_market_external, serum_market_config, serum3 in serum_markets_external_with_meta:
             [bids, asks] = [
-                OrderBook.from_bytes(serum_market_external.state, raw_bids.data),
-                OrderBook.from_bytes(serum_market_external.state, raw_asks.data)
+                OrderBook.from_bytes(serum_market_external.state, snapshot[serum_market_external.state.bids()].data),
+                OrderBook.from_bytes(serum_market_external.state, snapshot[serum_market_external.state.asks()].data)
             ]
 
             orderbook = {
@@ -542,7 +702,7 @@ class MangoClient():
                         'client_order_id': ask.client_id
                     } for ask in asks.orders()
                 ],
-                'slot': accounts.context.slot
+                'slot': snapshot.slot
             }
 
             for side in ['bids', 'asks']:
@@ -558,16 +718,16 @@ class MangoClient():
                         'client_order_id': order['client_order_id']
                     })
 
-        for [perp_market, perp_market_config], [raw_bids, raw_asks, raw_oracle] in zip(perp_markets_with_meta, chunks(accounts.value[separator:], 3)):
-            [bids, asks, oracle] = [BookSide.decode(raw_bids.data), BookSide.decode(raw_asks.data), pyth.PRICE.parse(raw_oracle.data)]
+        for perp_market, perp_market_config in perp_markets_with_meta:
+            [bids, asks] = [BookSideView(snapshot[perp_market.bids].data), BookSideView(snapshot[perp_market.asks].data)]
 
-            oracle_price = oracle.agg.price * (Decimal(10) ** oracle.expo)
+            oracle_price = self.oracles.snapshot_prices(snapshot, [perp_market.oracle], [perp_market.oracle])[perp_market.oracle]
 
             orderbook = {
                 'symbol': perp_market_config['name'],
                 'bids': BookSideItems('bids', bids, perp_market, oracle_price).l3(),
                 'asks': BookSideItems('asks', asks, perp_market, oracle_price).l3(),
-                'slot': accounts.context.slot
+                'slot': snapshot.slot
             }
 
             for side in ['bids', 'asks']:
@@ -588,53 +748,32 @@ class MangoClient():
     async def fills(self, symbol: str):
         # TODO: Validate that the symbol entered is valid
 
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+        market_type = self.registry.market_type(symbol)
 
         match market_type:
             case 'spot':
-                serum_market_config = [
-                    serum3_market_config for serum3_market_config in self.group_config['serum3Markets']
-                    if serum3_market_config['name'] == symbol
-                ][0]
+                serum3_market_bundle = self.registry.serum3_market(symbol)
 
-                serum_market_index = serum_market_config['marketIndex']
+                serum_market_external = serum3_market_bundle.serum_market_external
 
-                serum_market: Serum3Market = [
-                    serum_market
-                    for serum_market in self.serum_markets
-                    if serum_market.market_index == serum_market_index
-                ][0]
+                response = await self.connection.get_account_info(serum_market_external.state.event_queue())
 
-                serum_market_external: AsyncMarket = [
-                    serum_market_external
-                    for serum_market_external in self.serum_markets_external
-                    if serum_market_external.state.public_key() == serum_market.serum_market_external
-                ][0]
+                fills = SerumEventQueueView(response.value.data).fills()[::-1]
+                # ^ Newest first, like pyserum's load_fills used to return them
 
                 return {
                     'symbol': symbol,
-                    'fills': [fill._asdict() for fill in await serum_market_external.load_fills(9999)]
+                    'fills': [serum_market_external.parse_fill_event(fill)._asdict() for fill in fills],
+                    'slot': response.context.slot
                 }
             case 'perpetual':
-                perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+                perp_market_bundle = self.registry.perp_market(symbol)
 
-                perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+                perp_market = perp_market_bundle.perp_market
 
                 response = await self.connection.get_account_info(perp_market.event_queue)
 
-                event_queue = EventQueue.decode(response.value.data)
-
-                fills = sorted(
-                    [
-                        fill
-                        for fill in [
-                            FillEvent.layout.parse(bytes([event.event_type] + event.padding))
-                            for event in event_queue.buf
-                            if event.event_type == 0
-                        ]
-                    ],
-                    key=lambda fill: fill.seq_num
-                )
+                fills = EventQueueView(response.value.data).fills()
 
                 return {
                     'symbol': symbol,
@@ -654,67 +793,86 @@ class MangoClient():
 
     async def incremental_fills(self, symbol: str):
         # TODO: Validate the symbol exists
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+        market_type = self.registry.market_type(symbol)
 
         match market_type:
             case 'spot':
-                raise NotImplementedError("Spot markets incremental fills retrieval isn't implemented yet")
-            case 'perpetual':
-                perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+                serum3_market_bundle = self.registry.serum3_market(symbol)
 
-                perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+                serum_market_external = serum3_market_bundle.serum_market_external
 
                 lead = None
 
-                async with connect(self.connection._provider.endpoint_uri.replace('https://', 'wss://')) as websocket:
-                    await websocket.account_subscribe(perp_market.event_queue, Processed, 'jsonParsed')
+                async for update in self.subscriptions.account_updates(serum_market_external.state.event_queue()):
+                    event_queue = SerumEventQueueView(update.data)
 
-                    async for message in websocket:
-                        for submessage in message:
-                            if not isinstance(submessage, AccountNotification):
-                                continue
+                    fills = [
+                        serum_market_external.parse_fill_event(fill)
+                        for fill in event_queue.fills(lead)
+                        if fill.event_flags.maker
+                    ]
+                    # ^ Each match also produces a taker event, but those are aggregated over all the makers it
+                    # matched, so keeping the maker side alone yields one fill per trade at the price it happened at
 
-                            event_queue = EventQueue.decode(submessage.result.value.data)
-
-                            fills = sorted(
-                                [
-                                    fill
-                                    for fill in [
-                                        FillEvent.layout.parse(bytes([event.event_type] + event.padding))
-                                        for event in event_queue.buf
-                                        if event.event_type == 0
-                                    ]
-                                    if fill.taker != PublicKey(0)
-                                ],
-                                key=lambda fill: fill.seq_num
-                            )
+                    lead = event_queue.next_seq_num - 1
 
-                            if lead:
-                                fills = [fill for fill in fills if fill.seq_num > lead]
-
-                                if len(fills) == 0:
-                                    continue
+                    if len(fills) == 0:
+                        continue
 
-                            yield {
-                                'symbol': symbol,
-                                'is_snapshot': False,
-                                'fills': [
-                                    {
-                                        'side': 'bids' if fill.taker_side else 'asks',
-                                        'price': PerpMarketHelper.price_lots_to_ui(perp_market, fill.price),
-                                        'size': PerpMarketHelper.base_lots_to_ui(perp_market, fill.quantity),
-                                        'taker': fill.taker,
-                                        'maker': fill.maker,
-                                        'timestamp': fill.timestamp
-                                    }
-                                    for fill in fills
-                                ],
-                                'slot': submessage.result.context.slot
+                    yield {
+                        'symbol': symbol,
+                        'is_snapshot': False,
+                        'fills': [
+                            {
+                                'side': 'asks' if fill.side == 'bids' else 'bids',
+                                # ^ Side of the taker, opposite to the maker's, which parse_fill_event names 'bids' or 'asks'
+                                'price': fill.price,
+                                'size': fill.size,
+                                'taker': None,
+                                'maker': fill.open_orders,
+                                'timestamp': None
+                                # ^ Serum events reference neither the taker nor a time
                             }
+                            for fill in fills
+                        ],
+                        'slot': update.slot
+                    }
+            case 'perpetual':
+                perp_market_bundle = self.registry.perp_market(symbol)
+
+                perp_market = perp_market_bundle.perp_market
+
+                lead = None
+
+                async for update in self.subscriptions.account_updates(perp_market.event_queue):
+                    event_queue = EventQueueView(update.data)
 
-                            lead = fills[-1:][0].seq_num
+                    fills = event_queue.fills(lead)
 
-    async def funding_rate(self, symbol: str):
+                    lead = event_queue.header.seq_num - 1
+                    # ^ Events up to here have been seen, whether they were fills or not
+
+                    if len(fills) == 0:
+                        continue
+
+                    yield {
+                        'symbol': symbol,
+                        'is_snapshot': False,
+                        'fills': [
+                            {
+                                'side': 'bids' if fill.taker_side else 'asks',
+                                'price': PerpMarketHelper.price_lots_to_ui(perp_market, fill.price),
+                                'size': PerpMarketHelper.base_lots_to_ui(perp_market, fill.quantity),
+                                'taker': fill.taker,
+                                'maker': fill.maker,
+                                'timestamp': fill.timestamp
+                            }
+                            for fill in fills
+                        ],
+                        'slot': update.slot
+                    }
+
+    async def funding_rate(self, symbol: str, max_age: Optional[float] = None):
         """
 
         Returns instantaneous funding rate for the day: funding is continuously
@@ -722,28 +880,202 @@ class MangoClient():
         multiplied by the time elapsed since it was last applied (capped to max. 1hr).
 
         :param symbol:
+        :param max_age: age in seconds up to which a cached oracle price is used instead of fetching it
         :return: instantaneous funding rate in % form
         """
 
-        perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+        perp_market_bundle = self.registry.perp_market(symbol)
 
-        perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+        perp_market = perp_market_bundle.perp_market
 
-        accounts = await self.connection.get_multiple_accounts([perp_market.bids, perp_market.asks, perp_market.oracle])
+        bids, asks, oracle_price, _ = await self._perp_book_sides(perp_market, max_age)
 
-        raw_bids, raw_asks, raw_oracle = accounts.value
+        oracle_price = float(oracle_price)
 
-        bids, asks, oracle = BookSide.decode(raw_bids.data), BookSide.decode(raw_asks.data), pyth.PRICE.parse(raw_oracle.data)
+        return self._funding(
+            perp_market,
+            self._impact_price(perp_market, 'bids', bids, oracle_price),
+            self._impact_price(perp_market, 'asks', asks, oracle_price),
+            oracle_price
+        )
 
-        oracle_price = float(Decimal(str(oracle.agg.price)) * Decimal(10) ** oracle.expo)
+    async def funding_rates(self, max_age: Optional[float] = None) -> {str: float}:
+        """
 
-        [bids, asks] = [BookSideItems('bids', bids, perp_market, oracle_price), BookSideItems('asks', asks, perp_market, oracle_price)]
+        Returns the instantaneous funding rates of all perp markets, as funding_rate
+        does, from the book sides and oracles of all of them read at the same slot.
 
-        min_funding, max_funding = float(perp_market.min_funding.to_decimal()), float(perp_market.max_funding.to_decimal())
+        :param max_age: age in seconds up to which a cached oracle price is used instead of fetching it
+        :return: instantaneous funding rate in % form, by symbol
+        """
+        _, books = await self._perp_books_snapshot([perp_market_config['name'] for perp_market_config in self.perp_market_configs], max_age)
+
+        funding_rates = {}
+
+        for symbol, (bids, asks, oracle_price) in books.items():
+            perp_market = self.registry.perp_market(symbol).perp_market
+
+            funding_rates[symbol] = self._funding(
+                perp_market,
+                self._impact_price(perp_market, 'bids', bids, oracle_price),
+                self._impact_price(perp_market, 'asks', asks, oracle_price),
+                oracle_price
+            )
+
+        return funding_rates
+
+    async def incremental_funding_rates(self, symbols: Optional[list[str]] = None):
+        """
+
+        Streams the instantaneous funding rates of perp markets, all of them by default.
+        The rates of every market are sent first, read at the same slot, and then a
+        market's again whenever it changes. Only the impact price of the book side
+        that changed is walked again, and both are on oracle price changes, as the
+        prices of oracle pegged orders follow it. The accounts are subscribed to
+        before the snapshot is read, so that nothing written in between is missed.
+
+        :param symbols:
+        :return: async generator of funding rates in % form, tagged with their symbol, slot and time
+        """
+        symbols = symbols if symbols is not None else [perp_market_config['name'] for perp_market_config in self.perp_market_configs]
+
+        public_keys = {}
+
+        for symbol in symbols:
+            perp_market = self.registry.perp_market(symbol).perp_market
+
+            public_keys.update({
+                (symbol, 'oracle'): perp_market.oracle,
+                (symbol, 'bids'): perp_market.bids,
+                (symbol, 'asks'): perp_market.asks
+            })
+
+        queues = {}
+
+        try:
+            for key, public_key in public_keys.items():
+                queues[key] = await self.subscriptions.subscribe(public_key)
+            # ^ Before the snapshot, so that what changes while it's fetched is buffered rather than missed
+
+            slot, books = await self._perp_books_snapshot(symbols)
+
+            state = {}
+
+            for symbol, (bids, asks, oracle_price) in books.items():
+                perp_market = self.registry.perp_market(symbol).perp_market
+
+                state[symbol] = {
+                    'bids': bids,
+                    'asks': asks,
+                    'oracle_price': oracle_price,
+                    'bid': self._impact_price(perp_market, 'bids', bids, oracle_price),
+                    'ask': self._impact_price(perp_market, 'asks', asks, oracle_price),
+                    'funding_rate': None
+                }
+
+            def market_funding_rate(symbol: str, slot: int):
+                market_state = state[symbol]
+
+                market_state['funding_rate'] = self._funding(
+                    self.registry.perp_market(symbol).perp_market,
+                    market_state['bid'],
+                    market_state['ask'],
+                    market_state['oracle_price']
+                )
+
+                return {'symbol': symbol, 'funding_rate': market_state['funding_rate'], 'slot': slot, 'timestamp': time.time()}
+
+            for symbol in symbols:
+                yield market_funding_rate(symbol, slot)
+
+            async def updates(symbol: str, channel: str):
+                async for update in self.subscriptions.queued_updates(queues[(symbol, channel)], slot):
+                    yield {'symbol': symbol, 'channel': channel, 'update': update}
+
+            streams = [updates(symbol, channel) for symbol, channel in queues]
+
+            async with aiostream.stream.merge(*streams).stream() as streamer:
+                async for message in streamer:
+                    symbol, update = message['symbol'], message['update']
 
-        impact_quantity = PerpMarketHelper.base_lots_to_ui(perp_market, perp_market.impact_quantity)
+                    perp_market = self.registry.perp_market(symbol).perp_market
 
-        bid, ask = [bids.impact_price(impact_quantity), asks.impact_price(impact_quantity)]
+                    market_state = state[symbol]
+
+                    match message['channel']:
+                        case 'oracle':
+                            entry = self.oracles.update(perp_market.oracle, update.data, update.slot)
+                            # ^ Keeps the shared cache fresh for as long as the stream runs
+
+                            oracle_price = float(entry.price.ui_price())
+
+                            if oracle_price == market_state['oracle_price']:
+                                continue
+
+                            market_state['oracle_price'] = oracle_price
+
+                            market_state['bid'] = self._impact_price(perp_market, 'bids', market_state['bids'], oracle_price)
+
+                            market_state['ask'] = self._impact_price(perp_market, 'asks', market_state['asks'], oracle_price)
+                        case 'bids' | 'asks':
+                            side = message['channel']
+
+                            market_state[side] = BookSideView(update.data)
+
+                            market_state[{'bids': 'bid', 'asks': 'ask'}[side]] = self._impact_price(
+                                perp_market,
+                                side,
+                                market_state[side],
+                                market_state['oracle_price']
+                            )
+
+                    previous_funding_rate = market_state['funding_rate']
+
+                    message = market_funding_rate(symbol, update.slot)
+
+                    if message['funding_rate'] != previous_funding_rate:
+                        yield message
+        finally:
+            for key, queue in queues.items():
+                await self.subscriptions.unsubscribe(public_keys[key], queue)
+
+    async def _perp_books_snapshot(
+        self,
+        symbols: [str],
+        max_age: Optional[float] = None
+    ) -> (int, {str: (BookSideView, BookSideView, float)}):
+        # The book sides of every market, with their oracles unless cached prices are fresh enough, in one snapshot
+        perp_markets = {symbol: self.registry.perp_market(symbol).perp_market for symbol in symbols}
+
+        oracles = [perp_market.oracle for perp_market in perp_markets.values()]
+
+        stale_oracles = self.oracles.stale(oracles, max_age)
+
+        snapshot = await AccountSnapshot.fetch(self.connection, [
+            *stale_oracles,
+            *[public_key for perp_market in perp_markets.values() for public_key in [perp_market.bids, perp_market.asks]]
+        ])
+
+        oracle_prices = self.oracles.snapshot_prices(snapshot, oracles, stale_oracles)
+
+        return snapshot.slot, {
+            symbol: (
+                BookSideView(snapshot[perp_market.bids].data),
+                BookSideView(snapshot[perp_market.asks].data),
+                float(oracle_prices[perp_market.oracle])
+            )
+            for symbol, perp_market in perp_markets.items()
+        }
+
+    @staticmethod
+    def _impact_price(perp_market: PerpMarket, side: Literal['bids', 'asks'], book_side: BookSideView, oracle_price: float) -> Optional[float]:
+        return BookSideItems(side, book_side, perp_market, oracle_price).impact_price(
+            PerpMarketHelper.base_lots_to_ui(perp_market, perp_market.impact_quantity)
+        )
+
+    @staticmethod
+    def _funding(perp_market: PerpMarket, bid: Optional[float], ask: Optional[float], oracle_price: float) -> float:
+        min_funding, max_funding = float(perp_market.min_funding.to_decimal()), float(perp_market.max_funding.to_decimal())
 
         if bid and ask:
             mid_price = (bid + ask) / 2
@@ -758,25 +1090,91 @@ class MangoClient():
 
         return funding * 100
 
+    async def _perp_book_sides(self, perp_market: PerpMarket, max_age: Optional[float] = None) -> (BookSideView, BookSideView, Decimal, int):
+        # Fetches the oracle along with the book sides, in the same call, unless the cached price is fresh enough
+        entry = self.oracles.entry(perp_market.oracle, max_age)
+
+        accounts = await self.connection.get_multiple_accounts([
+            perp_market.bids,
+            perp_market.asks,
+            *([perp_market.oracle] if entry is None else [])
+        ])
+
+        [raw_bids, raw_asks, *raw_oracle] = accounts.value
+
+        if entry is None:
+            entry = self.oracles.update(perp_market.oracle, raw_oracle[0].data, accounts.context.slot)
+
+        return BookSideView(raw_bids.data), BookSideView(raw_asks.data), entry.price.ui_price(), accounts.context.slot
+
     async def get_mango_account(self, public_key: str): return await MangoAccount.fetch(self.connection, PublicKey(public_key))
 
-    async def get_all_mango_accounts(self):
+    async def get_all_mango_accounts(self, owner: PublicKey = None, delegate: PublicKey = None):
+        return [
+            mango_account
+            async for mango_account in self.stream_mango_accounts(owner, delegate)
+        ]
+
+    async def stream_mango_accounts(
+        self,
+        owner: PublicKey = None,
+        delegate: PublicKey = None,
+        chunk_size: int = 256,
+        max_workers: int = None
+    ) -> AsyncIterator[MangoAccount]:
+        """
+        Yields the Mango accounts of the group, optionally filtered by owner or delegate,
+        in batches as worker processes finish decoding them
+
+        :param owner: only yield accounts with this owner
+        :param delegate: only yield accounts with this delegate
+        :param chunk_size: number of accounts decoded per worker process task
+        :param max_workers: size of the process pool, defaults to the number of CPUs
+        """
+
         response = await self.connection.get_program_accounts(
             MANGO_PROGRAM_ID,
-            encoding='base64'
+            encoding='base64',
+            filters=MangoAccountHelper.filters(PublicKey(self.group_config['publicKey']), owner, delegate)
         )
 
-        mango_accounts = []
+        entries = [(bytes(entry.pubkey), entry.account.data) for entry in response.value]
 
-        for entry in response.value: # TODO: Use proper filters instead
-            try:
-                mango_account = MangoAccount.decode(entry.account.data, entry.pubkey)
-            except anchorpy.error.AccountInvalidDiscriminator:
-                continue
+        del response
 
-            mango_accounts.append(mango_account)
+        async for batch in MangoAccountHelper.decode_pooled(entries, chunk_size, max_workers):
+            for mango_account in batch:
+                yield mango_account
 
-        return mango_accounts
+    async def mango_account_index(self, follow: bool = True, rescan_interval: Optional[float] = 300) -> MangoAccountIndex:
+        """
+
+        Loads every Mango account of the group into an index, queryable by owner, delegate and market.
+
+        :param follow: whether to keep it up to date through a programSubscribe subscription afterwards
+        :param rescan_interval: seconds between the scans dropping closed accounts while following, None to only scan on reconnection
+        :return: the index
+        """
+        mango_account_index = MangoAccountIndex(
+            self.connection,
+            self.subscriptions.endpoint,
+            PublicKey(self.group_config['publicKey']),
+            rescan_interval=rescan_interval
+        )
+
+        await mango_account_index.load()
+
+        if follow:
+            mango_account_index.start()
+
+        return mango_account_index
+
+    def mango_accounts_in_market(self, mango_account_index: MangoAccountIndex, symbol: str) -> [MangoAccount]:
+        match self.registry.market_type(symbol):
+            case 'perpetual':
+                return mango_account_index.with_perp_market(self.registry.perp_market(symbol).perp_market.perp_market_index)
+            case 'spot':
+                return mango_account_index.with_serum3_market(self.registry.serum3_market(symbol).market_index)
 
     def _health_remaining_accounts(
         self,
@@ -786,6 +1184,56 @@ class MangoClient():
         mango_account: MangoAccount,
         open_orders_for_market: [Serum3Market, PublicKey]
     ) -> [AccountMeta]:
+        # The remaining accounts only depend on which slots of the account are
+        # in use and on the extra banks and markets requested, so they're
+        # memoized on that layout rather than rebuilt for every instruction
+        key = (
+            retriever,
+            mango_account.public_key,
+            *self._account_layout(mango_account),
+            tuple(bank.token_index for bank in banks),
+            tuple(perp_market.perp_market_index for perp_market in perp_markets),
+            tuple((serum3_market.market_index, open_orders) for serum3_market, open_orders in open_orders_for_market)
+        )
+
+        remaining_accounts = self.health_remaining_accounts_cache.get(key)
+
+        if remaining_accounts is None:
+            remaining_accounts = [
+                AccountMeta(pubkey=remaining_account_pk, is_writable=False, is_signer=False)
+                for remaining_account_pk in self._health_remaining_account_pks(
+                    retriever,
+                    banks,
+                    perp_markets,
+                    mango_account,
+                    open_orders_for_market
+                )
+            ]
+
+            self.health_remaining_accounts_cache[key] = remaining_accounts
+
+        return list(remaining_accounts)
+
+    @staticmethod
+    def _account_layout(mango_account: MangoAccount) -> (tuple, tuple, tuple):
+        return (
+            tuple(token.token_index for token in mango_account.tokens),
+            tuple((serum3.market_index, serum3.open_orders) for serum3 in mango_account.serum3),
+            tuple(perp.market_index for perp in mango_account.perps)
+        )
+
+    def invalidate_health_remaining_accounts(self, mango_account: MangoAccount):
+        for key in [key for key in self.health_remaining_accounts_cache if key[1] == mango_account.public_key]:
+            del self.health_remaining_accounts_cache[key]
+
+    def _health_remaining_account_pks(
+        self,
+        retriever: Literal['fixed', 'scanning'],
+        banks: [Bank],
+        perp_markets: [PerpMarket],
+        mango_account: MangoAccount,
+        open_orders_for_market: [Serum3Market, PublicKey]
+    ) -> [PublicKey]:
         health_remaining_account_pks = []
 
         match retriever:
@@ -803,7 +1251,7 @@ class MangoClient():
                         token_indices[index] = bank.token_index
 
                 mint_infos = [
-                    [mint_info for mint_info in self.mint_infos if mint_info.token_index == token_index][0]
+                    self.registry.token(token_index).mint_info
                     for token_index in token_indices if token_index != 65535
                 ]
 
@@ -819,18 +1267,13 @@ class MangoClient():
                             idx for idx, perp in enumerate(mango_account.perps)
                             if perp.market_index == 65535
                             if perp_market_indices[idx] == 65535
-                        ][0] = perp_market.perp_market_index
+                        ][0]
 
                         perp_market_indices[index] = perp_market.perp_market_index
 
-                perp_markets = [
-                    perp_market for perp_market in self.perp_markets
-                    if perp_market.perp_market_index in [perp_index for perp_index in perp_market_indices if perp_index != 65535]
-                ]
-
-                perp_market_pks = [
-                    PublicKey(perp_market_config['publicKey']) for perp_market_config in self.group_config['perpMarkets']
-                    if perp_market_config['marketIndex'] in [perp_market.perp_market_index for perp_market in perp_markets]
+                perp_market_bundles = [
+                    self.registry.perp_market_by_index(perp_index)
+                    for perp_index in perp_market_indices if perp_index != 65535
                 ]
 
                 serum_position_indices = [{'market_index': serum3.market_index, 'open_orders': serum3.open_orders} for serum3 in mango_account.serum3]
@@ -854,9 +1297,9 @@ class MangoClient():
                     serum_position_indices[idx]['market_index'] = serum3_market.market_index
                     serum_position_indices[idx]['open_orders'] = open_orders
 
-                health_remaining_account_pks.extend(perp_market_pks)
+                health_remaining_account_pks.extend([perp_market_bundle.public_key for perp_market_bundle in perp_market_bundles])
 
-                health_remaining_account_pks.extend([perp_market.oracle for perp_market in perp_markets])
+                health_remaining_account_pks.extend([perp_market_bundle.oracle for perp_market_bundle in perp_market_bundles])
 
                 health_remaining_account_pks.extend([
                     serum_position_index['open_orders']
@@ -864,41 +1307,58 @@ class MangoClient():
                     if serum_position_index['market_index'] != 65535
                 ])
             case 'scanning':
-                raise NotImplementedError()
+                # No slots are reserved here: the program scans the accounts for
+                # the banks, oracles, perp markets and open orders it needs, so
+                # the extra ones are just appended after those already in use
+                token_indices = list(dict.fromkeys([
+                    *[token.token_index for token in mango_account.tokens if token.token_index != 65535],
+                    *[bank.token_index for bank in banks]
+                ]))
 
-        remaining_accounts: [AccountMeta] = [
-            AccountMeta(pubkey=remaining_account_pk, is_writable=False, is_signer=False)
-            for remaining_account_pk in health_remaining_account_pks
-        ]
+                mint_infos = [self.registry.token(token_index).mint_info for token_index in token_indices]
+
+                health_remaining_account_pks.extend([mint_info.banks[0] for mint_info in mint_infos])
+
+                health_remaining_account_pks.extend([mint_info.oracle for mint_info in mint_infos])
+
+                perp_market_bundles = [
+                    self.registry.perp_market_by_index(perp_index)
+                    for perp_index in dict.fromkeys([
+                        *[perp.market_index for perp in mango_account.perps if perp.market_index != 65535],
+                        *[perp_market.perp_market_index for perp_market in perp_markets]
+                    ])
+                ]
+
+                health_remaining_account_pks.extend([perp_market_bundle.public_key for perp_market_bundle in perp_market_bundles])
 
-        return remaining_accounts
+                health_remaining_account_pks.extend([perp_market_bundle.oracle for perp_market_bundle in perp_market_bundles])
+
+                serum_market_indices = [serum3.market_index for serum3 in mango_account.serum3 if serum3.market_index != 65535]
+
+                health_remaining_account_pks.extend([
+                    serum3.open_orders for serum3 in mango_account.serum3 if serum3.market_index != 65535
+                ])
+
+                health_remaining_account_pks.extend([
+                    open_orders for serum3_market, open_orders in open_orders_for_market
+                    if serum3_market.market_index not in serum_market_indices
+                ])
+
+        return health_remaining_account_pks
 
     def make_serum3_create_open_orders_ix(self, mango_account: MangoAccount, keypair: Keypair, symbol: str):
         # TODO: Check whether the symbol matches a valid Serum market name
-        serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
-
-        serum_market_index = serum_market_config['marketIndex']
+        serum3_market_bundle = self.registry.serum3_market(symbol)
 
-        serum_market = [
-            serum_market
-            for serum_market in self.serum_markets
-            if serum_market.market_index == serum_market_index
-        ][0]
+        serum_market = serum3_market_bundle.serum_market
 
-        [open_orders, _] = PublicKey.find_program_address(
-            [
-                bytes('Serum3OO', 'utf-8'),
-                bytes(mango_account.public_key),
-                bytes(PublicKey(serum_market_config['publicKey']))
-            ],
-            MANGO_PROGRAM_ID
-        )
+        open_orders = self.pdas.serum3_open_orders(mango_account.public_key, serum3_market_bundle.public_key, MANGO_PROGRAM_ID)
 
         serum3_create_open_orders_accounts: Serum3CreateOpenOrdersAccounts = {
             'group': mango_account.group,
             'account': mango_account.public_key,
             'owner': keypair.public_key,
-            'serum_market': PublicKey(serum_market_config['publicKey']),
+            'serum_market': serum3_market_bundle.public_key,
             'serum_program': serum_market.serum_program,
             'serum_market_external': serum_market.serum_market_external,
             'open_orders': open_orders,
@@ -909,86 +1369,55 @@ class MangoClient():
 
         return serum3_create_open_orders_ix
 
-    def make_serum3_place_order_ix(
+    def serum3_place_order_template(
         self,
         mango_account: MangoAccount,
         keypair: Keypair,
         symbol: str,
         side: Literal['bids', 'asks'],
-        price: float,
-        size: float,
-        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly'] = 'Limit',
-        client_order_id: int = int(time.time_ns() / 1e6)
-    ):
-        serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
+        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly'] = 'Limit'
+    ) -> OrderTemplate:
+        # Everything but the price, size and client order id only depends on the layout of the account
+        key = ('serum3_place_order', mango_account.public_key, keypair.public_key, symbol, side, mode, *self._account_layout(mango_account))
 
-        serum_market_index = serum_market_config['marketIndex']
+        template = self.order_templates_cache.get(key)
 
-        serum_market = [
-            serum_market
-            for serum_market in self.serum_markets
-            if serum_market.market_index == serum_market_index
-        ][0]
+        if template is not None:
+            return template
 
-        serum_market_external = [
-            serum_market_external
-            for serum_market_external in self.serum_markets_external
-            if serum_market_external.state.public_key() == serum_market.serum_market_external
-        ][0]
+        serum3_market_bundle = self.registry.serum3_market(symbol)
 
-        limit_price = serum_market_external.state.price_number_to_lots(price)
-
-        max_base_qty = serum_market_external.state.base_size_number_to_lots(size)
-
-        mode = serum3_order_type.from_decoded({mode: {}})
-
-        max_native_quote_qty_without_fees = limit_price * max_base_qty
+        serum_market_index = serum3_market_bundle.market_index
 
-        is_maker = mode == serum3_order_type.PostOnly()
+        serum_market = serum3_market_bundle.serum_market
 
-        fees = - (0.5 / 1e4) if is_maker else (1 / 1e4)
+        serum_market_external = serum3_market_bundle.serum_market_external
 
-        max_native_quote_qty_including_fees = max_native_quote_qty_without_fees + round(max_native_quote_qty_without_fees * fees)
+        mode = serum3_order_type.from_decoded({mode: {}})
 
         serum3_place_order_args: Serum3PlaceOrderArgs = {
             'side': {'bids': serum3_side.Bid(), 'asks': serum3_side.Ask()}[side],
-            'limit_price': limit_price,
-            'max_base_qty': max_base_qty,
-            'max_native_quote_qty_including_fees': max_native_quote_qty_including_fees,
+            'limit_price': 0,
+            'max_base_qty': 0,
+            'max_native_quote_qty_including_fees': 0,
             'self_trade_behavior': serum3_self_trade_behavior.DecrementTake(),
             'order_type': mode,
-            'client_order_id': client_order_id,
+            'client_order_id': 0,
             'limit': 10
         }
 
-        [open_orders, _] = PublicKey.find_program_address(
-            [
-                bytes('Serum3OO', 'utf-8'),
-                bytes(mango_account.public_key),
-                bytes(PublicKey(serum_market_config['publicKey']))
-            ],
-            MANGO_PROGRAM_ID
-        )
+        open_orders = self.pdas.serum3_open_orders(mango_account.public_key, serum3_market_bundle.public_key, MANGO_PROGRAM_ID)
 
         payer_token_index = {
             'bids': serum_market.quote_token_index,
             'asks': serum_market.base_token_index
         }[side]
 
-        bank = [bank for bank in self.banks if bank.token_index == payer_token_index][0]
+        payer_token = self.registry.token(payer_token_index)
 
-        bank_configs = [
-            {
-                'tokenIndex': token_config['tokenIndex'],
-                'publicKey': PublicKey(token_config['banks'][0]['publicKey'])
-            }
-            for token_config in self.group_config['tokens']
-            if token_config['active']
-        ]
+        bank = payer_token.bank
 
-        bank_config = [bank_config for bank_config in bank_configs if bank_config['tokenIndex'] == bank.token_index][0]
-
-        serum_market_external_vault_signer_address = PublicKey.create_program_address([
+        serum_market_external_vault_signer_address = self.pdas.create_program_address([
             bytes(serum_market.serum_market_external),
             serum_market_external.state.vault_signer_nonce().to_bytes(8, 'little')
         ], SERUM_PROGRAM_ID)
@@ -998,7 +1427,7 @@ class MangoClient():
             'account': mango_account.public_key,
             'owner': keypair.public_key,
             'open_orders': open_orders,
-            'serum_market': PublicKey(serum_market_config['publicKey']),
+            'serum_market': serum3_market_bundle.public_key,
             'serum_program': SERUM_PROGRAM_ID,
             'serum_market_external': serum_market.serum_market_external,
             'market_bids': serum_market_external.state.bids(),
@@ -1008,7 +1437,7 @@ class MangoClient():
             'market_base_vault': serum_market_external.state.base_vault(),
             'market_quote_vault': serum_market_external.state.quote_vault(),
             'market_vault_signer': serum_market_external_vault_signer_address,
-            'payer_bank': bank_config['publicKey'],
+            'payer_bank': payer_token.bank_public_key,
             'payer_vault': bank.vault,
             'payer_oracle': bank.oracle
         }
@@ -1023,10 +1452,10 @@ class MangoClient():
             open_orders_for_market.append([serum_market, open_orders])
 
             if not TokenPositionHelper.is_active(mango_account.tokens[serum_market.quote_token_index]):
-                banks.append([bank for bank in self.banks if bank.token_index == serum_market.quote_token_index][0])
+                banks.append(self.registry.token(serum_market.quote_token_index).bank)
 
             if not TokenPositionHelper.is_active(mango_account.tokens[serum_market.base_token_index]):
-                banks.append([bank for bank in self.banks if bank.token_index == serum_market.base_token_index][0])
+                banks.append(self.registry.token(serum_market.base_token_index).bank)
 
         remaining_accounts = self._health_remaining_accounts(
             'fixed',
@@ -1036,37 +1465,78 @@ class MangoClient():
             open_orders_for_market
         )
 
-        serum3_place_order_ix = serum3_place_order(
-            serum3_place_order_args,
-            serum3_place_order_accounts,
-            remaining_accounts=remaining_accounts
+        template = OrderTemplate.from_instruction(
+            serum3_place_order(
+                serum3_place_order_args,
+                serum3_place_order_accounts,
+                remaining_accounts=remaining_accounts
+            ),
+            SERUM3_PLACE_ORDER_FIELDS
         )
 
-        return serum3_place_order_ix
+        self.order_templates_cache[key] = template
 
-    def make_perp_place_order_ix(
+        return template
+
+    def make_serum3_place_order_ix(
         self,
         mango_account: MangoAccount,
         keypair: Keypair,
-        symbol,
-        side,
+        symbol: str,
+        side: Literal['bids', 'asks'],
         price: float,
         size: float,
-        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly', 'Market', 'PostOnlySlide'] = 'Limit',
-        client_order_id: int = int(time.time() * 1e3)
+        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly'] = 'Limit',
+        client_order_id: int = int(time.time_ns() / 1e6)
     ):
-        perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+        serum_market_external = self.registry.serum3_market(symbol).serum_market_external
+
+        limit_price = serum_market_external.state.price_number_to_lots(price)
+
+        max_base_qty = serum_market_external.state.base_size_number_to_lots(size)
+
+        max_native_quote_qty_without_fees = limit_price * max_base_qty
+
+        is_maker = mode == 'PostOnly'
+
+        fees = - (0.5 / 1e4) if is_maker else (1 / 1e4)
+
+        max_native_quote_qty_including_fees = max_native_quote_qty_without_fees + round(max_native_quote_qty_without_fees * fees)
+
+        return self.serum3_place_order_template(mango_account, keypair, symbol, side, mode).instruction(
+            limit_price=limit_price,
+            max_base_qty=max_base_qty,
+            max_native_quote_qty_including_fees=max_native_quote_qty_including_fees,
+            client_order_id=client_order_id
+        )
 
-        perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+    def perp_place_order_template(
+        self,
+        mango_account: MangoAccount,
+        keypair: Keypair,
+        symbol: str,
+        side: Literal['bids', 'asks'],
+        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly', 'Market', 'PostOnlySlide'] = 'Limit'
+    ) -> OrderTemplate:
+        key = ('perp_place_order', mango_account.public_key, keypair.public_key, symbol, side, mode, *self._account_layout(mango_account))
+
+        template = self.order_templates_cache.get(key)
+
+        if template is not None:
+            return template
+
+        perp_market_bundle = self.registry.perp_market(symbol)
+
+        perp_market = perp_market_bundle.perp_market
 
         mode = place_order_type.from_decoded({mode: {}})
 
         perp_place_order_args: PerpPlaceOrderArgs = {
             'side': {'bids': Bid, 'asks': Ask}[side],
-            'price_lots': PerpMarketHelper.ui_price_to_lots(perp_market, price),
-            'max_base_lots': PerpMarketHelper.ui_base_to_lots(perp_market, size),
+            'price_lots': 0,
+            'max_base_lots': 0,
             'max_quote_lots': sys.maxsize,
-            'client_order_id': client_order_id,
+            'client_order_id': 0,
             'order_type': mode,
             'reduce_only': False,
             'expiry_timestamp': 0,
@@ -1077,22 +1547,46 @@ class MangoClient():
             'group': perp_market.group,
             'account': mango_account.public_key,
             'owner': keypair.public_key,
-            'perp_market': PublicKey(perp_market_config['publicKey']),
+            'perp_market': perp_market_bundle.public_key,
             'bids': perp_market.bids,
             'asks': perp_market.asks,
             'event_queue': perp_market.event_queue,
             'oracle': perp_market.oracle
         }
 
-        remaining_accounts = self._health_remaining_accounts('fixed', [[bank for bank in self.banks if bank.token_index == 0][0]], [perp_market], mango_account, [])
+        remaining_accounts = self._health_remaining_accounts('fixed', [self.registry.token(0).bank], [perp_market], mango_account, [])
 
-        perp_place_order_ix = perp_place_order(
-            perp_place_order_args,
-            perp_place_order_accounts,
-            remaining_accounts=remaining_accounts
+        template = OrderTemplate.from_instruction(
+            perp_place_order(
+                perp_place_order_args,
+                perp_place_order_accounts,
+                remaining_accounts=remaining_accounts
+            ),
+            PERP_PLACE_ORDER_FIELDS
         )
 
-        return perp_place_order_ix
+        self.order_templates_cache[key] = template
+
+        return template
+
+    def make_perp_place_order_ix(
+        self,
+        mango_account: MangoAccount,
+        keypair: Keypair,
+        symbol,
+        side,
+        price: float,
+        size: float,
+        mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly', 'Market', 'PostOnlySlide'] = 'Limit',
+        client_order_id: int = int(time.time() * 1e3)
+    ):
+        perp_market = self.registry.perp_market(symbol).perp_market
+
+        return self.perp_place_order_template(mango_account, keypair, symbol, side, mode).instruction(
+            price_lots=PerpMarketHelper.ui_price_to_lots(perp_market, price),
+            max_base_lots=PerpMarketHelper.ui_base_to_lots(perp_market, size),
+            client_order_id=client_order_id
+        )
 
     async def place_order(
         self,
@@ -1105,13 +1599,11 @@ class MangoClient():
         mode: Literal['Limit', 'ImmediateOrCancel', 'PostOnly'] = 'Limit',
         client_order_id: int = int(time.time_ns() / 1e6)
     ):
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+        market_type = self.registry.market_type(symbol)
 
         match market_type:
             case 'spot':
-                serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
-
-                serum_market_index = serum_market_config['marketIndex']
+                serum_market_index = self.registry.serum3_market(symbol).market_index
 
                 tx = Transaction()
 
@@ -1131,7 +1623,7 @@ class MangoClient():
                     client_order_id
                 )
 
-                recent_blockhash = str((await self.connection.get_latest_blockhash()).value.blockhash)
+                recent_blockhash = str(await self.blockhashes.get())
 
                 tx.add(serum3_place_order_ix)
 
@@ -1141,7 +1633,7 @@ class MangoClient():
             case 'perpetual':
                 tx = Transaction()
 
-                recent_blockhash = str((await self.connection.get_latest_blockhash()).value.blockhash)
+                recent_blockhash = str(await self.blockhashes.get())
 
                 perp_place_order_ix = self.make_perp_place_order_ix(mango_account, keypair, symbol, side, price, size, mode, client_order_id)
 
@@ -1152,23 +1644,15 @@ class MangoClient():
                 return response
 
     def make_serum3_cancel_all_orders_ix(self, mango_account: MangoAccount, keypair: Keypair, symbol: str):
-        serum_market_config = [serum3_market_config for serum3_market_config in self.group_config['serum3Markets'] if serum3_market_config['name'] == symbol][0]
+        serum3_market_bundle = self.registry.serum3_market(symbol)
 
-        serum_market_index = serum_market_config['marketIndex']
+        serum_market_index = serum3_market_bundle.market_index
 
-        serum_market = [
-            serum_market
-            for serum_market in self.serum_markets
-            if serum_market.market_index == serum_market_index
-        ][0]
+        serum_market = serum3_market_bundle.serum_market
 
-        serum3 = [serum3 for serum3 in mango_account.serum3 if serum3.market_index == serum_market_index][0]
+        serum_market_external = serum3_market_bundle.serum_market_external
 
-        serum_market_external = [
-            serum_market_external
-            for serum_market_external in self.serum_markets_external
-            if serum_market_external.state.public_key() == serum_market.serum_market_external
-        ][0]
+        serum3 = [serum3 for serum3 in mango_account.serum3 if serum3.market_index == serum_market_index][0]
 
         serum3_cancel_all_orders_args: Serum3CancelAllOrdersArgs = {
             'limit': 10
@@ -1179,7 +1663,7 @@ class MangoClient():
             'account': mango_account.public_key,
             'owner': keypair.public_key,
             'open_orders': serum3.open_orders,
-            'serum_market': PublicKey(serum_market_config['publicKey']),
+            'serum_market': serum3_market_bundle.public_key,
             'serum_program': serum_market.serum_program,
             'serum_market_external': serum_market.serum_market_external,
             'market_bids': serum_market_external.state.bids(),
@@ -1195,9 +1679,9 @@ class MangoClient():
         return serum3_cancel_all_orders_ix
 
     def make_perp_cancel_all_orders_ix(self, mango_account: MangoAccount, keypair: Keypair, symbol: str):
-        perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+        perp_market_bundle = self.registry.perp_market(symbol)
 
-        perp_market = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+        perp_market = perp_market_bundle.perp_market
 
         perp_cancel_all_orders_args: PerpCancelAllOrdersArgs = {
             'limit': 10
@@ -1207,7 +1691,7 @@ class MangoClient():
             'group': perp_market.group,
             'account': mango_account.public_key,
             'owner': keypair.public_key,
-            'perp_market': PublicKey(perp_market_config['publicKey']),
+            'perp_market': perp_market_bundle.public_key,
             'bids': perp_market.bids,
             'asks': perp_market.asks
         }
@@ -1217,13 +1701,13 @@ class MangoClient():
         return perp_cancel_all_orders_ix
 
     async def cancel_all_orders(self, mango_account: MangoAccount, keypair: Keypair, symbol: str):
-        market_type = {'PERP': 'perpetual', 'USDC': 'spot'}[re.split(r"[-|/]", symbol)[1]]
+        market_type = self.registry.market_type(symbol)
 
         match market_type:
             case 'spot':
                 tx = Transaction()
 
-                recent_blockhash = str((await self.connection.get_latest_blockhash()).value.blockhash)
+                recent_blockhash = str(await self.blockhashes.get())
 
                 serum3_cancel_all_orders_ix = self.make_serum3_cancel_all_orders_ix(mango_account, keypair, symbol)
 
@@ -1235,7 +1719,7 @@ class MangoClient():
             case 'perpetual':
                 tx = Transaction()
 
-                recent_blockhash = str((await self.connection.get_latest_blockhash()).value.blockhash)
+                recent_blockhash = str(await self.blockhashes.get())
 
                 tx.recent_blockhash = str(recent_blockhash)
 
@@ -1253,12 +1737,9 @@ class MangoClient():
         token_positions = MangoAccountHelper.active_token_positions(mango_account)
 
         for token_position in token_positions:
-            bank = [bank for bank in self.banks if bank.token_index == token_position.token_index][0]
+            token = self.registry.token(token_position.token_index)
 
-            token_config = [
-                token_config for token_config in self.group_config['tokens']
-                if token_config['tokenIndex'] == token_position.token_index
-            ][0]
+            bank = token.bank
 
             token_indexed_position = token_position.indexed_position.to_decimal()
 
@@ -1276,7 +1757,7 @@ class MangoClient():
                 10 ** bank.mint_decimals
             )
 
-            committed[token_config['symbol']] = balance
+            committed[token.symbol] = balance
 
         in_orders = defaultdict(lambda: 0.0)
 
@@ -1284,17 +1765,15 @@ class MangoClient():
 
         open_orders = MangoAccountHelper.active_serum3_orders(mango_account)
 
-        for open_order, open_orders_external in zip(
-            open_orders,
-            await asyncio.gather(*[
-                AsyncOpenOrdersAccount.load(self.connection, str(open_orders.open_orders))
-                for open_orders
-                in open_orders
-            ]) # TODO: ^ Use one RPC call
-        ):
-            base_bank = [bank for bank in self.banks if bank.token_index == open_order.base_token_index][0]
+        open_orders_accounts = await self.open_orders_accounts.load([mango_account])
+
+        for open_order, open_orders_external in [
+            (open_order, open_orders_accounts[open_order.open_orders])
+            for open_order in open_orders
+        ]:
+            base_bank = self.registry.token(open_order.base_token_index).bank
 
-            quote_bank = [bank for bank in self.banks if bank.token_index == open_order.quote_token_index][0]
+            quote_bank = self.registry.token(open_order.quote_token_index).bank
 
             base_name = bytes(base_bank.name).decode().strip('\x00')
 
@@ -1341,36 +1820,35 @@ class MangoClient():
 
         return dict(entries)
 
-    def make_place_perp_pegged_order_ix(
+    def perp_place_order_pegged_template(
         self,
         mango_account: MangoAccount,
         keypair: Keypair,
         symbol: str,
-        side: Literal['bids', 'asks'],
-        price_offset: float,
-        peg_limit: float,
-        quantity: float,
-        max_quote_quantity: float = None,
-        client_order_id: int = int(time.time()),
-        expiry_timestamp: int = 0,
-        limit: int = 10,
-        reduce_only: bool = False
-    ):
-        perp_market_config = [perp_market_config for perp_market_config in self.group_config['perpMarkets'] if perp_market_config['name'] == symbol][0]
+        side: Literal['bids', 'asks']
+    ) -> OrderTemplate:
+        key = ('perp_place_order_pegged', mango_account.public_key, keypair.public_key, symbol, side, *self._account_layout(mango_account))
+
+        template = self.order_templates_cache.get(key)
 
-        perp_market: PerpMarket = [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_market_config['marketIndex']][0]
+        if template is not None:
+            return template
+
+        perp_market_bundle = self.registry.perp_market(symbol)
+
+        perp_market = perp_market_bundle.perp_market
 
         perp_place_order_pegged_args: PerpPlaceOrderPeggedArgs = {
             'side': {'bids': Bid, 'asks': Ask}[side],
-            'price_offset_lots': PerpMarketHelper.ui_price_to_lots(perp_market, price_offset),
-            'peg_limit': PerpMarketHelper.ui_price_to_lots(perp_market, peg_limit),
-            'max_base_lots': PerpMarketHelper.ui_base_to_lots(perp_market, quantity),
-            'max_quote_lots': PerpMarketHelper.ui_quote_to_lots(perp_market, max_quote_quantity) if max_quote_quantity else RUST_I64_MAX,
-            'client_order_id': client_order_id,
+            'price_offset_lots': 0,
+            'peg_limit': 0,
+            'max_base_lots': 0,
+            'max_quote_lots': 0,
+            'client_order_id': 0,
             'order_type': Limit,
-            'reduce_only': reduce_only,
-            'expiry_timestamp': expiry_timestamp,
-            'limit': limit,
+            'reduce_only': False,
+            'expiry_timestamp': 0,
+            'limit': 0,
             'max_oracle_staleness_slots': -1
         }
 
@@ -1378,7 +1856,7 @@ class MangoClient():
             'group': PublicKey(self.group_config['publicKey']),
             'account': mango_account.public_key,
             'owner': keypair.public_key,
-            'perp_market': PublicKey(perp_market_config['publicKey']),
+            'perp_market': perp_market_bundle.public_key,
             'bids': perp_market.bids,
             'asks': perp_market.asks,
             'event_queue': perp_market.event_queue,
@@ -1387,16 +1865,51 @@ class MangoClient():
 
         remaining_accounts = self._health_remaining_accounts(
             'fixed',
-            [bank for bank in self.banks if bank.token_index == 0],
+            [self.registry.token(0).bank],
             [perp_market],
             mango_account,
             []
         )
 
-        return perp_place_order_pegged(
-            perp_place_order_pegged_args,
-            perp_place_order_pegged_accounts,
-            remaining_accounts=remaining_accounts
+        template = OrderTemplate.from_instruction(
+            perp_place_order_pegged(
+                perp_place_order_pegged_args,
+                perp_place_order_pegged_accounts,
+                remaining_accounts=remaining_accounts
+            ),
+            PERP_PLACE_ORDER_PEGGED_FIELDS
+        )
+
+        self.order_templates_cache[key] = template
+
+        return template
+
+    def make_place_perp_pegged_order_ix(
+        self,
+        mango_account: MangoAccount,
+        keypair: Keypair,
+        symbol: str,
+        side: Literal['bids', 'asks'],
+        price_offset: float,
+        peg_limit: float,
+        quantity: float,
+        max_quote_quantity: float = None,
+        client_order_id: int = int(time.time()),
+        expiry_timestamp: int = 0,
+        limit: int = 10,
+        reduce_only: bool = False
+    ):
+        perp_market = self.registry.perp_market(symbol).perp_market
+
+        return self.perp_place_order_pegged_template(mango_account, keypair, symbol, side).instruction(
+            price_offset_lots=PerpMarketHelper.ui_price_to_lots(perp_market, price_offset),
+            peg_limit=PerpMarketHelper.ui_price_to_lots(perp_market, peg_limit),
+            max_base_lots=PerpMarketHelper.ui_base_to_lots(perp_market, quantity),
+            max_quote_lots=PerpMarketHelper.ui_quote_to_lots(perp_market, max_quote_quantity) if max_quote_quantity else RUST_I64_MAX,
+            client_order_id=client_order_id,
+            reduce_only=reduce_only,
+            expiry_timestamp=expiry_timestamp,
+            limit=limit
         )
 
     async def place_perp_pegged_order(
@@ -1416,7 +1929,7 @@ class MangoClient():
     ):
         tx = Transaction()
 
-        recent_blockhash = str((await self.connection.get_latest_blockhash()).value.blockhash)
+        recent_blockhash = str(await self.blockhashes.get())
 
         tx.add(
             self.make_place_perp_pegged_order_ix(
@@ -1439,25 +1952,33 @@ class MangoClient():
 
         return response
 
-    async def equity(self, mango_account: MangoAccount):
+    async def equity(self, mango_account: MangoAccount, max_age: Optional[float] = None):
         oracle_price_by_token_index = {}
 
         oracle_price_by_oracle_pk = {}
 
-        for bank, raw_oracle in zip(
-            self.banks,
-            await asyncio.gather(*[self.connection.get_account_info(bank.oracle) for bank in self.banks])
-        ):
-            name = bytes(bank.name).decode().strip('\x00')
+        is_usdc = {bank.token_index: bytes(bank.name).decode().strip('\x00') == 'USDC' for bank in self.banks}
 
-            if name == 'USDC':
-                oracle_price = 1
-            else:
-                # TODO: Handle MNGO's oracle (not Pyth)
+        oracles = [bank.oracle for bank in self.banks if not is_usdc[bank.token_index]]
 
-                oracle = pyth.PRICE.parse(raw_oracle.value.data)
+        stale_oracles = self.oracles.stale(oracles, max_age)
 
-                oracle_price = oracle.agg.price * (Decimal(10) ** oracle.expo)
+        active_open_orders = [open_orders for open_orders in mango_account.serum3 if Serum3OrdersHelper.is_active(open_orders)]
+
+        snapshot = await AccountSnapshot.fetch(self.connection, [
+            *stale_oracles,
+            *[open_orders.open_orders for open_orders in active_open_orders]
+        ])
+
+        oracle_prices = self.oracles.snapshot_prices(snapshot, oracles, stale_oracles)
+
+        open_orders_accounts = self.open_orders_accounts.decode(snapshot, [open_orders.open_orders for open_orders in active_open_orders])
+
+        for bank in self.banks:
+            if is_usdc[bank.token_index]:
+                oracle_price = 1
+            else:
+                oracle_price = oracle_prices[bank.oracle]
 
             oracle_price_by_token_index[bank.token_index] = oracle_price
 
@@ -1468,7 +1989,7 @@ class MangoClient():
         for token, bank in [
             (
                 token,
-                [bank for bank in self.banks if bank.token_index == token.token_index][0]
+                self.registry.token(token.token_index).bank
             )
             for token in filter(TokenPositionHelper.is_active, mango_account.tokens)
         ]:
@@ -1476,16 +1997,10 @@ class MangoClient():
 
             balance_by_token_index[token.token_index] = Decimal(str(TokenPositionHelper.balance(token, bank))) * oracle_price
 
-        active_open_orders = [open_orders for open_orders in mango_account.serum3 if Serum3OrdersHelper.is_active(open_orders)]
-
-        for open_orders, open_orders_external in zip(
-            active_open_orders,
-            await asyncio.gather(*[
-                AsyncOpenOrdersAccount.load(self.connection, str(open_orders.open_orders))
-                for open_orders
-                in active_open_orders
-            ])
-        ):
+        for open_orders, open_orders_external in [
+            (open_orders, open_orders_accounts[open_orders.open_orders])
+            for open_orders in active_open_orders
+        ]:
             balance_by_token_index[open_orders.base_token_index] += ((open_orders_external.base_token_total) * oracle_price_by_token_index[open_orders.base_token_index] * Decimal(10 ** (6 - bank.mint_decimals))) / Decimal(1e6)
 
             balance_by_token_index[open_orders.base_token_index] += (open_orders_external.quote_token_total * oracle_price_by_token_index[open_orders.quote_token_index]) / Decimal(1e6)
@@ -1497,7 +2012,7 @@ class MangoClient():
             for perp_position, perp_market in [
                 (
                     perp_position,
-                    [perp_market for perp_market in self.perp_markets if perp_market.perp_market_index == perp_position.market_index][0]
+                    self.registry.perp_market_by_index(perp_position.market_index).perp_market
                 )
                 for perp_position in mango_account.perps
                 if PerpPositionHelper.is_active(perp_position)
@@ -1506,44 +2021,90 @@ class MangoClient():
 
         return token_equity + perp_equity
 
-    async def health_ratio(self, mango_account: MangoAccount, health_type: Literal['init', 'maint', 'liquidation_end']):
-        health_type: HealthTypeKind = {
+    async def health_ratio(
+        self,
+        mango_account: MangoAccount,
+        health_type: Literal['init', 'maint', 'liquidation_end'],
+        max_age: Optional[float] = None
+    ) -> Union[float, int]:
+        """
+
+        Health ratio of a single account, computed by health_ratios.
+
+        :param mango_account:
+        :param health_type:
+        :param max_age: age in seconds up to which cached oracle prices are used instead of fetching them
+        :return: health ratio in % form, as a float rather than the Decimal it used to be, or sys.maxsize without liabilities
+        """
+        health_ratio = float((await self.health_ratios([mango_account], max_age))[health_type][0])
+
+        if health_ratio >= sys.maxsize:
+            return sys.maxsize
+            # ^ The int itself, which the array can only hold as the float closest to it
+
+        return health_ratio
+
+    async def health_ratios(self, mango_accounts: [MangoAccount], max_age: Optional[float] = None) -> {str: np.ndarray}:
+        """
+        Health ratios of many accounts at once, for every health type.
+
+        The oracles and open orders accounts are fetched once for the whole batch, and
+        the token contributions, which make up most of the work, are summed over columns
+        of every token position of every account, weighted per bank and health type.
+
+        :param mango_accounts: accounts to compute the health ratios of
+        :param max_age: age in seconds up to which cached oracle prices are used instead of fetching them
+        :return: arrays of health ratios in % form keyed by health type, in the order of the accounts, float(sys.maxsize) for those without liabilities
+        """
+
+        health_types: {str: HealthTypeKind} = {
             'init': Init(),
             'maint': Maint(),
             'liquidation_end': LiquidationEnd()
-        }[health_type]
-
-        # Build the health cache
+        }
 
         token_positions = [
-            token_position
-            for token_position in mango_account.tokens
-            if token_position.token_index != 65535
+            list(filter(TokenPositionHelper.is_active, mango_account.tokens))
+            for mango_account in mango_accounts
         ]
 
-        banks = [
-            [bank for bank in self.banks if bank.token_index == token_position.token_index][0]
-            for token_position in token_positions
+        banks = {
+            token_index: self.registry.token(token_index).bank
+            for token_index in sorted({
+                token_position.token_index
+                for account_token_positions in token_positions
+                for token_position in account_token_positions
+            })
+        }
+
+        perp_markets = {
+            perp_market_index: self.registry.perp_market_by_index(perp_market_index).perp_market
+            for perp_market_index in sorted({
+                perp_position.market_index
+                for mango_account in mango_accounts
+                for perp_position in MangoAccountHelper.active_perp_positions(mango_account)
+            })
+        }
+
+        oracles = [
+            *[bank.oracle for bank in banks.values()],
+            *[perp_market.oracle for perp_market in perp_markets.values()]
         ]
 
-        raw_oracles = await self.connection.get_multiple_accounts([bank.oracle for bank in banks])
+        stale_oracles = self.oracles.stale(oracles, max_age)
 
-        def oracle_price_from_account_info(account: Account):
-            match str(account.owner):
-                case 'FsJ3A3u2vn5cTVofAjvy6y5kwABJAqYWpe4975bi2epH': # Pyth
-                    oracle = pyth.PRICE.parse(account.data)
+        open_orders_public_keys = OpenOrdersCache.public_keys(mango_accounts)
 
-                    return oracle.agg.price * (Decimal(10) ** oracle.expo)
-                case '4MangoMjqJ2firMokCjjGgoK8d4MXcrgL7XJaL3w6fVg': # For now it's always USDC
-                    return Decimal(1)
+        snapshot = await AccountSnapshot.fetch(self.connection, [*stale_oracles, *open_orders_public_keys])
 
-        oracle_prices = [
-            oracle_price_from_account_info(account)
-            for account in raw_oracles.value
-        ]
+        oracle_prices = self.oracles.snapshot_prices(snapshot, oracles, stale_oracles)
+
+        open_orders_accounts = self.open_orders_accounts.decode(snapshot, open_orders_public_keys)
 
-        token_infos = [
-            TokenInfo(
+        # Every field of a token info but the balance only depends on the bank
+
+        token_infos = {
+            token_index: TokenInfo(
                 bank.token_index,
                 bank.maint_asset_weight,
                 bank.init_asset_weight,
@@ -1552,32 +2113,121 @@ class MangoClient():
                 bank.init_liab_weight,
                 BankHelper.scaled_init_liab_weight(bank, PricesHelper.liab(prices, Init())),
                 prices,
-                I80F48.from_decimal(TokenPositionHelper.balance(token_position, bank))
+                I80F48.from_int(0)
             )
-            for bank, token_position, prices
-            in zip(
-                banks,
-                token_positions,
-                [
+            for token_index, bank, prices in [
+                (
+                    token_index,
+                    bank,
                     Prices(
-                        oracle=I80F48.from_decimal(oracle_price * Decimal(10 ** (6 - bank.mint_decimals))),
-                        stable=I80F48.from_decimal(Decimal(bank.stable_price_model.stable_price))
+                        oracle=I80F48.from_decimal(oracle_prices[bank.oracle] * Decimal(10 ** (6 - bank.mint_decimals))),
+                        stable=I80F48.from_float(bank.stable_price_model.stable_price)
                     )
-                    for bank, oracle_price in zip(banks, oracle_prices)
-                ]
+                )
+                for token_index, bank in banks.items()
+            ]
+        }
+
+        bank_rows = {token_index: row for row, token_index in enumerate(token_infos)}
+
+        token_position_account_indices, token_position_bank_rows, token_position_balances = [], [], []
+
+        health_caches = {}
+
+        for account_index, (mango_account, account_token_positions) in enumerate(zip(mango_accounts, token_positions)):
+            balances = [
+                TokenPositionHelper.balance(token_position, banks[token_position.token_index])
+                for token_position in account_token_positions
+            ]
+
+            token_position_account_indices.extend([account_index] * len(account_token_positions))
+
+            token_position_bank_rows.extend([bank_rows[token_position.token_index] for token_position in account_token_positions])
+
+            token_position_balances.extend([float(balance) for balance in balances])
+
+            if not any([
+                MangoAccountHelper.active_serum3_orders(mango_account),
+                MangoAccountHelper.active_perp_positions(mango_account)
+            ]):
+                continue
+
+            health_caches[account_index] = self._health_cache(
+                mango_account,
+                [
+                    dataclasses.replace(token_infos[token_position.token_index], balance_native=I80F48.from_decimal(balance))
+                    for token_position, balance in zip(account_token_positions, balances)
+                ],
+                perp_markets,
+                oracle_prices,
+                open_orders_accounts
             )
-        ]
 
+        token_position_account_indices = np.array(token_position_account_indices, dtype=np.intp)
+
+        token_position_bank_rows = np.array(token_position_bank_rows, dtype=np.intp)
+
+        token_position_balances = np.array(token_position_balances, dtype=np.float64)
+
+        health_ratios = {}
+
+        for name, health_type in health_types.items():
+            # Mirrors TokenInfoHelper.health_contribution: negative balances are weighted
+            # and priced as liabilities, the rest as assets
+            asset_factors = np.array([
+                float(TokenInfoHelper.asset_weight(token_info, health_type) * PricesHelper.asset(token_info.prices, health_type))
+                for token_info in token_infos.values()
+            ], dtype=np.float64)
+
+            liab_factors = np.array([
+                float(TokenInfoHelper.liab_weight(token_info, health_type) * PricesHelper.liab(token_info.prices, health_type))
+                for token_info in token_infos.values()
+            ], dtype=np.float64)
+
+            factors = np.where(
+                token_position_balances < 0,
+                liab_factors[token_position_bank_rows],
+                asset_factors[token_position_bank_rows]
+            )
+
+            contribution_account_indices, contributions = [token_position_account_indices], [token_position_balances * factors]
+
+            for account_index, health_cache in health_caches.items():
+                other_contributions = HealthCacheHelper.serum3_and_perp_contributions(health_cache, health_type)
+
+                contribution_account_indices.append(np.full(len(other_contributions), account_index, dtype=np.intp))
+
+                contributions.append(np.array([float(contribution) for contribution in other_contributions], dtype=np.float64))
+
+            contribution_account_indices, contributions = np.concatenate(contribution_account_indices), np.concatenate(contributions)
+
+            assets, liabs = np.zeros(len(mango_accounts)), np.zeros(len(mango_accounts))
+
+            np.add.at(assets, contribution_account_indices, np.maximum(contributions, 0))
+
+            np.add.at(liabs, contribution_account_indices, np.maximum(-contributions, 0))
+
+            health_ratios[name] = np.where(
+                liabs > 0.001,
+                100 * (assets - liabs) / np.where(liabs > 0.001, liabs, 1),
+                sys.maxsize
+            )
+
+        return health_ratios
+
+    def _health_cache(
+        self,
+        mango_account: MangoAccount,
+        token_infos: [TokenInfo],
+        perp_markets: {int: PerpMarket},
+        oracle_prices: {PublicKey: Decimal},
+        open_orders_accounts: {PublicKey: AsyncOpenOrdersAccount}
+    ) -> HealthCache:
         serum3_infos = []
 
-        for open_orders, open_orders_external in zip(
-                MangoAccountHelper.active_serum3_orders(mango_account),
-                await asyncio.gather(*[
-                    AsyncOpenOrdersAccount.load(self.connection, str(open_orders.open_orders))
-                    for open_orders
-                    in MangoAccountHelper.active_serum3_orders(mango_account)
-                ])
-        ):
+        for open_orders in MangoAccountHelper.active_serum3_orders(mango_account):
+            open_orders_external = open_orders_accounts[open_orders.open_orders]
+
             base_index, base_info = [
                 (index, token_info)
                 for index, token_info in enumerate(token_infos)
@@ -1602,8 +2252,8 @@ class MangoClient():
 
             serum3_infos.append(
                 Serum3Info(
-                    reserved_base=I80F48.from_decimal(Decimal(reserved_base)),
-                    reserved_quote=I80F48.from_decimal(Decimal(reserved_quote)),
+                    reserved_base=I80F48.from_int(reserved_base),
+                    reserved_quote=I80F48.from_int(reserved_quote),
                     base_index=base_index,
                     quote_index=quote_index,
                     market_index=open_orders.market_index,
@@ -1611,37 +2261,20 @@ class MangoClient():
                 )
             )
 
-        perp_positions = MangoAccountHelper.active_perp_positions(mango_account)
-
-        perp_markets = [
-            [
-                perp_market
-                for perp_market in self.perp_markets
-                if perp_market.perp_market_index == perp_position.market_index
-            ][0]
-            for perp_position in perp_positions
-
-        ]
+        perp_infos = []
 
-        perp_market_oracle_prices = [
-            oracle_price_from_account_info(raw_oracle)
-            for raw_oracle in (await self.connection.get_multiple_accounts([perp_market.oracle for perp_market in perp_markets])).value
-        ]
+        for perp_position in MangoAccountHelper.active_perp_positions(mango_account):
+            perp_market = perp_markets[perp_position.market_index]
 
-        perp_infos = []
+            perp_market_oracle_price = oracle_prices[perp_market.oracle]
 
-        for perp_position, perp_market, perp_market_oracle_price in zip(
-            perp_positions,
-            perp_markets,
-            perp_market_oracle_prices
-        ):
             base_lots = perp_position.base_position_lots + perp_position.taker_base_lots
 
             unsettled_funding = PerpPositionHelper.unsettled_funding(perp_position, perp_market)
 
             taker_quote = perp_position.taker_quote_lots * perp_market.quote_lot_size
 
-            quote_current = I80F48.from_decimal(perp_position.quote_position_native.to_decimal() - unsettled_funding + Decimal(taker_quote))
+            quote_current = perp_position.quote_position_native - I80F48.from_decimal(unsettled_funding) + taker_quote
 
             perp_info = PerpInfo(
                 perp_market.perp_market_index,
@@ -1658,7 +2291,7 @@ class MangoClient():
                 quote_current,
                 Prices(
                     oracle=I80F48.from_decimal(perp_market_oracle_price * Decimal(10 ** (6 - perp_market.base_decimals))),
-                    stable=I80F48.from_decimal(Decimal(perp_market.stable_price_model.stable_price))
+                    stable=I80F48.from_float(perp_market.stable_price_model.stable_price)
                 ),
                 PerpPositionHelper.has_open_orders(perp_position),
                 PerpPositionHelper.has_open_fills(perp_position)
@@ -1666,116 +2299,28 @@ class MangoClient():
 
             perp_infos.append(perp_info)
 
-        health_cache = HealthCache(
+        return HealthCache(
             token_infos,
             serum3_infos,
             perp_infos,
             False
         )
 
-        # Compute assets and liabilities
-
-        assets = 0
-
-        liabs = 0
-
-        for token_info in health_cache.token_infos:
-            contrib = TokenInfoHelper.health_contribution(token_info, health_type)
-
-            if contrib > 0:
-                assets += contrib
-            else:
-                liabs -= contrib
-
-        def get_serum3_reservations(health_type: HealthTypeKind):
-            token_max_reserved = [0 for _ in range(0, len(token_infos))]
-
-            serum3_reserved: [Serum3Reserved] = []
-
-            for serum3_info in serum3_infos:
-                quote, base = token_infos[serum3_info.quote_index], token_infos[serum3_info.base_index]
-
-                reserved_base, reserved_quote = serum3_info.reserved_base.to_decimal(), serum3_info.reserved_quote.to_decimal()
-
-                quote_asset = PricesHelper.asset(quote.prices, health_type)
-
-                base_liab = PricesHelper.liab(base.prices, health_type)
-
-                all_reserved_as_base = reserved_base + reserved_quote * quote_asset / base_liab
-
-                base_asset = PricesHelper.asset(base.prices, health_type)
-
-                quote_liab = PricesHelper.liab(quote.prices, health_type)
-
-                all_reserved_as_quote = reserved_quote + reserved_base * base_asset / quote_liab
-
-                token_max_reserved[serum3_info.base_index] += all_reserved_as_base
-
-                token_max_reserved[serum3_info.quote_index] += all_reserved_as_quote
-
-                serum3_reserved.append(Serum3Reserved(all_reserved_as_base, all_reserved_as_quote))
-
-            return {
-                'token_max_reserved': token_max_reserved,
-                'serum3_reserved': serum3_reserved
-            }
-
-        res = get_serum3_reservations(Maint())
-
-        for index, serum3_info in enumerate(serum3_infos):
-            contrib = Serum3InfoHelper.health_contribution(
-                serum3_info,
-                health_type,
-                health_cache.token_infos,
-                res['token_max_reserved'],
-                res['serum3_reserved'][index]
-            ).to_decimal()
-
-            if contrib > 0:
-                assets += contrib
-            else:
-                liabs -= contrib
-
-        for perp_info in health_cache.perp_infos:
-            contrib = PerpInfoHelper.health_contribution(perp_info, health_type).to_decimal()
-
-            if contrib > 0:
-                assets += contrib
-            else:
-                liabs -= contrib
-
-        if liabs > 0.001:
-            return 100 * (assets - liabs) / liabs
-        else:
-            return sys.maxsize
-
-    async def positions(self, mango_account: MangoAccount):
+    async def positions(self, mango_account: MangoAccount, max_age: Optional[float] = None):
         perp_positions = MangoAccountHelper.active_perp_positions(mango_account)
 
-        perp_markets = [
-            [
-                perp_market for perp_market in self.perp_markets
-                if perp_market.perp_market_index == perp_position.market_index
-            ][0]
+        perp_market_bundles = [
+            self.registry.perp_market_by_index(perp_position.market_index)
             for perp_position in perp_positions
         ]
 
-        perp_market_configs = [
-            [
-                perp_market_config for perp_market_config in self.perp_market_configs
-                if perp_market_config['marketIndex'] == perp_position.market_index
-            ][0]
-            for perp_position in perp_positions
-        ]
+        perp_markets = [perp_market_bundle.perp_market for perp_market_bundle in perp_market_bundles]
 
-        oracle_prices = [
-            oracle.agg.price * (Decimal(10) ** oracle.expo)
-            for oracle in [
-                pyth.PRICE.parse(account.data)
-                for account in
-                (await self.connection.get_multiple_accounts([perp_market.oracle for perp_market in perp_markets])).value
-            ]
-        ]
+        perp_market_configs = [perp_market_bundle.config for perp_market_bundle in perp_market_bundles]
+
+        oracle_price_by_oracle_pk = await self.oracles.prices([perp_market.oracle for perp_market in perp_markets], max_age)
+
+        oracle_prices = [oracle_price_by_oracle_pk[perp_market.oracle] for perp_market in perp_markets]
 
         entries = []
 
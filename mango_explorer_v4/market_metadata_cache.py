@@ -0,0 +1,92 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import pathlib
+import typing
+
+from solana.publickey import PublicKey
+
+VERSION = 2
+
+
+class MarketMetadataCache:
+    """
+    Keeps the raw bytes of the accounts MangoClient.connect needs (banks, mint
+    infos, perp markets and serum markets) in a file, along with the slot they
+    were read at, so that a restarting client can start from them without
+    waiting on the RPC node.
+
+    The file is only a starting point: the client refreshes the accounts in
+    the background right after starting from it, and writes them back. It's
+    ignored once the accounts needed differ from those it holds, like after a
+    token or market got listed or delisted in ids.json.
+    """
+
+    def __init__(self, path: typing.Union[str, pathlib.Path]):
+        self.path = pathlib.Path(path)
+
+    @staticmethod
+    def keys_hash(public_keys: typing.Iterable[PublicKey]) -> str:
+        return hashlib.sha256(''.join(sorted(set(str(public_key) for public_key in public_keys))).encode()).hexdigest()
+
+    def load(
+        self,
+        group: PublicKey,
+        public_keys: typing.List[PublicKey]
+    ) -> typing.Optional[typing.Tuple[int, typing.Dict[PublicKey, bytes]]]:
+        """
+
+        Reads the accounts back, if the file was written for this group and exactly these accounts.
+
+        :param group:
+        :param public_keys: the accounts needed
+        :return: their slot and data, or None if there's no usable file
+        """
+        try:
+            content = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exception:
+            logging.warning(f"Ignoring unreadable market metadata cache {self.path}: {exception}")
+
+            return None
+
+        if content.get('version') != VERSION or content.get('group') != str(group):
+            return None
+
+        if content.get('keys_hash') != self.keys_hash(public_keys):
+            logging.info(f"Ignoring market metadata cache {self.path} written for other accounts")
+
+            return None
+
+        accounts = {
+            PublicKey(public_key): base64.b64decode(data)
+            for public_key, data in content['accounts'].items()
+        }
+
+        if len(set(public_keys) - accounts.keys()) > 0:
+            return None
+            # ^ Only if edited by hand, as the hash covers the accounts written
+
+        return content['slot'], accounts
+
+    def save(self, group: PublicKey, slot: int, accounts: typing.Dict[PublicKey, bytes]):
+        content = {
+            'version': VERSION,
+            'group': str(group),
+            'slot': slot,
+            'keys_hash': self.keys_hash(accounts.keys()),
+            'accounts': {
+                str(public_key): base64.b64encode(data).decode()
+                for public_key, data in accounts.items()
+            }
+        }
+
+        temporary_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+
+        temporary_path.write_text(json.dumps(content))
+
+        os.replace(temporary_path, self.path)
+        # ^ Atomic, so that a client starting concurrently never reads a partially written file
@@ -0,0 +1,76 @@
+import typing
+from dataclasses import dataclass
+
+from cachetools import LRUCache
+from pyserum.async_open_orders_account import AsyncOpenOrdersAccount
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from .account_snapshot import AccountSnapshot
+from .accounts.mango_account import MangoAccount
+from .helpers.mango_account import MangoAccountHelper
+
+
+@dataclass
+class OpenOrdersCacheEntry:
+    slot: int
+    data: bytes
+    open_orders: AsyncOpenOrdersAccount
+
+
+class OpenOrdersCache:
+    """
+    Decoded Serum open orders accounts of Mango accounts, along with the slot
+    they were last read at.
+
+    All the open orders accounts of any number of Mango accounts are fetched
+    in a single getMultipleAccounts call per 100 of them, and only those whose
+    data changed since they were last read are decoded again, as decoding an
+    open orders account costs far more than comparing its bytes.
+    """
+
+    def __init__(self, connection: AsyncClient, maxsize: int = 4096):
+        self.connection = connection
+        self.entries: LRUCache = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def public_keys(mango_accounts: [MangoAccount]) -> [PublicKey]:
+        return list(dict.fromkeys([
+            serum3_orders.open_orders
+            for mango_account in mango_accounts
+            for serum3_orders in MangoAccountHelper.active_serum3_orders(mango_account)
+        ]))
+
+    async def load(self, mango_accounts: [MangoAccount]) -> typing.Dict[PublicKey, AsyncOpenOrdersAccount]:
+        public_keys = self.public_keys(mango_accounts)
+
+        return self.decode(await AccountSnapshot.fetch(self.connection, public_keys), public_keys)
+
+    def decode(self, snapshot: AccountSnapshot, public_keys: [PublicKey]) -> typing.Dict[PublicKey, AsyncOpenOrdersAccount]:
+        """Open orders accounts read from snapshot, which must hold public_keys."""
+        open_orders = {}
+
+        for public_key in public_keys:
+            account = snapshot[public_key]
+
+            if account is None:
+                raise ValueError(f"Open orders account {public_key} doesn't exist")
+
+            entry = self.entries.get(public_key)
+
+            if entry is None or entry.data != account.data:
+                entry = OpenOrdersCacheEntry(
+                    snapshot.slot,
+                    account.data,
+                    AsyncOpenOrdersAccount.from_bytes(public_key, account.data)
+                )
+            else:
+                entry = OpenOrdersCacheEntry(max(entry.slot, snapshot.slot), entry.data, entry.open_orders)
+
+            if public_key not in self.entries or snapshot.slot >= self.entries[public_key].slot:
+                self.entries[public_key] = entry
+                # ^ An older snapshot doesn't replace what a newer one read
+
+            open_orders[public_key] = entry.open_orders
+
+        return open_orders
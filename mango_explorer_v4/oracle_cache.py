@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import time
+import typing
+from dataclasses import dataclass
+from decimal import Decimal
+
+from solana.publickey import PublicKey
+from solana.rpc.async_api import AsyncClient
+
+from .account_snapshot import AccountSnapshot
+from .account_subscriptions import AccountSubscriptions
+from .constructs.oracle_price import OraclePrice
+from .helpers.oracle import OracleHelper
+
+
+@dataclass
+class OracleCacheEntry:
+    price: OraclePrice
+    slot: int
+    updated_at: float
+
+    def age(self) -> float:
+        return time.monotonic() - self.updated_at
+
+
+class OracleCache:
+    """
+    Latest known price of every bank and perp market oracle, shared by all the
+    client methods that need one.
+
+    Entries are kept up to date by websocket subscriptions, started with
+    subscribe(), or by a background poller fetching all oracles in batches,
+    started with start_polling(), and record the slot they were read at.
+    Readers pass the max_age in seconds they can live with: fresh enough
+    entries are served without any RPC call, the rest are fetched in a single
+    batch. A max_age of None always fetches.
+    """
+
+    def __init__(
+        self,
+        connection: AsyncClient,
+        subscriptions: AccountSubscriptions,
+        decimals: typing.Dict[PublicKey, int],
+        poll_interval: float = 1
+    ):
+        self.connection = connection
+        self.subscriptions = subscriptions
+        self.decimals = decimals
+        # ^ Decimals of the token each oracle prices, which StubOracle prices need
+        self.poll_interval = poll_interval
+        self.entries: typing.Dict[PublicKey, OracleCacheEntry] = {}
+        self.tasks: [asyncio.Task] = []
+
+    def entry(self, oracle: PublicKey, max_age: typing.Optional[float] = None) -> typing.Optional[OracleCacheEntry]:
+        entry = self.entries.get(oracle)
+
+        if entry is None or max_age is None or entry.age() > max_age:
+            return None
+
+        return entry
+
+    def update(self, oracle: PublicKey, data: bytes, slot: int) -> OracleCacheEntry:
+        entry = self.entries.get(oracle)
+
+        if entry is not None and slot < entry.slot:
+            return entry
+            # ^ Stale, a more recent read already came in
+
+        entry = self.entries[oracle] = OracleCacheEntry(
+            OracleHelper.parse(data, self.decimals[oracle]),
+            slot,
+            time.monotonic()
+        )
+
+        return entry
+
+    def stale(self, oracles: [PublicKey], max_age: typing.Optional[float] = None) -> [PublicKey]:
+        return [oracle for oracle in dict.fromkeys(oracles) if self.entry(oracle, max_age) is None]
+
+    def snapshot_prices(self, snapshot: AccountSnapshot, oracles: [PublicKey], stale_oracles: [PublicKey]) -> typing.Dict[PublicKey, Decimal]:
+        """Prices of oracles, read from snapshot for stale_oracles, which it must hold, and from the cache for the others."""
+        entries = {oracle: self.entries.get(oracle) for oracle in oracles}
+
+        for oracle in stale_oracles:
+            if snapshot[oracle] is None:
+                raise ValueError(f"Can't read oracle {oracle}")
+
+            entries[oracle] = self.update(oracle, snapshot[oracle].data, snapshot.slot)
+
+        return {oracle: entry.price.ui_price() for oracle, entry in entries.items()}
+
+    async def prices(self, oracles: [PublicKey], max_age: typing.Optional[float] = None) -> typing.Dict[PublicKey, Decimal]:
+        entries = {oracle: self.entry(oracle, max_age) for oracle in oracles}
+
+        missing = [oracle for oracle, entry in entries.items() if entry is None]
+
+        if len(missing) != 0:
+            entries.update(await self.refresh(missing))
+
+        for oracle, entry in entries.items():
+            if entry is None:
+                raise ValueError(f"Can't read oracle {oracle}")
+
+        return {oracle: entry.price.ui_price() for oracle, entry in entries.items()}
+
+    async def refresh(self, oracles: typing.Optional[typing.List[PublicKey]] = None) -> typing.Dict[PublicKey, OracleCacheEntry]:
+        oracles = list(dict.fromkeys(oracles if oracles is not None else self.decimals))
+
+        responses = await asyncio.gather(*[
+            self.connection.get_multiple_accounts(oracles[offset:offset + 100])
+            for offset in range(0, len(oracles), 100)
+        ])
+
+        entries = {}
+
+        for offset, response in zip(range(0, len(oracles), 100), responses):
+            for oracle, account in zip(oracles[offset:offset + 100], response.value):
+                try:
+                    entries[oracle] = self.update(oracle, account.data, response.context.slot)
+                except (AttributeError, ValueError) as exception:
+                    logging.warning(f"Can't read oracle {oracle}: {exception}")
+                    # ^ Missing account or unsupported oracle, one of them shouldn't keep the others from refreshing
+
+        return entries
+
+    def subscribe(self, oracles: typing.Optional[typing.List[PublicKey]] = None):
+        for oracle in (oracles if oracles is not None else self.decimals):
+            self.tasks.append(asyncio.ensure_future(self._follow(oracle)))
+
+    def start_polling(self):
+        self.tasks.append(asyncio.ensure_future(self._poll()))
+
+    async def close(self):
+        for task in self.tasks:
+            task.cancel()
+
+        self.tasks = []
+
+    async def _follow(self, oracle: PublicKey):
+        async for update in self.subscriptions.account_updates(oracle):
+            try:
+                self.update(oracle, update.data, update.slot)
+            except ValueError as exception:
+                logging.warning(f"Can't read oracle {oracle}: {exception}")
+
+                return
+
+    async def _poll(self):
+        while True:
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exception:
+                logging.warning(f"Oracle refresh failed: {exception}")
+
+            await asyncio.sleep(self.poll_interval)
@@ -1,9 +1,12 @@
+import struct
 import typing
 from decimal import Decimal
 
 import construct
 from solana.publickey import PublicKey
 
+from mango_explorer_v4.constructs.oracle_price import OraclePrice
+
 
 class PublicKeyAdapter(construct.Adapter):
     def __init__(self) -> None:
@@ -64,3 +67,28 @@ PRICE = construct.Struct(
     "agg" / PRICE_INFO,
     "comp" / construct.Array(32, PRICE_COMP),
 )
+
+# Byte offsets into a raw price account, following PRICE, for the fields
+# that matter when all that's needed is the aggregate price
+MAGIC = 0xa1b2c3d4
+
+EXPO = struct.Struct('<i')
+
+EXPO_OFFSET = 20
+
+AGG = struct.Struct('<qQI4xQ')
+# ^ price, conf, status, corp_act and pub_slot
+
+AGG_OFFSET = 208
+
+
+def parse_price(data: bytes) -> OraclePrice:
+    """Reads the aggregate price of a price account without decoding the rest of it, including the 32 components."""
+    if len(data) < AGG_OFFSET + AGG.size or int.from_bytes(data[:4], 'little') != MAGIC:
+        raise ValueError("The data isn't the one of a Pyth price account")
+
+    [expo] = EXPO.unpack_from(data, EXPO_OFFSET)
+
+    price, conf, status, pub_slot = AGG.unpack_from(data, AGG_OFFSET)
+
+    return OraclePrice(price, conf, expo, status, pub_slot)
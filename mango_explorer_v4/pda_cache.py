@@ -0,0 +1,81 @@
+import typing
+
+from cachetools import LRUCache
+from solana.publickey import PublicKey
+
+
+class PdaCache:
+    """
+    Memoizes program derived addresses, which are pure functions of their
+    seeds and program id.
+
+    find_program_address hashes the seeds once per bump it tries, starting
+    from 255, so deriving the same open orders or vault signer address for
+    every instruction adds up. Both derivations share one bounded LRU, and the
+    hits and misses are counted to tell whether it's sized right.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.entries: LRUCache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def find_program_address(self, seeds: typing.List[bytes], program_id: PublicKey) -> typing.Tuple[PublicKey, int]:
+        key = ('find', tuple(seeds), program_id)
+
+        address = self.entries.get(key)
+
+        if address is None:
+            self.misses += 1
+
+            address = self.entries[key] = PublicKey.find_program_address(seeds, program_id)
+        else:
+            self.hits += 1
+
+        return address
+
+    def create_program_address(self, seeds: typing.List[bytes], program_id: PublicKey) -> PublicKey:
+        key = ('create', tuple(seeds), program_id)
+
+        address = self.entries.get(key)
+
+        if address is None:
+            self.misses += 1
+
+            address = self.entries[key] = PublicKey.create_program_address(seeds, program_id)
+        else:
+            self.hits += 1
+
+        return address
+
+    def serum3_open_orders(self, mango_account: PublicKey, serum3_market: PublicKey, program_id: PublicKey) -> PublicKey:
+        key = ('serum3_open_orders', mango_account, serum3_market, program_id)
+        # ^ Keyed on the public keys themselves, which is cheaper than turning them into seeds first
+
+        open_orders = self.entries.get(key)
+
+        if open_orders is None:
+            self.misses += 1
+
+            [open_orders, _] = PublicKey.find_program_address(
+                [
+                    bytes('Serum3OO', 'utf-8'),
+                    bytes(mango_account),
+                    bytes(serum3_market)
+                ],
+                program_id
+            )
+
+            self.entries[key] = open_orders
+        else:
+            self.hits += 1
+
+        return open_orders
+
+    def stats(self) -> typing.Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': self.entries.currsize,
+            'maxsize': self.entries.maxsize
+        }
@@ -1,105 +1,280 @@
+import importlib
 import typing
-from . import interest_rate_params
-from .interest_rate_params import InterestRateParams, InterestRateParamsJSON
-from . import equity
-from .equity import Equity, EquityJSON
-from . import token_equity
-from .token_equity import TokenEquity, TokenEquityJSON
-from . import perp_equity
-from .perp_equity import PerpEquity, PerpEquityJSON
-from . import prices
-from .prices import Prices, PricesJSON
-from . import token_info
-from .token_info import TokenInfo, TokenInfoJSON
-from . import serum3_info
-from .serum3_info import Serum3Info, Serum3InfoJSON
-from . import perp_info
-from .perp_info import PerpInfo, PerpInfoJSON
-from . import health_cache
-from .health_cache import HealthCache, HealthCacheJSON
-from . import flash_loan_token_detail
-from .flash_loan_token_detail import FlashLoanTokenDetail, FlashLoanTokenDetailJSON
-from . import token_position
-from .token_position import TokenPosition, TokenPositionJSON
-from . import serum3_orders
-from .serum3_orders import Serum3Orders, Serum3OrdersJSON
-from . import perp_position
-from .perp_position import PerpPosition, PerpPositionJSON
-from . import perp_open_order
-from .perp_open_order import PerpOpenOrder, PerpOpenOrderJSON
-from . import mango_account_fixed
-from .mango_account_fixed import MangoAccountFixed, MangoAccountFixedJSON
-from . import oracle_config
-from .oracle_config import OracleConfig, OracleConfigJSON
-from . import oracle_config_params
-from .oracle_config_params import OracleConfigParams, OracleConfigParamsJSON
-from . import inner_node
-from .inner_node import InnerNode, InnerNodeJSON
-from . import leaf_node
-from .leaf_node import LeafNode, LeafNodeJSON
-from . import any_node
-from .any_node import AnyNode, AnyNodeJSON
-from . import order_tree_root
-from .order_tree_root import OrderTreeRoot, OrderTreeRootJSON
-from . import order_tree_nodes
-from .order_tree_nodes import OrderTreeNodes, OrderTreeNodesJSON
-from . import event_queue_header
-from .event_queue_header import EventQueueHeader, EventQueueHeaderJSON
-from . import any_event
-from .any_event import AnyEvent, AnyEventJSON
-from . import fill_event
-from .fill_event import FillEvent, FillEventJSON
-from . import out_event
-from .out_event import OutEvent, OutEventJSON
-from . import stable_price_model
-from .stable_price_model import StablePriceModel, StablePriceModelJSON
-from . import token_index
-from .token_index import TokenIndex, TokenIndexJSON
-from . import serum3_market_index
-from .serum3_market_index import Serum3MarketIndex, Serum3MarketIndexJSON
-from . import perp_market_index
-from .perp_market_index import PerpMarketIndex, PerpMarketIndexJSON
-from . import i80f48
-from .i80f48 import I80F48, I80F48JSON
-from . import flash_loan_type
-from .flash_loan_type import FlashLoanTypeKind, FlashLoanTypeJSON
-from . import serum3_self_trade_behavior
-from .serum3_self_trade_behavior import (
-    Serum3SelfTradeBehaviorKind,
-    Serum3SelfTradeBehaviorJSON,
-)
-from . import serum3_order_type
-from .serum3_order_type import Serum3OrderTypeKind, Serum3OrderTypeJSON
-from . import serum3_side
-from .serum3_side import Serum3SideKind, Serum3SideJSON
-from . import health_type
-from .health_type import HealthTypeKind, HealthTypeJSON
-from . import loan_origination_fee_instruction
-from .loan_origination_fee_instruction import (
-    LoanOriginationFeeInstructionKind,
-    LoanOriginationFeeInstructionJSON,
-)
-from . import ix_gate
-from .ix_gate import IxGateKind, IxGateJSON
-from . import oracle_type
-from .oracle_type import OracleTypeKind, OracleTypeJSON
-from . import order_state
-from .order_state import OrderStateKind, OrderStateJSON
-from . import book_side_order_tree
-from .book_side_order_tree import BookSideOrderTreeKind, BookSideOrderTreeJSON
-from . import node_tag
-from .node_tag import NodeTagKind, NodeTagJSON
-from . import place_order_type
-from .place_order_type import PlaceOrderTypeKind, PlaceOrderTypeJSON
-from . import post_order_type
-from .post_order_type import PostOrderTypeKind, PostOrderTypeJSON
-from . import side
-from .side import SideKind, SideJSON
-from . import side_and_order_tree
-from .side_and_order_tree import SideAndOrderTreeKind, SideAndOrderTreeJSON
-from . import order_params
-from .order_params import OrderParamsKind, OrderParamsJSON
-from . import order_tree_type
-from .order_tree_type import OrderTreeTypeKind, OrderTreeTypeJSON
-from . import event_type
-from .event_type import EventTypeKind, EventTypeJSON
+
+if typing.TYPE_CHECKING:
+    from . import interest_rate_params
+    from .interest_rate_params import InterestRateParams, InterestRateParamsJSON
+    from . import equity
+    from .equity import Equity, EquityJSON
+    from . import token_equity
+    from .token_equity import TokenEquity, TokenEquityJSON
+    from . import perp_equity
+    from .perp_equity import PerpEquity, PerpEquityJSON
+    from . import prices
+    from .prices import Prices, PricesJSON
+    from . import token_info
+    from .token_info import TokenInfo, TokenInfoJSON
+    from . import serum3_info
+    from .serum3_info import Serum3Info, Serum3InfoJSON
+    from . import perp_info
+    from .perp_info import PerpInfo, PerpInfoJSON
+    from . import health_cache
+    from .health_cache import HealthCache, HealthCacheJSON
+    from . import flash_loan_token_detail
+    from .flash_loan_token_detail import FlashLoanTokenDetail, FlashLoanTokenDetailJSON
+    from . import token_position
+    from .token_position import TokenPosition, TokenPositionJSON
+    from . import serum3_orders
+    from .serum3_orders import Serum3Orders, Serum3OrdersJSON
+    from . import perp_position
+    from .perp_position import PerpPosition, PerpPositionJSON
+    from . import perp_open_order
+    from .perp_open_order import PerpOpenOrder, PerpOpenOrderJSON
+    from . import mango_account_fixed
+    from .mango_account_fixed import MangoAccountFixed, MangoAccountFixedJSON
+    from . import oracle_config
+    from .oracle_config import OracleConfig, OracleConfigJSON
+    from . import oracle_config_params
+    from .oracle_config_params import OracleConfigParams, OracleConfigParamsJSON
+    from . import inner_node
+    from .inner_node import InnerNode, InnerNodeJSON
+    from . import leaf_node
+    from .leaf_node import LeafNode, LeafNodeJSON
+    from . import any_node
+    from .any_node import AnyNode, AnyNodeJSON
+    from . import order_tree_root
+    from .order_tree_root import OrderTreeRoot, OrderTreeRootJSON
+    from . import order_tree_nodes
+    from .order_tree_nodes import OrderTreeNodes, OrderTreeNodesJSON
+    from . import event_queue_header
+    from .event_queue_header import EventQueueHeader, EventQueueHeaderJSON
+    from . import any_event
+    from .any_event import AnyEvent, AnyEventJSON
+    from . import fill_event
+    from .fill_event import FillEvent, FillEventJSON
+    from . import out_event
+    from .out_event import OutEvent, OutEventJSON
+    from . import stable_price_model
+    from .stable_price_model import StablePriceModel, StablePriceModelJSON
+    from . import token_index
+    from .token_index import TokenIndex, TokenIndexJSON
+    from . import serum3_market_index
+    from .serum3_market_index import Serum3MarketIndex, Serum3MarketIndexJSON
+    from . import perp_market_index
+    from .perp_market_index import PerpMarketIndex, PerpMarketIndexJSON
+    from . import i80f48
+    from .i80f48 import I80F48, I80F48JSON
+    from . import flash_loan_type
+    from .flash_loan_type import FlashLoanTypeKind, FlashLoanTypeJSON
+    from . import serum3_self_trade_behavior
+    from .serum3_self_trade_behavior import (
+        Serum3SelfTradeBehaviorKind,
+        Serum3SelfTradeBehaviorJSON,
+    )
+    from . import serum3_order_type
+    from .serum3_order_type import Serum3OrderTypeKind, Serum3OrderTypeJSON
+    from . import serum3_side
+    from .serum3_side import Serum3SideKind, Serum3SideJSON
+    from . import health_type
+    from .health_type import HealthTypeKind, HealthTypeJSON
+    from . import loan_origination_fee_instruction
+    from .loan_origination_fee_instruction import (
+        LoanOriginationFeeInstructionKind,
+        LoanOriginationFeeInstructionJSON,
+    )
+    from . import ix_gate
+    from .ix_gate import IxGateKind, IxGateJSON
+    from . import oracle_type
+    from .oracle_type import OracleTypeKind, OracleTypeJSON
+    from . import order_state
+    from .order_state import OrderStateKind, OrderStateJSON
+    from . import book_side_order_tree
+    from .book_side_order_tree import BookSideOrderTreeKind, BookSideOrderTreeJSON
+    from . import node_tag
+    from .node_tag import NodeTagKind, NodeTagJSON
+    from . import place_order_type
+    from .place_order_type import PlaceOrderTypeKind, PlaceOrderTypeJSON
+    from . import post_order_type
+    from .post_order_type import PostOrderTypeKind, PostOrderTypeJSON
+    from . import side
+    from .side import SideKind, SideJSON
+    from . import side_and_order_tree
+    from .side_and_order_tree import SideAndOrderTreeKind, SideAndOrderTreeJSON
+    from . import order_params
+    from .order_params import OrderParamsKind, OrderParamsJSON
+    from . import order_tree_type
+    from .order_tree_type import OrderTreeTypeKind, OrderTreeTypeJSON
+    from . import event_type
+    from .event_type import EventTypeKind, EventTypeJSON
+
+_LAZY = {
+    "interest_rate_params": ("interest_rate_params", None),
+    "InterestRateParams": ("interest_rate_params", "InterestRateParams"),
+    "InterestRateParamsJSON": ("interest_rate_params", "InterestRateParamsJSON"),
+    "equity": ("equity", None),
+    "Equity": ("equity", "Equity"),
+    "EquityJSON": ("equity", "EquityJSON"),
+    "token_equity": ("token_equity", None),
+    "TokenEquity": ("token_equity", "TokenEquity"),
+    "TokenEquityJSON": ("token_equity", "TokenEquityJSON"),
+    "perp_equity": ("perp_equity", None),
+    "PerpEquity": ("perp_equity", "PerpEquity"),
+    "PerpEquityJSON": ("perp_equity", "PerpEquityJSON"),
+    "prices": ("prices", None),
+    "Prices": ("prices", "Prices"),
+    "PricesJSON": ("prices", "PricesJSON"),
+    "token_info": ("token_info", None),
+    "TokenInfo": ("token_info", "TokenInfo"),
+    "TokenInfoJSON": ("token_info", "TokenInfoJSON"),
+    "serum3_info": ("serum3_info", None),
+    "Serum3Info": ("serum3_info", "Serum3Info"),
+    "Serum3InfoJSON": ("serum3_info", "Serum3InfoJSON"),
+    "perp_info": ("perp_info", None),
+    "PerpInfo": ("perp_info", "PerpInfo"),
+    "PerpInfoJSON": ("perp_info", "PerpInfoJSON"),
+    "health_cache": ("health_cache", None),
+    "HealthCache": ("health_cache", "HealthCache"),
+    "HealthCacheJSON": ("health_cache", "HealthCacheJSON"),
+    "flash_loan_token_detail": ("flash_loan_token_detail", None),
+    "FlashLoanTokenDetail": ("flash_loan_token_detail", "FlashLoanTokenDetail"),
+    "FlashLoanTokenDetailJSON": ("flash_loan_token_detail", "FlashLoanTokenDetailJSON"),
+    "token_position": ("token_position", None),
+    "TokenPosition": ("token_position", "TokenPosition"),
+    "TokenPositionJSON": ("token_position", "TokenPositionJSON"),
+    "serum3_orders": ("serum3_orders", None),
+    "Serum3Orders": ("serum3_orders", "Serum3Orders"),
+    "Serum3OrdersJSON": ("serum3_orders", "Serum3OrdersJSON"),
+    "perp_position": ("perp_position", None),
+    "PerpPosition": ("perp_position", "PerpPosition"),
+    "PerpPositionJSON": ("perp_position", "PerpPositionJSON"),
+    "perp_open_order": ("perp_open_order", None),
+    "PerpOpenOrder": ("perp_open_order", "PerpOpenOrder"),
+    "PerpOpenOrderJSON": ("perp_open_order", "PerpOpenOrderJSON"),
+    "mango_account_fixed": ("mango_account_fixed", None),
+    "MangoAccountFixed": ("mango_account_fixed", "MangoAccountFixed"),
+    "MangoAccountFixedJSON": ("mango_account_fixed", "MangoAccountFixedJSON"),
+    "oracle_config": ("oracle_config", None),
+    "OracleConfig": ("oracle_config", "OracleConfig"),
+    "OracleConfigJSON": ("oracle_config", "OracleConfigJSON"),
+    "oracle_config_params": ("oracle_config_params", None),
+    "OracleConfigParams": ("oracle_config_params", "OracleConfigParams"),
+    "OracleConfigParamsJSON": ("oracle_config_params", "OracleConfigParamsJSON"),
+    "inner_node": ("inner_node", None),
+    "InnerNode": ("inner_node", "InnerNode"),
+    "InnerNodeJSON": ("inner_node", "InnerNodeJSON"),
+    "leaf_node": ("leaf_node", None),
+    "LeafNode": ("leaf_node", "LeafNode"),
+    "LeafNodeJSON": ("leaf_node", "LeafNodeJSON"),
+    "any_node": ("any_node", None),
+    "AnyNode": ("any_node", "AnyNode"),
+    "AnyNodeJSON": ("any_node", "AnyNodeJSON"),
+    "order_tree_root": ("order_tree_root", None),
+    "OrderTreeRoot": ("order_tree_root", "OrderTreeRoot"),
+    "OrderTreeRootJSON": ("order_tree_root", "OrderTreeRootJSON"),
+    "order_tree_nodes": ("order_tree_nodes", None),
+    "OrderTreeNodes": ("order_tree_nodes", "OrderTreeNodes"),
+    "OrderTreeNodesJSON": ("order_tree_nodes", "OrderTreeNodesJSON"),
+    "event_queue_header": ("event_queue_header", None),
+    "EventQueueHeader": ("event_queue_header", "EventQueueHeader"),
+    "EventQueueHeaderJSON": ("event_queue_header", "EventQueueHeaderJSON"),
+    "any_event": ("any_event", None),
+    "AnyEvent": ("any_event", "AnyEvent"),
+    "AnyEventJSON": ("any_event", "AnyEventJSON"),
+    "fill_event": ("fill_event", None),
+    "FillEvent": ("fill_event", "FillEvent"),
+    "FillEventJSON": ("fill_event", "FillEventJSON"),
+    "out_event": ("out_event", None),
+    "OutEvent": ("out_event", "OutEvent"),
+    "OutEventJSON": ("out_event", "OutEventJSON"),
+    "stable_price_model": ("stable_price_model", None),
+    "StablePriceModel": ("stable_price_model", "StablePriceModel"),
+    "StablePriceModelJSON": ("stable_price_model", "StablePriceModelJSON"),
+    "token_index": ("token_index", None),
+    "TokenIndex": ("token_index", "TokenIndex"),
+    "TokenIndexJSON": ("token_index", "TokenIndexJSON"),
+    "serum3_market_index": ("serum3_market_index", None),
+    "Serum3MarketIndex": ("serum3_market_index", "Serum3MarketIndex"),
+    "Serum3MarketIndexJSON": ("serum3_market_index", "Serum3MarketIndexJSON"),
+    "perp_market_index": ("perp_market_index", None),
+    "PerpMarketIndex": ("perp_market_index", "PerpMarketIndex"),
+    "PerpMarketIndexJSON": ("perp_market_index", "PerpMarketIndexJSON"),
+    "i80f48": ("i80f48", None),
+    "I80F48": ("i80f48", "I80F48"),
+    "I80F48JSON": ("i80f48", "I80F48JSON"),
+    "flash_loan_type": ("flash_loan_type", None),
+    "FlashLoanTypeKind": ("flash_loan_type", "FlashLoanTypeKind"),
+    "FlashLoanTypeJSON": ("flash_loan_type", "FlashLoanTypeJSON"),
+    "serum3_self_trade_behavior": ("serum3_self_trade_behavior", None),
+    "Serum3SelfTradeBehaviorKind": ("serum3_self_trade_behavior", "Serum3SelfTradeBehaviorKind"),
+    "Serum3SelfTradeBehaviorJSON": ("serum3_self_trade_behavior", "Serum3SelfTradeBehaviorJSON"),
+    "serum3_order_type": ("serum3_order_type", None),
+    "Serum3OrderTypeKind": ("serum3_order_type", "Serum3OrderTypeKind"),
+    "Serum3OrderTypeJSON": ("serum3_order_type", "Serum3OrderTypeJSON"),
+    "serum3_side": ("serum3_side", None),
+    "Serum3SideKind": ("serum3_side", "Serum3SideKind"),
+    "Serum3SideJSON": ("serum3_side", "Serum3SideJSON"),
+    "health_type": ("health_type", None),
+    "HealthTypeKind": ("health_type", "HealthTypeKind"),
+    "HealthTypeJSON": ("health_type", "HealthTypeJSON"),
+    "loan_origination_fee_instruction": ("loan_origination_fee_instruction", None),
+    "LoanOriginationFeeInstructionKind": ("loan_origination_fee_instruction", "LoanOriginationFeeInstructionKind"),
+    "LoanOriginationFeeInstructionJSON": ("loan_origination_fee_instruction", "LoanOriginationFeeInstructionJSON"),
+    "ix_gate": ("ix_gate", None),
+    "IxGateKind": ("ix_gate", "IxGateKind"),
+    "IxGateJSON": ("ix_gate", "IxGateJSON"),
+    "oracle_type": ("oracle_type", None),
+    "OracleTypeKind": ("oracle_type", "OracleTypeKind"),
+    "OracleTypeJSON": ("oracle_type", "OracleTypeJSON"),
+    "order_state": ("order_state", None),
+    "OrderStateKind": ("order_state", "OrderStateKind"),
+    "OrderStateJSON": ("order_state", "OrderStateJSON"),
+    "book_side_order_tree": ("book_side_order_tree", None),
+    "BookSideOrderTreeKind": ("book_side_order_tree", "BookSideOrderTreeKind"),
+    "BookSideOrderTreeJSON": ("book_side_order_tree", "BookSideOrderTreeJSON"),
+    "node_tag": ("node_tag", None),
+    "NodeTagKind": ("node_tag", "NodeTagKind"),
+    "NodeTagJSON": ("node_tag", "NodeTagJSON"),
+    "place_order_type": ("place_order_type", None),
+    "PlaceOrderTypeKind": ("place_order_type", "PlaceOrderTypeKind"),
+    "PlaceOrderTypeJSON": ("place_order_type", "PlaceOrderTypeJSON"),
+    "post_order_type": ("post_order_type", None),
+    "PostOrderTypeKind": ("post_order_type", "PostOrderTypeKind"),
+    "PostOrderTypeJSON": ("post_order_type", "PostOrderTypeJSON"),
+    "side": ("side", None),
+    "SideKind": ("side", "SideKind"),
+    "SideJSON": ("side", "SideJSON"),
+    "side_and_order_tree": ("side_and_order_tree", None),
+    "SideAndOrderTreeKind": ("side_and_order_tree", "SideAndOrderTreeKind"),
+    "SideAndOrderTreeJSON": ("side_and_order_tree", "SideAndOrderTreeJSON"),
+    "order_params": ("order_params", None),
+    "OrderParamsKind": ("order_params", "OrderParamsKind"),
+    "OrderParamsJSON": ("order_params", "OrderParamsJSON"),
+    "order_tree_type": ("order_tree_type", None),
+    "OrderTreeTypeKind": ("order_tree_type", "OrderTreeTypeKind"),
+    "OrderTreeTypeJSON": ("order_tree_type", "OrderTreeTypeJSON"),
+    "event_type": ("event_type", None),
+    "EventTypeKind": ("event_type", "EventTypeKind"),
+    "EventTypeJSON": ("event_type", "EventTypeJSON"),
+}
+# ^ Exported name -> (submodule, attribute or None for the submodule itself). Building the borsh
+#   layouts of every submodule on import is slow, so each is only imported when first used
+
+
+def __getattr__(name: str) -> typing.Any:
+    try:
+        module, attribute = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = importlib.import_module(f".{module}", __name__)
+
+    if attribute is not None:
+        value = getattr(value, attribute)
+
+    globals()[name] = value
+
+    return value
+
+
+def __dir__() -> typing.List[str]:
+    return sorted([*globals(), *_LAZY])
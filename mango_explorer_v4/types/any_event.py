@@ -10,7 +10,7 @@ class AnyEventJSON(typing.TypedDict):
     padding: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class AnyEvent:
     layout: typing.ClassVar = borsh.CStruct(
         "event_type" / borsh.U8, "padding" / borsh.U8[207]
@@ -10,7 +10,7 @@ class AnyNodeJSON(typing.TypedDict):
     data: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class AnyNode:
     layout: typing.ClassVar = borsh.CStruct("tag" / borsh.U8, "data" / borsh.U8[119])
     tag: int
@@ -30,7 +30,7 @@ class FillEventJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class FillEvent:
     layout: typing.ClassVar = borsh.CStruct(
         "event_type" / borsh.U8,
@@ -7,11 +7,20 @@ import decimal
 import math
 
 
+FRACTIONAL_BITS = 48
+
+ONE = 1 << FRACTIONAL_BITS
+
+MIN = -(1 << 127)
+
+MAX = (1 << 127) - 1
+
+
 class I80F48JSON(typing.TypedDict):
     val: int
 
 
-@dataclass
+@dataclass(slots=True)
 class I80F48:
     layout: typing.ClassVar = borsh.CStruct("val" / borsh.I128)
     val: int
@@ -36,3 +45,123 @@ class I80F48:
     @classmethod
     def from_decimal(cls, val: decimal.Decimal) -> "I80F48":
         return cls(val=int(decimal.Decimal(val) * decimal.Decimal(2 ** 48)))
+
+    @classmethod
+    def from_int(cls, val: int) -> "I80F48":
+        return cls._checked(val << FRACTIONAL_BITS)
+
+    @classmethod
+    def from_float(cls, val: float) -> "I80F48":
+        # Rounds to the nearest representable value, like I80F48::from_num does on-chain
+        return cls._checked(round(val * ONE))
+
+    def to_float(self) -> float:
+        return self.val / ONE
+
+    # Arithmetic works on the raw 128-bit integer, with the same rounding as the
+    # fixed crate the program uses: products are floored (arithmetic shift right),
+    # quotients are truncated towards zero, and overflowing i128 raises, like the
+    # checked operations on-chain. Plain ints are accepted as operands, and are
+    # scaled exactly rather than converted
+
+    @classmethod
+    def _checked(cls, val: int) -> "I80F48":
+        if not MIN <= val <= MAX:
+            raise OverflowError("I80F48 overflow")
+
+        return cls(val=val)
+
+    @staticmethod
+    def _raw(other: typing.Union["I80F48", int]) -> typing.Optional[int]:
+        if isinstance(other, I80F48):
+            return other.val
+
+        if isinstance(other, int):
+            return other << FRACTIONAL_BITS
+
+        return None
+
+    def __add__(self, other: typing.Union["I80F48", int]) -> "I80F48":
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else I80F48._checked(self.val + other)
+
+    __radd__ = __add__
+
+    def __sub__(self, other: typing.Union["I80F48", int]) -> "I80F48":
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else I80F48._checked(self.val - other)
+
+    def __rsub__(self, other: int) -> "I80F48":
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else I80F48._checked(other - self.val)
+
+    def __mul__(self, other: typing.Union["I80F48", int]) -> "I80F48":
+        if isinstance(other, I80F48):
+            return I80F48._checked((self.val * other.val) >> FRACTIONAL_BITS)
+
+        if isinstance(other, int):
+            return I80F48._checked(self.val * other)
+
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other: typing.Union["I80F48", int]) -> "I80F48":
+        if isinstance(other, I80F48):
+            numerator, denominator = self.val << FRACTIONAL_BITS, other.val
+        elif isinstance(other, int):
+            numerator, denominator = self.val, other
+        else:
+            return NotImplemented
+
+        if denominator == 0:
+            raise ZeroDivisionError("I80F48 division by zero")
+
+        quotient = abs(numerator) // abs(denominator)
+
+        return I80F48._checked(quotient if (numerator < 0) == (denominator < 0) else -quotient)
+
+    def __rtruediv__(self, other: int) -> "I80F48":
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else I80F48(val=other) / self
+
+    def __neg__(self) -> "I80F48":
+        return I80F48._checked(-self.val)
+
+    def __abs__(self) -> "I80F48":
+        return I80F48._checked(abs(self.val))
+
+    def __float__(self) -> float:
+        return self.to_float()
+
+    def __bool__(self) -> bool:
+        return self.val != 0
+
+    def __eq__(self, other: typing.Union["I80F48", int]) -> bool:
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else self.val == other
+
+    def __lt__(self, other: typing.Union["I80F48", int]) -> bool:
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else self.val < other
+
+    def __le__(self, other: typing.Union["I80F48", int]) -> bool:
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else self.val <= other
+
+    def __gt__(self, other: typing.Union["I80F48", int]) -> bool:
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else self.val > other
+
+    def __ge__(self, other: typing.Union["I80F48", int]) -> bool:
+        other = I80F48._raw(other)
+
+        return NotImplemented if other is None else self.val >= other
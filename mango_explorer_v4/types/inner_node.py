@@ -15,7 +15,7 @@ class InnerNodeJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class InnerNode:
     layout: typing.ClassVar = borsh.CStruct(
         "tag" / borsh.U8,
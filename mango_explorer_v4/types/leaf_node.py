@@ -23,7 +23,7 @@ class LeafNodeJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class LeafNode:
     layout: typing.ClassVar = borsh.CStruct(
         "tag" / borsh.U8,
@@ -35,7 +35,7 @@ class PerpPositionJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class PerpPosition:
     layout: typing.ClassVar = borsh.CStruct(
         "market_index" / borsh.U16,
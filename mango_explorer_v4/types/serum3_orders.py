@@ -18,7 +18,7 @@ class Serum3OrdersJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class Serum3Orders:
     layout: typing.ClassVar = borsh.CStruct(
         "open_orders" / BorshPubkey,
@@ -19,7 +19,7 @@ class TokenPositionJSON(typing.TypedDict):
     reserved: list[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class TokenPosition:
     layout: typing.ClassVar = borsh.CStruct(
         "indexed_position" / i80f48.I80F48.layout,